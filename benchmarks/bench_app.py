@@ -0,0 +1,242 @@
+"""Suite de benchmarks de la interfaz, ejecutando `SaviApp` sin pantalla.
+
+Levanta la app con la ventana offscreen y el backend GL `mock` de Kivy, la
+alimenta con datos sintéticos (`datos_sinteticos`) y mide los caminos
+críticos: construcción de pantallas, `renderizar_lista` con cantidades
+crecientes de cupos, `ocupar_siguiente_cupo_vacio`, `generar_sorteo`, abrir
+el diálogo de edición (armado desde cero y reutilizado), la generación de QR,
+`crear_junta` con muchas juntas existentes y la lista de solicitudes.
+
+El resultado es JSON. Con `--base` se compara contra un resultado anterior y
+el proceso termina con código 1 si algún caso empeora más que la tolerancia.
+
+Uso:
+    python benchmarks/bench_app.py [--salida actual.json] [--base base.json] [--tolerancia 1.3]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Kivy sin ventana real ni argumentos de línea de comandos; base de datos temporal
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+os.environ.setdefault('XDG_CONFIG_HOME', tempfile.mkdtemp(prefix='savi-bench-'))
+# Sin precalentado, cada pantalla se construye dentro de la medición
+os.environ.setdefault('SAVI_PRECALENTAR', '0')
+
+import datos_sinteticos  # noqa: E402
+
+TAMANOS_LISTA = (100, 1_000, 5_000)
+JUNTAS_EXISTENTES = (0, 1_000, 10_000)
+REPETICIONES = 5
+
+# Diferencias menores a esto (ms) se consideran ruido al comparar
+MARGEN_ABSOLUTO_MS = 0.5
+
+
+def medir(funcion, repeticiones=REPETICIONES, preparar=None):
+    """Ejecuta `funcion` varias veces y devuelve estadísticas en ms."""
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return {
+        'mediana_ms': round(statistics.median(tiempos), 4),
+        'min_ms': round(min(tiempos), 4),
+        'repeticiones': repeticiones,
+    }
+
+
+def casos_pantallas(app, resultados):
+    import main
+
+    manager = app.root
+    for nombre in main.PANTALLAS:
+        if manager.has_screen(nombre):
+            continue
+        inicio = time.perf_counter()
+        manager.crear_pantalla(nombre)
+        ms = (time.perf_counter() - inicio) * 1000
+        resultados[f'pantalla.{nombre}'] = {'mediana_ms': round(ms, 4), 'min_ms': round(ms, 4), 'repeticiones': 1}
+
+
+def casos_cupos(app, rnd, resultados):
+    from cupos import TablaCupos
+
+    pagos = app.root.get_screen('integrantes_pagos')
+    app.junta_actual = None  # sin junta abierta no se escribe en la base de datos
+
+    for n in TAMANOS_LISTA:
+        pagos.lista_cupos = TablaCupos.desde_dicts(datos_sinteticos.cupos(rnd, n))
+        resultados[f'renderizar_lista.{n}'] = medir(pagos.renderizar_lista)
+
+    for n in TAMANOS_LISTA:
+        personas = [datos_sinteticos.persona(rnd) for _ in range(n - 1)]
+
+        def vaciar():
+            pagos.lista_cupos = TablaCupos()
+            pagos.lista_cupos.redimensionar(n)
+            pagos.lista_cupos.actualizar(0, ocupado=True, nombre='Tú (Organizador)', numero=1)
+
+        def llenar():
+            for p in personas:
+                pagos.ocupar_siguiente_cupo_vacio(p)
+
+        r = medir(llenar, 3, preparar=vaciar)
+        r['ops_por_s'] = round((n - 1) / (r['mediana_ms'] / 1000)) if r['mediana_ms'] else None
+        resultados[f'ocupar_siguiente_cupo_vacio.{n}'] = r
+
+    for n in TAMANOS_LISTA:
+        pagos.lista_cupos = TablaCupos.desde_dicts(datos_sinteticos.cupos(rnd, n, ocupacion=1.0))
+        resultados[f'generar_sorteo.{n}'] = medir(lambda: pagos.generar_sorteo(semilla=rnd.getrandbits(64)))
+    pagos._cambios.limpiar()
+
+
+def casos_dialogos(app, resultados):
+    from dialogos import FABRICAS
+
+    pagos = app.root.get_screen('integrantes_pagos')
+    dialogo = app.dialogos.obtener('edicion')
+
+    def cerrar():
+        dialogo.dialogo.dismiss(animation=False)
+
+    resultados['dialogo.edicion.armar'] = medir(FABRICAS['edicion'])
+    resultados['dialogo.edicion.abrir'] = medir(lambda: pagos.mostrar_dialogo_edicion(1), preparar=cerrar)
+    cerrar()
+
+
+def casos_qr(app, resultados):
+    from qr import texturas_qr
+
+    contador = iter(range(10 ** 9))
+    resultados['qr.frio'] = medir(
+        lambda: texturas_qr.obtener(f"https://savi.app/unirse?codigo=SAVI-{next(contador)}"))
+    texturas_qr.obtener("https://savi.app/unirse?codigo=SAVI-CACHE")
+    resultados['qr.cache'] = medir(lambda: texturas_qr.obtener("https://savi.app/unirse?codigo=SAVI-CACHE"))
+
+    invitar = app.root.get_screen('invitar')
+    resultados['invitar.generar_qr'] = medir(
+        lambda: invitar.generar_qr(f"https://savi.app/unirse?codigo=SAVI-{next(contador)}"))
+    invitar._cancelar_qr()
+
+
+def casos_juntas(app, rnd, resultados):
+    from juntas import IndiceJuntas
+
+    for existentes in JUNTAS_EXISTENTES:
+        juntas = datos_sinteticos.juntas(rnd, existentes)
+        app.juntas = {j['id']: j for j in juntas}
+        app.indice_juntas = IndiceJuntas()
+        app.indice_juntas.cargar(juntas)
+        app.mostrar_juntas_guardadas()
+        resultados[f'crear_junta.{existentes}'] = medir(
+            lambda: app.crear_junta('Junta de prueba', '100', '20', 'Mensual', 'Fecha Inicio', 'Fecha Fin'))
+
+
+def casos_solicitudes(app, rnd, resultados):
+    from solicitudes import SolicitudesPorJunta
+
+    junta_id = app.junta_actual
+    for n in (100, 10_000):
+        reqs = [dict(r, junta_id=junta_id) for r in datos_sinteticos.solicitudes(rnd, n, 5_000)]
+        resultados[f'solicitudes.encolar.{n}'] = medir(lambda: SolicitudesPorJunta(dict(r) for r in reqs))
+        app.pending_swap_requests = SolicitudesPorJunta(dict(r) for r in reqs)
+        resultados[f'solicitudes.mostrar.{n}'] = medir(app.mostrar_solicitudes_sorteo)
+
+
+def ejecutar(app):
+    rnd = random.Random(2026)
+    resultados = {}
+    casos_pantallas(app, resultados)
+    casos_cupos(app, rnd, resultados)
+    casos_dialogos(app, resultados)
+    casos_qr(app, resultados)
+    casos_solicitudes(app, rnd, resultados)
+    casos_juntas(app, rnd, resultados)
+    app.db.esperar()
+    return resultados
+
+
+def comparar(actual, base, tolerancia):
+    """Casos que empeoraron más de `tolerancia` veces respecto de `base`."""
+    regresiones = {}
+    for caso, r in actual.items():
+        anterior = base.get(caso)
+        if not anterior:
+            continue
+        antes, ahora = anterior['mediana_ms'], r['mediana_ms']
+        r['base_ms'] = antes
+        r['relacion'] = round(ahora / antes, 3) if antes else None
+        if antes and ahora > antes * tolerancia and ahora - antes > MARGEN_ABSOLUTO_MS:
+            regresiones[caso] = r['relacion']
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--salida', help='archivo JSON donde guardar los resultados')
+    parser.add_argument('--base', help='resultados anteriores (JSON) contra los que comparar')
+    parser.add_argument('--tolerancia', type=float, default=1.3,
+                        help='relación actual/base a partir de la cual hay regresión')
+    args = parser.parse_args()
+
+    os.chdir(RAIZ)
+    from kivy.clock import Clock
+    import main as savi
+
+    app = savi.SaviApp()
+    salida = {}
+
+    def correr(dt):
+        try:
+            salida['resultados'] = ejecutar(app)
+        finally:
+            app.stop()
+
+    Clock.schedule_once(correr, 0.5)
+    app.run()
+
+    resultados = salida.get('resultados')
+    if resultados is None:
+        print('La suite no terminó', file=sys.stderr)
+        return 2
+
+    informe = {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'resultados': resultados,
+    }
+    codigo = 0
+    if args.base:
+        with open(args.base, encoding='utf-8') as archivo:
+            base = json.load(archivo).get('resultados', {})
+        informe['regresiones'] = comparar(resultados, base, args.tolerancia)
+        codigo = 1 if informe['regresiones'] else 0
+
+    texto = json.dumps(informe, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto + '\n')
+    print(texto)
+    return codigo
+
+
+if __name__ == '__main__':
+    sys.exit(main())
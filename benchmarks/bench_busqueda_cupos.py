@@ -0,0 +1,69 @@
+"""Benchmark de la búsqueda de integrantes (`cupos.IndiceCupos`).
+
+Mide armar el índice (al enfocar el buscador), buscar mientras se escribe
+un nombre, un DNI o un correo, y reindexar un cupo editado, para juntas de
+distintos tamaños.
+
+Uso:
+    python benchmarks/bench_busqueda_cupos.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import datos_sinteticos  # noqa: E402
+from cupos import Cupo, IndiceCupos, TablaCupos  # noqa: E402
+
+TAMANOS = (100, 1_000, 5_000)
+REPETICIONES = 200
+
+
+def generar(n, rnd):
+    cupos = TablaCupos([Cupo(ocupado=True, nombre='Tú (Organizador)', numero=1)])
+    cupos.redimensionar(n)
+    for _ in range(n - 1):
+        cupos.ocupar_siguiente(usuario='Miembro Verificado', **datos_sinteticos.persona(rnd))
+    return cupos
+
+
+def medir(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+
+def main():
+    rnd = random.Random(2026)
+    print(f"{'cupos':>6} {'armar (ms)':>11} {'nombre (us)':>12} {'dni (us)':>9} {'correo (us)':>12} {'editar (us)':>12}")
+    for n in TAMANOS:
+        cupos = generar(n, rnd)
+        inicio = time.perf_counter()
+        indice = IndiceCupos(cupos)
+        armar = (time.perf_counter() - inicio) * 1000
+
+        # Cada tecla de un nombre, un DNI y un correo reales de la junta
+        cupo = cupos[rnd.randrange(1, n)]
+        textos = {campo: [valor[:k] for k in range(1, len(valor) + 1)]
+                  for campo, valor in (('nombre', cupo.nombre), ('dni', cupo.dni), ('correo', cupo.correo))}
+        tiempos = {campo: medir(lambda: [indice.buscar(t) for t in lista], REPETICIONES) / len(lista)
+                   for campo, lista in textos.items()}
+
+        posiciones = [rnd.randrange(1, n) for _ in range(REPETICIONES)]
+
+        def editar():
+            i = posiciones.pop()
+            cupos.actualizar(i, nombre=datos_sinteticos.persona(rnd)['nombre'])
+            indice.actualizar(i, cupos[i])
+
+        print(f"{n:>6} {armar:>11.1f} {tiempos['nombre']:>12.1f} {tiempos['dni']:>9.1f} "
+              f"{tiempos['correo']:>12.1f} {medir(editar, REPETICIONES):>12.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
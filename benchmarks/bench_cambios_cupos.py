@@ -0,0 +1,99 @@
+"""Latencia por operación del repintado incremental de cupos.
+
+Compara regenerar todos los datos de la vista (lo que hacía
+`renderizar_lista` tras cada cambio) con parchear solo los índices marcados
+mediante `CambiosCupos`. No necesita ventana: trabaja sobre la misma lista de
+dicts que recibe el RecycleView.
+
+También mide N ediciones sobre una `TablaCupos` observada, entregando los
+cambios tras cada operación o una sola vez para todo el `lote()`.
+
+Uso:
+    python benchmarks/bench_cambios_cupos.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cupos import CambiosCupos, Cupo, TablaCupos, vista_cupo  # noqa: E402
+
+TAMANOS = (100, 1_000, 10_000, 100_000)
+REPETICIONES = 200
+
+
+def generar_cupos(n):
+    return [
+        {'ocupado': True, 'nombre': f'Integrante {i}', 'usuario': 'Miembro Verificado',
+         'dni': f'{10000000 + i}', 'telefono': '', 'correo': '', 'numero': str(i + 1)}
+        for i in range(n)
+    ]
+
+
+def medir(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+
+def main():
+    rnd = random.Random(1)
+    print(f"{'cupos':>8} {'completo (us)':>14} {'intercambio (us)':>17} {'edición (us)':>13}")
+    for n in TAMANOS:
+        cupos = generar_cupos(n)
+        datos = [vista_cupo(i, c) for i, c in enumerate(cupos)]
+        cambios = CambiosCupos()
+
+        def completo():
+            datos[:] = [vista_cupo(i, c) for i, c in enumerate(cupos)]
+
+        def intercambio():
+            a, b = rnd.randrange(n), rnd.randrange(n)
+            cupos[a]['numero'], cupos[b]['numero'] = cupos[b]['numero'], cupos[a]['numero']
+            cambios.marcar(a, b)
+            cambios.aplicar(cupos, datos)
+
+        def edicion():
+            i = rnd.randrange(n)
+            cupos[i]['nombre'] = f'Editado {rnd.random()}'
+            cambios.marcar(i)
+            cambios.aplicar(cupos, datos)
+
+        reps_completo = max(1, REPETICIONES * 100 // n)
+        print(f"{n:>8} {medir(completo, reps_completo):>14.1f} "
+              f"{medir(intercambio, REPETICIONES):>17.2f} {medir(edicion, REPETICIONES):>13.2f}")
+
+    print()
+    print(f"{'ediciones':>9} {'sin lote (ms)':>14} {'entregas':>9} {'con lote (ms)':>14} {'entregas':>9}")
+    for n in TAMANOS[:-1]:
+        tabla = TablaCupos(Cupo(ocupado=True, nombre=f'Integrante {i}', numero=i + 1) for i in range(n))
+        datos = [vista_cupo(i, c) for i, c in enumerate(tabla)]
+        cambios = CambiosCupos()
+        entregas = []
+
+        def observador(conjunto):
+            entregas.append(conjunto)
+            cambios.marcar(*conjunto.indices)
+            cambios.aplicar(tabla, datos)
+
+        tabla.observar(observador)
+
+        def editar_todo():
+            for i in range(n):
+                tabla.actualizar(i, nombre=f'Editado {i}')
+
+        def en_lote():
+            with tabla.lote():
+                editar_todo()
+
+        sin_lote = medir(editar_todo, 3) / 1000
+        por_vez, entregas[:] = len(entregas) // 3, []
+        con_lote = medir(en_lote, 3) / 1000
+        print(f"{n:>9} {sin_lote:>14.2f} {por_vez:>9} {con_lote:>14.2f} {len(entregas) // 3:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark del índice de códigos de invitación (`invitaciones.IndiceCodigos`).
+
+Asigna N códigos, mide resolver códigos válidos, rechazar códigos mal
+escritos, recargar el índice desde pares (codigo, junta_id) y la memoria
+que ocupa. Comprueba también que no haya colisiones.
+
+Uso:
+    python benchmarks/bench_invitaciones.py [--cantidad 1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from invitaciones import ALFABETO, IndiceCodigos  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cantidad', type=int, default=1_000_000)
+    args = parser.parse_args()
+    rnd = random.Random(2026)
+    n = args.cantidad
+
+    ids = [uuid.UUID(int=rnd.getrandbits(128)).hex for _ in range(n)]
+    indice = IndiceCodigos()
+    inicio = time.perf_counter()
+    codigos = [indice.asignar(junta_id) for junta_id in ids]
+    asignar = time.perf_counter() - inicio
+    print(f"asignar {n}: {asignar:.2f} s ({asignar / n * 1e6:.2f} µs c/u)")
+    print(f"códigos distintos: {len(set(codigos)) == n}  memoria del índice: {len(indice._ids) / 2**20:.1f} MB")
+
+    muestra = rnd.sample(range(n), min(n, 100_000))
+    inicio = time.perf_counter()
+    correctos = sum(indice.buscar(codigos[i]) == ids[i] for i in muestra)
+    buscar = time.perf_counter() - inicio
+    print(f"buscar: {buscar / len(muestra) * 1e6:.2f} µs c/u  ({correctos}/{len(muestra)} correctos)")
+
+    # Un símbolo cambiado: el dígito de control lo rechaza sin consultar el índice
+    erroneos = []
+    for i in muestra[:20_000]:
+        codigo = list(codigos[i])
+        posicion = rnd.choice([5, 6, 7, 8, 10, 11, 12, 13])
+        codigo[posicion] = rnd.choice(ALFABETO.replace(codigo[posicion], ''))
+        erroneos.append(''.join(codigo))
+    inicio = time.perf_counter()
+    aceptados = sum(indice.buscar(c) is not None for c in erroneos)
+    rechazo = time.perf_counter() - inicio
+    print(f"rechazar mal escritos: {rechazo / len(erroneos) * 1e6:.2f} µs c/u  ({aceptados} aceptados por error)")
+
+    inicio = time.perf_counter()
+    IndiceCodigos().cargar(zip(codigos, ids))
+    print(f"recargar {n}: {time.perf_counter() - inicio:.2f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Tiempo de lectura de QR en imágenes subidas, por resolución.
+
+Genera un corpus de fotos sintéticas (un QR de invitación sobre fondo con
+ruido, guardado como JPEG) en varias resoluciones, más capturas PNG, y
+compara `leer_qr` (reducción + escala de grises) con decodificar la imagen
+completa. Un PNG que pasa de `MAX_PIXELES` se rechaza sin descomprimirlo.
+
+Requiere Pillow, qrcode y OpenCV o pyzbar.
+
+Uso:
+    python benchmarks/bench_lector_qr.py [carpeta_corpus]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lector_qr import ImagenDemasiadoGrande, decodificador_disponible, leer_qr  # noqa: E402
+
+RESOLUCIONES = ((640, 480), (1280, 960), (1920, 1440), (3024, 4032), (4000, 3000))
+# Capturas de pantalla y una imagen enorme, en PNG
+RESOLUCIONES_PNG = ((1080, 2400), (4000, 3000), (6000, 4000))
+REPETICIONES = 3
+
+
+def generar_corpus(carpeta):
+    """Crea una imagen por resolución y formato y devuelve [(ruta, tamaño, texto)]."""
+    import qrcode
+    from PIL import Image, ImageFilter
+
+    rnd = random.Random(7)
+    corpus = []
+    for (ancho, alto), formato in [(r, 'jpg') for r in RESOLUCIONES] + [(r, 'png') for r in RESOLUCIONES_PNG]:
+        texto = f"https://savi.app/unirse?codigo=SAVI-{rnd.randrange(10000):04d}"
+        qr = qrcode.make(texto, border=4).convert('L')
+        lado = min(ancho, alto) // 2
+        qr = qr.resize((lado, lado), Image.NEAREST).filter(ImageFilter.GaussianBlur(1))
+        fondo = Image.effect_noise((ancho, alto), 40).convert('RGB')
+        fondo.paste(qr.convert('RGB'), (rnd.randrange(ancho - lado), rnd.randrange(alto - lado)))
+        ruta = os.path.join(carpeta, f"qr_{ancho}x{alto}.{formato}")
+        if formato == 'jpg':
+            fondo.save(ruta, quality=90)
+        else:
+            fondo.save(ruta, compress_level=1)
+        corpus.append((ruta, (ancho, alto), texto))
+    return corpus
+
+
+def decodificar_completa(ruta):
+    """Referencia: decodificar la imagen a resolución completa y en color."""
+    from PIL import Image
+
+    decodificar = decodificador_disponible()
+    return decodificar(Image.open(ruta).convert('RGB'))
+
+
+def medir(funcion, ruta):
+    mejor = float('inf')
+    resultado = None
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        try:
+            resultado = funcion(ruta)
+        except ImagenDemasiadoGrande:
+            resultado = 'rechazada'
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor * 1000, resultado
+
+
+def main():
+    if decodificador_disponible() is None:
+        print("No hay decodificador QR instalado (opencv-python o pyzbar).")
+        return 1
+    carpeta = sys.argv[1] if len(sys.argv) > 1 else tempfile.mkdtemp(prefix='savi-qr-')
+    os.makedirs(carpeta, exist_ok=True)
+    corpus = generar_corpus(carpeta)
+
+    print(f"{'resolución':>12} {'fmt':>4} {'MP':>5} {'completa (ms)':>14} {'leer_qr (ms)':>13} {'ok':>9}")
+    for ruta, (ancho, alto), texto in corpus:
+        t_completa, _ = medir(decodificar_completa, ruta)
+        t_lector, leido = medir(leer_qr, ruta)
+        ok = leido if leido == 'rechazada' else 'sí' if leido == texto else 'no'
+        print(f"{ancho:>5}x{alto:<6} {ruta[-3:]:>4} {ancho * alto / 1e6:>5.1f} {t_completa:>14.1f} "
+              f"{t_lector:>13.1f} {ok:>9}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
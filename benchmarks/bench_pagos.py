@@ -0,0 +1,105 @@
+"""Benchmark del libro de pagos (`pagos.LibroPagos` y las tablas `pagos`/`saldos_*`).
+
+Llena una base temporal con N movimientos repartidos entre juntas
+semanales de varios años y mide, para una de ellas: abrir la junta (leer
+los saldos), calcular el estado de todas sus tarjetas, registrar un pago y
+traer el historial de un integrante por (junta, cupo). Compara con
+recalcular los saldos y filtrar el historial recorriendo todos los
+movimientos de la junta.
+
+Uso:
+    python benchmarks/bench_pagos.py [--movimientos 1000000] [--juntas 100]
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import BaseDatos  # noqa: E402
+from pagos import LibroPagos  # noqa: E402
+
+CUOTA = 50.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--movimientos', type=int, default=1_000_000)
+    parser.add_argument('--juntas', type=int, default=100)
+    args = parser.parse_args()
+    rnd = random.Random(2026)
+
+    carpeta = tempfile.mkdtemp(prefix='savi-pagos-')
+    try:
+        db = BaseDatos(os.path.join(carpeta, 'savi.db'))
+        por_junta = args.movimientos // args.juntas
+        integrantes = 50
+        ids = []
+        inicio = time.perf_counter()
+        for j in range(args.juntas):
+            junta_id = f'{j:032x}'
+            ids.append(junta_id)
+            db.guardar_junta({'id': junta_id, 'nombre': f'Junta {j}', 'monto': str(CUOTA), 'moneda': 'Soles',
+                              'periodo': 'Semanal', 'fecha_inicio': '', 'fecha_final': '', 'creada': j})
+            for k in range(por_junta):
+                db.agregar_pago(junta_id, k % integrantes, k // integrantes, CUOTA, 1.7e9 + k * 3600)
+        db.esperar()
+        print(f"escribir {por_junta * args.juntas} movimientos: {time.perf_counter() - inicio:.1f} s")
+
+        junta_id = rnd.choice(ids)
+        inicio = time.perf_counter()
+        libro = LibroPagos(junta_id)
+        libro.cargar_saldos(*db.saldos_pagos(junta_id))
+        print(f"abrir junta ({len(libro)} movimientos): {(time.perf_counter() - inicio) * 1000:.2f} ms")
+
+        # Referencia: el libro entero de la junta, sin saldos ni índice por cupo
+        lector = sqlite3.connect(db.ruta)
+        todos = "SELECT cupo, periodo, monto, creado FROM pagos WHERE junta_id = ? ORDER BY id"
+        inicio = time.perf_counter()
+        saldos = {}
+        for cupo, _, monto, _ in lector.execute(todos, (junta_id,)):
+            saldos[cupo] = saldos.get(cupo, 0.0) + monto
+        print(f"recalcular recorriendo los movimientos: {(time.perf_counter() - inicio) * 1000:.2f} ms")
+        assert saldos == libro.pagado
+
+        vencidos = por_junta // integrantes + 1
+        inicio = time.perf_counter()
+        estados = [libro.estado(i, CUOTA, vencidos) for i in range(integrantes)]
+        print(f"estado de {integrantes} tarjetas: {(time.perf_counter() - inicio) * 1e6:.1f} µs "
+              f"({sum(atrasado for _, atrasado in estados)} atrasados)")
+
+        inicio = time.perf_counter()
+        for _ in range(1000):
+            cupo = rnd.randrange(integrantes)
+            db.agregar_pago(junta_id, *libro.registrar(cupo, libro.siguiente_periodo(cupo, CUOTA), CUOTA))
+        print(f"registrar pago: {(time.perf_counter() - inicio) * 1000:.2f} µs c/u (sin la escritura en segundo plano)")
+
+        db.esperar()
+        listo = threading.Event()
+        historial = []
+        inicio = time.perf_counter()
+        db.pagos_cupo(junta_id, 0, lambda filas: (historial.extend(filas), listo.set()))
+        listo.wait()
+        print(f"historial de un cupo por índice: {(time.perf_counter() - inicio) * 1000:.2f} ms "
+              f"({len(historial)} pagos)")
+
+        inicio = time.perf_counter()
+        filtrado = [(periodo, monto, creado) for cupo, periodo, monto, creado in lector.execute(todos, (junta_id,))
+                    if cupo == 0]
+        print(f"historial de un cupo recorriendo la junta: {(time.perf_counter() - inicio) * 1000:.2f} ms")
+        assert filtrado == historial
+        lector.close()
+        db.cerrar()
+    finally:
+        shutil.rmtree(carpeta, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
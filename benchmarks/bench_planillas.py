@@ -0,0 +1,88 @@
+"""Benchmark de importar/exportar integrantes (`planillas.py`).
+
+Genera un CSV y un JSON Lines de N filas (con un 2% de filas inválidas), los
+importa en una `TablaCupos` vacía guardando cada lote en una base temporal
+y los vuelve a exportar. Informa el tiempo de cada paso y el pico de memoria
+del lector aislado (leer y validar sin guardar los cupos).
+
+Uso:
+    python benchmarks/bench_planillas.py [--filas 100000]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import datos_sinteticos  # noqa: E402
+import planillas  # noqa: E402
+from cupos import TablaCupos  # noqa: E402
+from database import BaseDatos  # noqa: E402
+
+
+def generar(carpeta, n, rnd):
+    """Escribe miembros.csv y miembros.jsonl con las mismas filas."""
+    ruta_csv = os.path.join(carpeta, 'miembros.csv')
+    ruta_jsonl = os.path.join(carpeta, 'miembros.jsonl')
+    with open(ruta_csv, 'w', encoding='utf-8') as csv, open(ruta_jsonl, 'w', encoding='utf-8') as jsonl:
+        csv.write('Nombre completo,DNI,Celular,Email\n')
+        for i in range(n):
+            p = datos_sinteticos.persona(rnd)
+            p['dni'] = f"{10_000_000 + i}"
+            if rnd.random() < 0.02:
+                p['correo'] = 'sin-arroba'
+            csv.write(f"{p['nombre']},{p['dni']},{p['telefono']},{p['correo']}\n")
+            jsonl.write(json.dumps({'nombre': p['nombre'], 'dni': p['dni'],
+                                    'celular': p['telefono'], 'email': p['correo']}) + '\n')
+    return ruta_csv, ruta_jsonl
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filas', type=int, default=100_000)
+    args = parser.parse_args()
+    rnd = random.Random(2026)
+
+    carpeta = tempfile.mkdtemp(prefix='savi-planillas-')
+    try:
+        rutas = generar(carpeta, args.filas, rnd)
+        db = BaseDatos(os.path.join(carpeta, 'savi.db'))
+        for j, ruta in enumerate(rutas):
+            junta_id = f'{j:032x}'
+            db.guardar_junta({'id': junta_id, 'nombre': 'Importada', 'monto': '50', 'moneda': 'Soles',
+                              'periodo': 'Semanal', 'fecha_inicio': '', 'fecha_final': '', 'creada': j})
+            cupos = TablaCupos()
+            inicio = time.perf_counter()
+            resumen = planillas.importar(ruta, cupos, lambda posiciones: db.guardar_cupos(junta_id, cupos, posiciones))
+            leer = time.perf_counter() - inicio
+            db.esperar()
+            total = time.perf_counter() - inicio
+            print(f"importar {os.path.basename(ruta)}: {leer:.2f} s ({total:.2f} s con la base) -> {resumen.texto()}")
+
+            salida = os.path.join(carpeta, 'exportado' + os.path.splitext(ruta)[1])
+            inicio = time.perf_counter()
+            filas = planillas.exportar(cupos, salida)
+            print(f"exportar {filas} filas: {time.perf_counter() - inicio:.2f} s")
+
+        # Memoria del lector solo: solo el conjunto de DNIs crece con las filas
+        tracemalloc.start()
+        for _ in planillas.leer_lotes(rutas[0]):
+            pass
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"pico de memoria al leer y validar (incluye el conjunto de DNIs vistos): {pico / 2**20:.1f} MB")
+        db.cerrar()
+    finally:
+        shutil.rmtree(carpeta, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Benchmark del registro de reportes por DNI (`reportes.RegistroReportes`).
+
+Llena una base temporal con N reportes sobre DNIs repetidos y mide la
+reconstrucción de los agregados (primer arranque), la carga desde
+`riesgo_dni` (arranques siguientes), la consulta de un DNI mientras se
+escribe y el registro de un reporte nuevo.
+
+Uso:
+    python benchmarks/bench_reportes.py [--reportes 300000]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import BaseDatos  # noqa: E402
+from reportes import RegistroReportes  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reportes', type=int, default=300_000)
+    args = parser.parse_args()
+    rnd = random.Random(2026)
+    n = args.reportes
+
+    carpeta = tempfile.mkdtemp(prefix='savi-reportes-')
+    try:
+        db = BaseDatos(os.path.join(carpeta, 'savi.db'))
+        ahora = time.time()
+        dnis = [f"{rnd.randrange(10_000_000, 99_999_999)}" for _ in range(max(1, n // 3))]
+        for _ in range(n):
+            db.agregar_reporte(rnd.choice(dnis), 'No pagó', None, ahora - rnd.uniform(0, 3 * 365 * 86400))
+        db.esperar()
+
+        registro = RegistroReportes()
+        inicio = time.perf_counter()
+        registro.cargar(db)
+        print(f"reconstruir {n} reportes -> {len(registro)} DNIs: {time.perf_counter() - inicio:.2f} s")
+        db.esperar()
+
+        registro = RegistroReportes()
+        inicio = time.perf_counter()
+        registro.cargar(db)
+        print(f"cargar agregados: {time.perf_counter() - inicio:.2f} s")
+
+        # Lo que hace el diálogo en cada tecla: mitad DNIs reportados, mitad nuevos
+        consultas = [rnd.choice(dnis) if i % 2 else f"{rnd.randrange(10_000_000, 99_999_999)}"
+                     for i in range(200_000)]
+        inicio = time.perf_counter()
+        avisos = sum(registro.alerta(dni) is not None for dni in consultas)
+        consulta = time.perf_counter() - inicio
+        print(f"alerta: {consulta / len(consultas) * 1e6:.2f} µs c/u  ({avisos} avisos)")
+
+        inicio = time.perf_counter()
+        for dni in consultas[:20_000]:
+            db.agregar_reporte(dni, 'No pagó', None, ahora, registro.agregar(dni, ahora))
+        agregar = time.perf_counter() - inicio
+        print(f"agregar: {agregar / 20_000 * 1e6:.2f} µs c/u (sin contar la escritura en segundo plano)")
+        db.cerrar()
+    finally:
+        shutil.rmtree(carpeta, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Velocidad y equidad del sorteo de números.
+
+1. Compara `sorteo.sortear` (permutación NumPy) con el `random.shuffle` de
+   lista que se usaba antes, para 1 000 a 100 000 participantes, y comprueba
+   que la misma semilla repite el sorteo.
+2. Simula millones de sorteos (Monte Carlo) y reporta la uniformidad de la
+   distribución de posiciones por participante.
+
+Requiere NumPy.
+
+Uso:
+    python benchmarks/bench_sorteo.py [sorteos_simulados]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorteo import MOTOR, nueva_semilla, simular, sortear  # noqa: E402
+
+TAMANOS = (1_000, 10_000, 100_000)
+PARTICIPANTES_SIMULACION = (4, 12, 30)
+REPETICIONES = 5
+
+
+def shuffle_anterior(cantidad, total_numeros):
+    numeros = list(range(2, total_numeros + 1))
+    random.shuffle(numeros)
+    return numeros[:cantidad]
+
+
+def medir(funcion, *args):
+    mejor = float('inf')
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        funcion(*args)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor * 1000
+
+
+def main():
+    if MOTOR != 'numpy':
+        print("NumPy no está instalado.")
+        return 1
+    sorteos = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"{'participantes':>13} {'shuffle (ms)':>13} {'numpy (ms)':>11} {'reproducible':>13}")
+    for n in TAMANOS:
+        semilla = nueva_semilla()
+        t_antes = medir(shuffle_anterior, n - 1, n)
+        t_numpy = medir(sortear, n - 1, n, semilla)
+        igual = sortear(n - 1, n, semilla) == sortear(n - 1, n, semilla)
+        print(f"{n:>13} {t_antes:>13.2f} {t_numpy:>11.2f} {'sí' if igual else 'no':>13}")
+
+    print()
+    print(f"Monte Carlo: {sorteos:,} sorteos por tamaño")
+    print(f"{'participantes':>13} {'tiempo (s)':>11} {'chi2/gl':>8} {'p':>7} {'desv. máx.':>11}")
+    for n in PARTICIPANTES_SIMULACION:
+        inicio = time.perf_counter()
+        r = simular(n, sorteos, semilla=n)
+        duracion = time.perf_counter() - inicio
+        print(f"{n:>13} {duracion:>11.2f} {r['chi2'] / r['grados']:>8.3f} {r['p']:>7.3f} "
+              f"{r['desviacion_maxima'] * 100:>10.2f}%")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
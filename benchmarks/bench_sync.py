@@ -0,0 +1,109 @@
+"""Benchmark de la sincronización por deltas entre dos réplicas.
+
+Levanta `servidor_sync_local` en un puerto libre y dos bases locales (A y
+B). A crea juntas con muchos cupos, B las sigue y se pone al día (transferencia
+completa); luego A edita unos pocos cupos y B vuelve a sincronizar
+(transferencia de deltas). Reporta bytes en la red y tiempos de cada pasada,
+y comprueba que ambas réplicas terminan iguales.
+
+Uso:
+    python benchmarks/bench_sync.py [--cupos 1000] [--juntas 5] [--ediciones 10]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datos_sinteticos  # noqa: E402
+import servidor_sync_local  # noqa: E402
+from database import BaseDatos  # noqa: E402
+from sincronizacion import Sincronizador  # noqa: E402
+
+
+def pasada(nombre, sincronizador, funcion):
+    http = sincronizador.http
+    enviados, recibidos = http.bytes_enviados, http.bytes_recibidos
+    inicio = time.perf_counter()
+    resultado = funcion()
+    ms = (time.perf_counter() - inicio) * 1000
+    print(f"{nombre:<34} {ms:9.1f} ms  "
+          f"{http.bytes_enviados - enviados:>9} B enviados  {http.bytes_recibidos - recibidos:>9} B recibidos"
+          f"  ({resultado} cambios)")
+    return resultado
+
+
+def estado(db):
+    juntas, solicitudes = db.cargar_todo()
+    return ({j['id']: j for j in juntas}, sorted((s['id'], s['from'], s['to']) for s in solicitudes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cupos', type=int, default=1000)
+    parser.add_argument('--juntas', type=int, default=5)
+    parser.add_argument('--ediciones', type=int, default=10)
+    args = parser.parse_args()
+
+    rnd = random.Random(2026)
+    carpeta = tempfile.mkdtemp(prefix='savi-sync-')
+    servidor, url = servidor_sync_local.iniciar()
+    a = BaseDatos(os.path.join(carpeta, 'a.db'), registrar_cambios=True)
+    b = BaseDatos(os.path.join(carpeta, 'b.db'), registrar_cambios=True)
+    sync_a, sync_b = Sincronizador(a, url), Sincronizador(b, url)
+    try:
+        juntas = datos_sinteticos.juntas(rnd, args.juntas, args.cupos)
+        for junta in juntas:
+            a.guardar_junta(junta)
+            a.guardar_cupos(junta['id'], junta['cupos'])
+            for req in datos_sinteticos.solicitudes(rnd, 5, args.cupos):
+                a.agregar_solicitud(req, junta['id'])
+
+        pasada('A envía todo', sync_a, sync_a.sincronizar)
+        for junta in juntas:
+            b.seguir_junta(junta['id'])
+        pasada('B trae todo', sync_b, sync_b.sincronizar)
+        pasada('B sin novedades (304)', sync_b, sync_b.sincronizar)
+        pasada('B abre una junta al día (304)', sync_b, lambda: sync_b.traer_junta(juntas[0]['id']))
+
+        # El mismo cupo editado varias veces viaja una sola vez
+        for _ in range(3):
+            for _ in range(args.ediciones):
+                junta = rnd.choice(juntas)
+                i = rnd.randrange(1, args.cupos)
+                junta['cupos'][i] = dict(datos_sinteticos.persona(rnd), ocupado=True,
+                                         usuario='Miembro Verificado', numero=str(i + 1))
+                a.guardar_cupos(junta['id'], junta['cupos'], [i])
+        pasada(f'A envía {args.ediciones * 3} ediciones', sync_a, sync_a.sincronizar)
+        pasada('B trae los deltas', sync_b, sync_b.sincronizar)
+
+        # Ediciones en B de vuelta hacia A
+        junta = juntas[0]
+        junta['nombre'] = 'Junta renombrada en B'
+        b.guardar_junta(dict(junta, cupos=[]))
+        b.recortar_cupos(junta['id'], args.cupos // 2)
+        pasada('B renombra y recorta una junta', sync_b, sync_b.sincronizar)
+        pasada('A trae los cambios de B', sync_a, sync_a.sincronizar)
+
+        a.esperar()
+        b.esperar()
+        iguales = estado(a) == estado(b)
+        print(f"Réplicas iguales: {'sí' if iguales else 'NO'}")
+        return 0 if iguales else 1
+    finally:
+        sync_a.detener()
+        sync_b.detener()
+        a.cerrar()
+        b.cerrar()
+        servidor.shutdown()
+        shutil.rmtree(carpeta, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
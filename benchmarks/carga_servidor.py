@@ -0,0 +1,227 @@
+"""Generador de carga para `servidor.py`: latencia p50/p99 y peticiones por segundo.
+
+Levanta el servidor en otro proceso (base temporal), crea algunas juntas y
+abre miles de clientes concurrentes, cada uno con su conexión persistente,
+que durante `--duracion` segundos repiten una mezcla de operaciones:
+resolver invitación, vista previa, ocupar cupo, pedir intercambio, aprobarlo
+(con la clave del organizador) y reportar.
+
+Uso:
+    python benchmarks/carga_servidor.py [--clientes 2000] [--duracion 10] [--juntas 50]
+    python benchmarks/carga_servidor.py --url http://127.0.0.1:8080   # servidor ya levantado
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datos_sinteticos  # noqa: E402
+
+# Operación -> peso en la mezcla
+MEZCLA = {
+    'invitacion': 25,
+    'vista_previa': 40,
+    'ocupar_cupo': 15,
+    'solicitud': 10,
+    'aprobar': 5,
+    'reporte': 5,
+}
+
+
+class Cliente:
+    """Conexión HTTP/1.1 persistente mínima sobre asyncio."""
+
+    def __init__(self, host, puerto):
+        self.host, self.puerto = host, puerto
+        self.lector = self.escritor = None
+
+    async def abrir(self):
+        self.lector, self.escritor = await asyncio.open_connection(self.host, self.puerto)
+
+    async def pedir(self, metodo, ruta, cuerpo=None, cabeceras=None):
+        datos = json.dumps(cuerpo).encode('utf-8') if cuerpo is not None else b''
+        extra = ''.join(f"{k}: {v}\r\n" for k, v in (cabeceras or {}).items())
+        self.escritor.write(
+            f"{metodo} {ruta} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(datos)}\r\n{extra}\r\n"
+            .encode('latin-1') + datos)
+        estado = int((await self.lector.readline()).split()[1])
+        largo = 0
+        while True:
+            linea = await self.lector.readline()
+            if linea in (b'\r\n', b''):
+                break
+            if linea.lower().startswith(b'content-length:'):
+                largo = int(linea.split(b':')[1])
+        respuesta = await self.lector.readexactly(largo)
+        return estado, json.loads(respuesta) if respuesta else None
+
+    def cerrar(self):
+        if self.escritor is not None:
+            self.escritor.close()
+
+
+def subir_limite_archivos():
+    blando, duro = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if blando < duro:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (duro, duro))
+    return duro
+
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def preparar(host, puerto, rnd, cantidad):
+    """Crea `cantidad` juntas y devuelve sus (id, codigo, clave)."""
+    cliente = Cliente(host, puerto)
+    await cliente.abrir()
+    juntas = []
+    try:
+        for _ in range(cantidad):
+            j = datos_sinteticos.junta(rnd)
+            estado, r = await cliente.pedir('POST', '/juntas', {
+                'nombre': j['nombre'], 'monto': j['monto'], 'periodo': j['periodo'], 'cupos': 5000})
+            if estado != 201:
+                raise RuntimeError(f'No se pudo crear la junta: {estado} {r}')
+            juntas.append((r['id'], r['codigo'], r['clave']))
+    finally:
+        cliente.cerrar()
+    return juntas
+
+
+async def trabajar(host, puerto, juntas, fin, rnd, latencias, estados):
+    cliente = Cliente(host, puerto)
+    try:
+        await cliente.abrir()
+    except OSError:
+        estados['conexion_fallida'] = estados.get('conexion_fallida', 0) + 1
+        return
+    operaciones, pesos = list(MEZCLA), list(MEZCLA.values())
+    pendientes = []  # (junta_id, solicitud_id, clave) pedidas por este cliente
+    try:
+        while time.perf_counter() < fin:
+            junta_id, codigo, clave = rnd.choice(juntas)
+            op = rnd.choices(operaciones, pesos)[0]
+            if op == 'aprobar' and not pendientes:
+                op = 'solicitud'
+            inicio = time.perf_counter()
+            if op == 'invitacion':
+                estado, _ = await cliente.pedir('GET', f'/invitaciones/{codigo}')
+            elif op == 'vista_previa':
+                estado, _ = await cliente.pedir('GET', f'/juntas/{junta_id}')
+            elif op == 'ocupar_cupo':
+                estado, _ = await cliente.pedir('POST', f'/juntas/{junta_id}/cupos', datos_sinteticos.persona(rnd))
+            elif op == 'solicitud':
+                a, b = rnd.sample(range(1, 40), 2)
+                estado, r = await cliente.pedir('POST', f'/juntas/{junta_id}/solicitudes',
+                                                {'from': str(a), 'to': str(b)})
+                if estado == 201:
+                    pendientes.append((junta_id, r['id'], clave))
+            elif op == 'aprobar':
+                junta_id, solicitud_id, clave = pendientes.pop()
+                estado, _ = await cliente.pedir('POST', f'/juntas/{junta_id}/solicitudes/{solicitud_id}/aprobar',
+                                                cabeceras={'X-Clave-Organizador': clave})
+            else:
+                estado, _ = await cliente.pedir('POST', '/reportes', {
+                    'dni': f"{rnd.randrange(10_000_000, 99_999_999)}", 'reclamo': 'No pagó', 'junta_id': junta_id})
+            latencias.setdefault(op, []).append((time.perf_counter() - inicio) * 1000)
+            estados[estado] = estados.get(estado, 0) + 1
+    except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+        estados['conexion_cortada'] = estados.get('conexion_cortada', 0) + 1
+    finally:
+        cliente.cerrar()
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+async def cargar(url, clientes, duracion, cantidad_juntas):
+    partes = urlsplit(url)
+    host, puerto = partes.hostname, partes.port
+    rnd = random.Random(2026)
+    juntas = await preparar(host, puerto, rnd, cantidad_juntas)
+
+    # Los clientes se conectan escalonados durante el primer segundo
+    latencias, estados = {}, {}
+    inicio = time.perf_counter()
+    fin = inicio + duracion
+
+    async def escalonado(i):
+        await asyncio.sleep(i / clientes)
+        await trabajar(host, puerto, juntas, fin, random.Random(i), latencias, estados)
+
+    await asyncio.gather(*(escalonado(i) for i in range(clientes)))
+    total_s = time.perf_counter() - inicio
+
+    todas = [ms for lista in latencias.values() for ms in lista]
+    informe = {
+        'clientes': clientes,
+        'duracion_s': round(total_s, 2),
+        'peticiones': len(todas),
+        'rps': round(len(todas) / total_s),
+        'p50_ms': round(percentil(todas, 50), 2) if todas else None,
+        'p99_ms': round(percentil(todas, 99), 2) if todas else None,
+        'media_ms': round(statistics.fmean(todas), 2) if todas else None,
+        'estados': {str(k): v for k, v in sorted(estados.items(), key=str)},
+        'operaciones': {
+            op: {'n': len(v), 'p50_ms': round(percentil(v, 50), 2), 'p99_ms': round(percentil(v, 99), 2)}
+            for op, v in sorted(latencias.items())
+        },
+    }
+    return informe
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clientes', type=int, default=2000)
+    parser.add_argument('--duracion', type=float, default=10)
+    parser.add_argument('--juntas', type=int, default=50)
+    parser.add_argument('--url', help='servidor ya levantado (si no, se inicia uno temporal)')
+    args = parser.parse_args()
+
+    limite = subir_limite_archivos()
+    if args.clientes + 64 > limite:
+        print(f'Aviso: el límite de archivos abiertos ({limite}) es menor que los clientes', file=sys.stderr)
+
+    proceso = carpeta = None
+    url = args.url
+    if url is None:
+        carpeta = tempfile.mkdtemp(prefix='savi-carga-')
+        puerto = puerto_libre()
+        proceso = subprocess.Popen(
+            [sys.executable, os.path.join(RAIZ, 'servidor.py'), '--puerto', str(puerto),
+             '--base', os.path.join(carpeta, 'servidor.db')],
+            cwd=RAIZ, stdout=subprocess.PIPE, text=True,
+            preexec_fn=subir_limite_archivos)
+        print(proceso.stdout.readline().strip(), file=sys.stderr)
+        url = f"http://127.0.0.1:{puerto}"
+    try:
+        informe = asyncio.run(cargar(url, args.clientes, args.duracion, args.juntas))
+    finally:
+        if proceso is not None:
+            proceso.terminate()
+            proceso.wait()
+            shutil.rmtree(carpeta, ignore_errors=True)
+    print(json.dumps(informe, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Generadores de datos sintéticos (juntas, cupos, solicitudes) para los benchmarks.
+
+Todos reciben un `random.Random` para que los datos sean reproducibles.
+"""
+import time
+import uuid
+
+NOMBRES = ('Ana', 'Luis', 'María', 'José', 'Rosa', 'Jorge', 'Lucía', 'Pedro', 'Sofía', 'Raúl')
+APELLIDOS = ('Quispe', 'Flores', 'Sánchez', 'Rojas', 'Huamán', 'Díaz', 'Torres', 'Mamani')
+PERIODOS = ('Semanal', 'Quincenal', 'Mensual')
+
+
+def persona(rnd):
+    nombre = f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)}"
+    return {
+        'nombre': nombre,
+        'dni': f"{rnd.randrange(10_000_000, 99_999_999)}",
+        'telefono': f"9{rnd.randrange(10_000_000, 99_999_999)}",
+        'correo': f"{nombre.split()[0].lower()}{rnd.randrange(1000)}@correo.pe",
+    }
+
+
+def cupos(rnd, cantidad, ocupacion=0.8):
+    """Lista de cupos (dicts) con el organizador en la posición 0."""
+    filas = [{'ocupado': True, 'nombre': 'Tú (Organizador)', 'usuario': 'Organizador',
+              'dni': '', 'telefono': '', 'correo': '', 'numero': '1'}]
+    siguiente = 2
+    for _ in range(1, cantidad):
+        if rnd.random() < ocupacion:
+            fila = dict(persona(rnd), ocupado=True, usuario='Miembro Verificado', numero=str(siguiente))
+            siguiente += 1
+        else:
+            fila = {'ocupado': False, 'nombre': 'Cupo Disponible', 'usuario': 'Toque para editar',
+                    'dni': '', 'telefono': '', 'correo': '', 'numero': ''}
+        filas.append(fila)
+    return filas
+
+
+def junta(rnd, cupos_por_junta=0, creada=None):
+    return {
+        'id': uuid.uuid4().hex,
+        'nombre': f"Junta {rnd.choice(APELLIDOS)} {rnd.randrange(10_000)}",
+        'monto': f"S/ {rnd.randrange(50, 5000)}",
+        'moneda': 'Soles',
+        'periodo': rnd.choice(PERIODOS),
+        'fecha_inicio': f"{rnd.randrange(1, 29):02d}/{rnd.randrange(1, 13):02d}/2026",
+        'fecha_final': 'Pendiente',
+        'creada': creada if creada is not None else time.time() - rnd.random() * 1e7,
+        'cupos': cupos(rnd, cupos_por_junta) if cupos_por_junta else [],
+    }
+
+
+def juntas(rnd, cantidad, cupos_por_junta=0):
+    return [junta(rnd, cupos_por_junta) for _ in range(cantidad)]
+
+
+def solicitudes(rnd, cantidad, max_numero):
+    """Solicitudes de intercambio entre números distintos de [2, max_numero]."""
+    resultado = []
+    for _ in range(cantidad):
+        a, b = rnd.sample(range(2, max_numero + 1), 2)
+        resultado.append({'id': uuid.uuid4().hex, 'from': str(a), 'to': str(b)})
+    return resultado
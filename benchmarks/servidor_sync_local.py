@@ -0,0 +1,56 @@
+"""`servidor.py` en un hilo, con una base temporal, para pruebas y benchmarks.
+
+Es el mismo servicio que en producción (incluida la sincronización por
+deltas de `sincronizacion.py`), solo que levantado en un puerto libre y
+con una base que se borra al detenerlo.
+
+Uso:
+    python benchmarks/servidor_sync_local.py [--puerto 8765]
+
+Como módulo, `iniciar()` lo levanta y devuelve `(servidor, url)`;
+`servidor.shutdown()` lo detiene.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from servidor import ServidorEnHilo  # noqa: E402
+
+
+class ServidorTemporal(ServidorEnHilo):
+    def __init__(self, puerto=0):
+        self.carpeta = tempfile.mkdtemp(prefix='savi-servidor-')
+        super().__init__(os.path.join(self.carpeta, 'servidor.db'), puerto=puerto)
+
+    def shutdown(self):
+        self.detener()
+        shutil.rmtree(self.carpeta, ignore_errors=True)
+
+
+def iniciar(puerto=0):
+    servidor = ServidorTemporal(puerto)
+    return servidor, servidor.url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--puerto', type=int, default=8765)
+    args = parser.parse_args()
+    servidor, url = iniciar(args.puerto)
+    print(f"Sirviendo en {url} (SAVI_SERVIDOR={url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
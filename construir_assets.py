@@ -0,0 +1,93 @@
+"""Genera las variantes por densidad de las imágenes de `assets/`.
+
+Para cada densidad de `recursos.DENSIDADES` crea en
+`assets/generados/<densidad>/`:
+
+- Las ilustraciones del carrusel reducidas al tamaño que cubre la pantalla
+  más grande prevista, en JPEG (son opacas, así que no necesitan alfa y la
+  textura ocupa 3 bytes por píxel en lugar de 4).
+- `iconos.atlas` con los logos e imágenes pequeñas escaladas a su tamaño en
+  pantalla: una sola imagen que se decodifica una vez para todos.
+
+Nunca se amplía una imagen por encima de su tamaño original. Requiere Pillow.
+
+Uso:
+    python construir_assets.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+from recursos import ATLAS, CARPETA, CARPETA_GENERADOS, DENSIDADES
+
+# Ilustraciones a pantalla completa: se escalan para cubrir esta área (dp).
+PANTALLA_DP = (412, 915)
+ILUSTRACIONES = ('1.png', '2.png', '3.png')
+CALIDAD_JPEG = 85
+
+# Imágenes pequeñas -> caja máxima en pantalla (dp), según design.kv.
+ICONOS = {
+    'logo.png': (160, 160),
+    'logo2.png': (180, 80),
+    '5.png': (150, 150),
+}
+TAMANO_ATLAS = 1024
+
+
+def escalar_para_cubrir(imagen, ancho, alto):
+    """Reduce `imagen` lo justo para cubrir `ancho`×`alto` (como FitImage)."""
+    from PIL import Image
+
+    escala = max(ancho / imagen.width, alto / imagen.height)
+    if escala >= 1:
+        return imagen
+    return imagen.resize((round(imagen.width * escala), round(imagen.height * escala)), Image.LANCZOS)
+
+
+def construir_ilustraciones(destino, densidad):
+    from PIL import Image
+
+    ancho, alto = (round(lado * densidad) for lado in PANTALLA_DP)
+    for nombre in ILUSTRACIONES:
+        with Image.open(os.path.join(CARPETA, nombre)) as original:
+            imagen = escalar_para_cubrir(original.convert('RGB'), ancho, alto)
+            salida = os.path.join(destino, os.path.splitext(nombre)[0] + '.jpg')
+            imagen.save(salida, quality=CALIDAD_JPEG, optimize=True, progressive=False)
+
+
+def construir_atlas(destino, densidad):
+    from PIL import Image
+    from kivy.atlas import Atlas
+
+    temporal = tempfile.mkdtemp(prefix='savi-atlas-')
+    try:
+        archivos = []
+        for nombre, (ancho, alto) in ICONOS.items():
+            with Image.open(os.path.join(CARPETA, nombre)) as imagen:
+                imagen = imagen.convert('RGBA')
+                imagen.thumbnail((round(ancho * densidad), round(alto * densidad)), Image.LANCZOS)
+                ruta = os.path.join(temporal, nombre)
+                imagen.save(ruta)
+                archivos.append(ruta)
+        Atlas.create(os.path.join(destino, ATLAS), archivos, TAMANO_ATLAS)
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+
+
+def tamano_carpeta(carpeta):
+    return sum(os.path.getsize(os.path.join(carpeta, f)) for f in os.listdir(carpeta))
+
+
+def main():
+    for sufijo, densidad in DENSIDADES:
+        destino = os.path.join(CARPETA_GENERADOS, sufijo)
+        os.makedirs(destino, exist_ok=True)
+        construir_ilustraciones(destino, densidad)
+        construir_atlas(destino, densidad)
+        print(f"{sufijo:>8}: {tamano_carpeta(destino) / 1024:.0f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Cronograma de pagos de una junta: quién recibe el pozo en cada periodo.
+
+Una junta de n integrantes dura n periodos. En el periodo k (turno k) todos
+pagan la cuota y el integrante con el número k recibe el pozo. Las fechas
+se calculan de una vez con aritmética `datetime64` de NumPy:
+
+- Semanal: cada 7 días desde la fecha de inicio.
+- Quincenal: cada 15 días desde la fecha de inicio.
+- Mensual: el mismo día de cada mes, ajustado al último día en los meses
+  más cortos (un inicio el 31 cae el 28/29 de febrero).
+
+`Cronograma` se guarda en caché por junta y se mantiene al día de forma
+incremental: si cambia el número de un cupo solo se tocan las filas de su
+número anterior y del nuevo, y al agregar cupos solo se calculan las fechas
+de los periodos nuevos.
+"""
+import numpy as np
+
+import pagos
+from pagos import DIAS_PERIODO
+
+SIN_RECEPTOR = -1
+
+
+def parsear_fecha(texto):
+    """'dd/mm/aaaa' -> datetime64[D], o NaT si el texto no es una fecha (ver `pagos.parsear_fecha`)."""
+    fecha = pagos.parsear_fecha(texto)
+    return np.datetime64(fecha, 'D') if fecha is not None else np.datetime64('NaT', 'D')
+
+
+def fechas_periodos(inicio, periodo, desde, hasta):
+    """Fechas de pago (datetime64[D]) de los periodos `desde`..`hasta`-1."""
+    k = np.arange(desde, hasta)
+    if np.isnat(inicio):
+        return np.full(len(k), np.datetime64('NaT', 'D'))
+    if periodo in DIAS_PERIODO:
+        return inicio + k * DIAS_PERIODO[periodo]
+    # Mensual: mismo día del mes, recortado a la duración de cada mes
+    mes_inicio = inicio.astype('datetime64[M]')
+    dia = (inicio - mes_inicio.astype('datetime64[D]')).astype(int)
+    meses = mes_inicio + k
+    primero = meses.astype('datetime64[D]')
+    dias_mes = ((meses + 1).astype('datetime64[D]') - primero).astype(int)
+    return primero + np.minimum(dia, dias_mes - 1)
+
+
+def formatear_fechas(fechas):
+    """datetime64[D] -> lista de 'dd/mm/aaaa' ('Pendiente' para NaT)."""
+    return ['Pendiente' if t == 'NaT' else f'{t[8:10]}/{t[5:7]}/{t[:4]}'
+            for t in np.datetime_as_string(fechas, unit='D')]
+
+
+class Cronograma:
+    """Matriz turno × periodo de una junta.
+
+    - `fechas[k]`: fecha de pago del periodo k (turno k + 1).
+    - `receptor[k]`: posición del cupo que recibe el pozo en el periodo k
+      (`SIN_RECEPTOR` si nadie tiene ese número).
+    - `cuota`: lo que paga cada integrante por periodo; `pozo` = cuota × n.
+    """
+
+    def __init__(self, fecha_inicio, periodo, cuota, cupos):
+        self.inicio = parsear_fecha(fecha_inicio)
+        self.periodo = periodo
+        self.cuota = float(cuota)
+        n = len(cupos)
+        self.fechas = fechas_periodos(self.inicio, periodo, 0, n)
+        self.receptor = np.full(n, SIN_RECEPTOR, dtype=np.int32)
+        self._numero_de = np.zeros(n, dtype=np.int32)  # posición -> número
+        self._pendientes = set()
+        self._reindexar(cupos, range(n))
+
+    def __len__(self):
+        return len(self.fechas)
+
+    @property
+    def pozo(self):
+        return self.cuota * len(self)
+
+    def matriz_pagos(self):
+        """Monto que paga cada integrante (columnas) en cada periodo (filas).
+
+        Todos pagan la misma cuota, así que es una vista de solo lectura sin
+        copiar memoria.
+        """
+        n = len(self)
+        return np.broadcast_to(np.float64(self.cuota), (n, n))
+
+    # --- Actualización incremental ---
+    def cambiar_fechas(self, fecha_inicio=None, periodo=None):
+        """Recalcula las fechas si cambian el inicio o el periodo.
+
+        Devuelve True si alguna fecha cambió (todas las filas se afectan).
+        """
+        inicio = parsear_fecha(fecha_inicio) if fecha_inicio is not None else self.inicio
+        periodo = periodo or self.periodo
+        mismo_inicio = (np.isnat(inicio) and np.isnat(self.inicio)) or inicio == self.inicio
+        if mismo_inicio and periodo == self.periodo:
+            return False
+        self.inicio, self.periodo = inicio, periodo
+        self.fechas = fechas_periodos(inicio, periodo, 0, len(self))
+        return True
+
+    def marcar(self, *posiciones):
+        """Anota cupos cuyo número o nombre cambió; se aplican en `sincronizar`."""
+        self._pendientes.update(posiciones)
+
+    def sincronizar(self, cupos):
+        """Pone al día el cronograma con `cupos` y devuelve las filas afectadas."""
+        filas = set()
+        n, actual = len(cupos), len(self)
+        if n > actual:
+            self.fechas = np.concatenate((self.fechas, fechas_periodos(self.inicio, self.periodo, actual, n)))
+            self.receptor = np.concatenate((self.receptor, np.full(n - actual, SIN_RECEPTOR, np.int32)))
+            self._numero_de = np.concatenate((self._numero_de, np.zeros(n - actual, np.int32)))
+            self._pendientes.update(range(actual, n))
+            filas.update(range(actual, n))
+        elif n < actual:
+            self.fechas = self.fechas[:n]
+            self.receptor = self.receptor[:n]
+            self._numero_de = self._numero_de[:n]
+            # Filas cuyo receptor era un cupo eliminado
+            huerfanas = np.nonzero(self.receptor >= n)[0]
+            self.receptor[huerfanas] = SIN_RECEPTOR
+            filas.update(huerfanas.tolist())
+            self._pendientes = {p for p in self._pendientes if p < n}
+        if self._pendientes:
+            filas.update(self._reindexar(cupos, self._pendientes))
+            self._pendientes = set()
+        return filas
+
+    def _reindexar(self, cupos, posiciones):
+        """Actualiza `receptor` para las posiciones dadas; devuelve filas tocadas."""
+        n = len(self)
+        posiciones = [p for p in posiciones if 0 <= p < n]
+        filas = set()
+        # Primero se liberan los números anteriores y luego se asignan los
+        # nuevos, para que un intercambio entre dos posiciones no se pise.
+        for p in posiciones:
+            anterior = int(self._numero_de[p])
+            if 1 <= anterior <= n and self.receptor[anterior - 1] == p:
+                self.receptor[anterior - 1] = SIN_RECEPTOR
+                filas.add(anterior - 1)
+        for p in posiciones:
+            numero = cupos[p].get('numero') or 0
+            numero = int(numero) if str(numero).isdigit() else 0
+            self._numero_de[p] = numero
+            if 1 <= numero <= n:
+                self.receptor[numero - 1] = p
+                filas.add(numero - 1)
+        return filas
+
+    # --- Vista ---
+    def filas(self, cupos, indices=None):
+        """Dicts de `FilaCronograma` para las filas dadas (o todas), en orden."""
+        indices = range(len(self)) if indices is None else sorted(indices)
+        indices = np.fromiter(indices, dtype=np.int64)
+        fechas = formatear_fechas(self.fechas[indices])
+        pozo = self.pozo
+        filas = []
+        for k, fecha in zip(indices.tolist(), fechas):
+            p = int(self.receptor[k])
+            filas.append({
+                'turno': str(k + 1),
+                'fecha': fecha,
+                'receptor': cupos[p].get('nombre', '') if p != SIN_RECEPTOR else 'Sin asignar',
+                'pozo': f'{pozo:,.2f}',
+                'fila': k,
+            })
+        return filas
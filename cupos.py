@@ -0,0 +1,526 @@
+"""Cupos de una junta: almacenamiento, índices y seguimiento de cambios.
+
+`TablaCupos` guarda cada cupo en un objeto con `__slots__` y mantiene un
+índice número -> posición y montículos de cupos vacíos y de números libres,
+de modo que unirse, buscar por número e intercambiar no recorren la lista.
+
+Cada operación de `TablaCupos` anota las posiciones que toca en un
+`ConjuntoCambios`. Los observadores (`observar`) lo reciben una sola vez
+por frame, o al cerrar un `lote()`, con todo lo que cambió desde la entrega
+anterior: un sorteo o una importación de miles de cupos es una notificación,
+no una por cupo. Sin observadores no se anota nada.
+
+`IntegrantesPagosScreen` marca en `CambiosCupos` los índices que cambian y,
+en cada entrega, `CambiosCupos.aplicar` parchea solo las propiedades de
+esas tarjetas en los datos del RecycleView (y en la tarjeta visible, si la
+hay) en lugar de regenerar la lista completa.
+
+`IndiceCupos` es el índice de búsqueda de integrantes: prefijos sin tildes
+ni mayúsculas sobre nombre, DNI, teléfono y correo, actualizado cupo a cupo.
+"""
+import heapq
+import logging
+import re
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+
+from juntas import normalizar
+
+logger = logging.getLogger(__name__)
+
+# Número reservado para el organizador (cupo 0).
+NUMERO_ORGANIZADOR = 1
+
+CAMPOS = ('ocupado', 'nombre', 'usuario', 'dni', 'telefono', 'correo', 'numero')
+
+# Campos de un cupo ocupado que entran en la búsqueda de integrantes
+CAMPOS_BUSQUEDA = ('nombre', 'dni', 'telefono', 'correo')
+
+_PALABRAS = re.compile(r"[0-9a-z]+")
+
+
+class Cupo:
+    """Un cupo de la junta. `numero` es 0 mientras no tenga turno asignado.
+
+    Expone `get` como un dict para que el código que lee cupos (vistas,
+    persistencia, diálogos) no dependa del tipo concreto.
+    """
+    __slots__ = CAMPOS
+
+    def __init__(self, ocupado=False, nombre='Cupo Disponible', usuario='Toque para editar',
+                 dni='', telefono='', correo='', numero=0):
+        self.ocupado = ocupado
+        self.nombre = nombre
+        self.usuario = usuario
+        self.dni = dni
+        self.telefono = telefono
+        self.correo = correo
+        self.numero = numero
+
+    def get(self, clave, defecto=None):
+        return getattr(self, clave, defecto)
+
+    def a_dict(self):
+        return {campo: getattr(self, campo) for campo in CAMPOS}
+
+
+def _a_numero(valor):
+    try:
+        return int(valor or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class ConjuntoCambios:
+    """Lo que cambió en una `TablaCupos` desde la entrega anterior."""
+
+    __slots__ = ('indices', 'tamano_anterior', 'tamano', 'recortada', 'remoto')
+
+    def __init__(self, tamano, remoto=False):
+        self.indices = set()            # posiciones modificadas o agregadas
+        self.tamano_anterior = tamano
+        self.tamano = tamano            # se completa al entregar
+        self.recortada = False          # se eliminaron cupos del final
+        self.remoto = remoto            # cambios que vinieron del servidor (ya guardados)
+
+    @property
+    def completo(self):
+        """Cambió la cantidad de cupos: la vista se rehace entera.
+
+        Los cupos agregados están en `indices`, incluso si antes hubo un
+        recorte, así que para guardar basta el recorte más esos índices.
+        """
+        return self.recortada or self.tamano != self.tamano_anterior
+
+
+class TablaCupos:
+    """Lista de cupos con índice por número y montículos de huecos libres.
+
+    - `_por_numero`: número de turno -> posición del cupo.
+    - `_vacios`: montículo de posiciones no ocupadas (se limpia de forma
+      perezosa: las entradas obsoletas se descartan al sacarlas).
+    - `_libres`: montículo de números en [2, len] sin asignar, también perezoso.
+
+    `programar` es la función que agenda `entregar` (p. ej. un trigger del
+    Clock); sin ella los cambios se entregan al terminar cada operación o lote.
+    """
+
+    def __init__(self, cupos=()):
+        self._cupos = []
+        self._por_numero = {}
+        self._vacios = []
+        self._libres = []
+        self._ocupados = 0
+        self._observadores = []
+        self._pendientes = None
+        self._profundidad = 0
+        self._remoto = False
+        self.programar = None
+        for cupo in cupos:
+            self._agregar(cupo)
+        self._reconstruir_libres()
+
+    @classmethod
+    def desde_dicts(cls, filas):
+        return cls(Cupo(ocupado=bool(f.get('ocupado')), nombre=f.get('nombre', 'Cupo Disponible'),
+                        usuario=f.get('usuario', 'Toque para editar'), dni=f.get('dni', ''),
+                        telefono=f.get('telefono', ''), correo=f.get('correo', ''),
+                        numero=_a_numero(f.get('numero')))
+                   for f in filas)
+
+    # --- Acceso tipo lista ---
+    def __len__(self):
+        return len(self._cupos)
+
+    def __getitem__(self, indice):
+        return self._cupos[indice]
+
+    def __iter__(self):
+        return iter(self._cupos)
+
+    @property
+    def ocupados(self):
+        return self._ocupados
+
+    @property
+    def todos_ocupados(self):
+        return self._ocupados == len(self._cupos)
+
+    def indice_de_numero(self, numero):
+        """Posición del cupo con ese número de turno, o None."""
+        return self._por_numero.get(_a_numero(numero))
+
+    # --- Mantenimiento de índices ---
+    def _agregar(self, cupo):
+        indice = len(self._cupos)
+        self._cupos.append(cupo)
+        if cupo.ocupado:
+            self._ocupados += 1
+        else:
+            heapq.heappush(self._vacios, indice)
+        if cupo.numero:
+            self._por_numero[cupo.numero] = indice
+
+    def _reconstruir_libres(self):
+        usados = self._por_numero
+        self._libres = [n for n in range(NUMERO_ORGANIZADOR + 1, len(self._cupos) + 1) if n not in usados]
+
+    def _liberar_numero(self, indice):
+        numero = self._cupos[indice].numero
+        if numero and self._por_numero.get(numero) == indice:
+            del self._por_numero[numero]
+            if NUMERO_ORGANIZADOR < numero <= len(self._cupos):
+                heapq.heappush(self._libres, numero)
+        self._cupos[indice].numero = 0
+
+    def _poner_numero(self, indice, numero):
+        if self._cupos[indice].numero:
+            self._liberar_numero(indice)
+        self._cupos[indice].numero = numero
+        if numero:
+            self._por_numero[numero] = indice
+
+    def _sacar_libre(self):
+        """Menor número sin asignar en [2, len], o None."""
+        libres = self._libres
+        while libres:
+            numero = heapq.heappop(libres)
+            if numero not in self._por_numero and numero <= len(self._cupos):
+                return numero
+        return None
+
+    def _sacar_vacio(self):
+        vacios = self._vacios
+        while vacios:
+            indice = heapq.heappop(vacios)
+            if indice < len(self._cupos) and not self._cupos[indice].ocupado:
+                return indice
+        return None
+
+    # --- Cambios y observadores ---
+    def observar(self, funcion):
+        """`funcion(cambios)` recibirá cada `ConjuntoCambios` entregado."""
+        self._observadores.append(funcion)
+
+    def dejar_de_observar(self, funcion):
+        if funcion in self._observadores:
+            self._observadores.remove(funcion)
+
+    @contextmanager
+    def lote(self, remoto=False):
+        """Agrupa operaciones: los observadores no ven el lote a medias.
+
+        `remoto=True` marca los cambios como venidos del servidor. Los lotes
+        anidados toman el origen del exterior.
+        """
+        if self._profundidad == 0:
+            if self._pendientes is not None and self._pendientes.remoto != remoto:
+                self._entregar()
+            self._remoto = remoto
+        self._profundidad += 1
+        try:
+            yield self
+        finally:
+            self._profundidad -= 1
+            if self._profundidad == 0:
+                self._remoto = False
+                self._avisar()
+
+    def entregar(self):
+        """Entrega ahora los cambios pendientes (salvo dentro de un lote)."""
+        if not self._profundidad:
+            self._entregar()
+
+    def _anotar(self):
+        """`ConjuntoCambios` donde anotar la operación en curso, o None si nadie observa."""
+        if not self._observadores:
+            return None
+        pendientes = self._pendientes
+        if pendientes is not None and pendientes.remoto != self._remoto:
+            self._entregar()
+            pendientes = None
+        if pendientes is None:
+            pendientes = self._pendientes = ConjuntoCambios(len(self._cupos), self._remoto)
+        return pendientes
+
+    def _avisar(self):
+        if self._profundidad or self._pendientes is None:
+            return
+        if self.programar is None:
+            self._entregar()
+        else:
+            self.programar()
+
+    def _entregar(self):
+        cambios, self._pendientes = self._pendientes, None
+        if cambios is None:
+            return
+        cambios.tamano = len(self._cupos)
+        for funcion in list(self._observadores):
+            try:
+                funcion(cambios)
+            except Exception:
+                logger.exception('Error notificando cambios de cupos')
+
+    # --- Operaciones ---
+    def redimensionar(self, cantidad):
+        """Agrega cupos vacíos o recorta los sobrantes conservando los datos."""
+        cambios = self._anotar()
+        actual = len(self._cupos)
+        if cantidad > actual:
+            for _ in range(cantidad - actual):
+                self._agregar(Cupo())
+            # Libres = todos los que faltan en [2, cantidad], no solo los nuevos
+            self._reconstruir_libres()
+            if cambios is not None:
+                cambios.indices.update(range(actual, cantidad))
+        elif cantidad < actual:
+            for indice in range(cantidad, actual):
+                cupo = self._cupos[indice]
+                if cupo.numero and self._por_numero.get(cupo.numero) == indice:
+                    del self._por_numero[cupo.numero]
+                    # Un número que sigue en rango vuelve a quedar libre
+                    if NUMERO_ORGANIZADOR < cupo.numero <= cantidad:
+                        heapq.heappush(self._libres, cupo.numero)
+                if cupo.ocupado:
+                    self._ocupados -= 1
+            del self._cupos[cantidad:]
+            if cambios is not None:
+                cambios.recortada = True
+                cambios.indices = {i for i in cambios.indices if i < cantidad}
+        self._avisar()
+
+    def actualizar(self, indice, **campos):
+        """Modifica los campos dados del cupo `indice` manteniendo los índices."""
+        cambios = self._anotar()
+        if cambios is not None:
+            cambios.indices.add(indice)
+        cupo = self._cupos[indice]
+        if 'numero' in campos:
+            self._poner_numero(indice, _a_numero(campos.pop('numero')))
+        if 'ocupado' in campos:
+            ocupado = bool(campos.pop('ocupado'))
+            if ocupado != cupo.ocupado:
+                cupo.ocupado = ocupado
+                if ocupado:
+                    self._ocupados += 1
+                else:
+                    self._ocupados -= 1
+                    heapq.heappush(self._vacios, indice)
+        for campo, valor in campos.items():
+            setattr(cupo, campo, valor)
+        self._avisar()
+
+    def ocupar_siguiente(self, **campos):
+        """Llena el primer cupo vacío y le asigna el menor número libre.
+
+        Devuelve la posición ocupada, o None si no hay cupos vacíos o ningún
+        número libre para darle.
+        """
+        indice = self._sacar_vacio()
+        if indice is None:
+            return None
+        # Un cupo liberado conserva su número; si no tiene, el menor libre
+        numero = self._cupos[indice].numero
+        if not numero or self._por_numero.get(numero) != indice:
+            numero = self._sacar_libre()
+        if numero is None:
+            heapq.heappush(self._vacios, indice)
+            return None
+        campos['numero'] = numero
+        campos['ocupado'] = True
+        self.actualizar(indice, **campos)
+        return indice
+
+    def intercambiar_numeros(self, numero_a, numero_b):
+        """Intercambia dos números de turno. Devuelve sus posiciones o None."""
+        numero_a, numero_b = _a_numero(numero_a), _a_numero(numero_b)
+        idx_a = self._por_numero.get(numero_a)
+        idx_b = self._por_numero.get(numero_b)
+        if idx_a is None or idx_b is None:
+            return None
+        cambios = self._anotar()
+        self._cupos[idx_a].numero, self._cupos[idx_b].numero = numero_b, numero_a
+        self._por_numero[numero_a], self._por_numero[numero_b] = idx_b, idx_a
+        if cambios is not None:
+            cambios.indices.update((idx_a, idx_b))
+        self._avisar()
+        return idx_a, idx_b
+
+    def asignar_numeros(self, asignaciones):
+        """Aplica pares (posición, número) como un bloque (p. ej. un sorteo)."""
+        cambios = self._anotar()
+        asignaciones = list(asignaciones)
+        for indice, _ in asignaciones:
+            self._liberar_numero(indice)
+        for indice, numero in asignaciones:
+            self._poner_numero(indice, _a_numero(numero))
+        if cambios is not None:
+            cambios.indices.update(indice for indice, _ in asignaciones)
+        self._avisar()
+
+    def participantes(self):
+        """Posiciones ocupadas, sin contar al organizador (posición 0)."""
+        cupos = self._cupos
+        return [i for i in range(1, len(cupos)) if cupos[i].ocupado]
+
+
+# Estado de pago de una tarjeta sin pagos que mostrar: (texto, atrasado)
+SIN_ESTADO_PAGO = ('', False)
+
+
+def vista_cupo(index, datos, pago=SIN_ESTADO_PAGO):
+    """Propiedades de `TarjetaIntegrante` para el cupo en la posición `index`.
+
+    `pago` es el `(texto, atrasado)` de `pagos.LibroPagos.estado`.
+    """
+    return {
+        'numero': str(datos.get('numero') or index + 1),
+        'posicion_numero': "left" if (index + 1) % 2 != 0 else "right",
+        'nombre_alias': datos.get('nombre', 'Cupo Disponible'),
+        'usuario': datos.get('usuario', 'Toque para editar'),
+        'dni': datos.get('dni', ''),
+        'telefono': datos.get('telefono', ''),
+        'correo': datos.get('correo', ''),
+        'indice': index,
+        'estado_pago': pago[0],
+        'atrasado': pago[1],
+    }
+
+
+class CambiosCupos:
+    """Conjunto de índices de cupos pendientes de reflejar en la vista."""
+
+    def __init__(self):
+        self._indices = set()
+        self._completo = False
+
+    @property
+    def pendiente(self):
+        return self._completo or bool(self._indices)
+
+    def marcar(self, *indices):
+        self._indices.update(indices)
+
+    def marcar_todo(self):
+        self._completo = True
+
+    def limpiar(self):
+        self._indices.clear()
+        self._completo = False
+
+    def aplicar(self, cupos, datos_vista, obtener_vista=None, estado_pago=None):
+        """Parchea `datos_vista` con los cupos marcados.
+
+        `datos_vista` es la lista de dicts del RecycleView; se modifican los
+        dicts en sitio para no disparar un recálculo del layout.
+        `obtener_vista(indice)` devuelve la tarjeta visible para ese índice (o
+        None); a ella solo se le asignan las propiedades que cambiaron.
+        `estado_pago(indice)` da el estado de pago de cada tarjeta.
+
+        Devuelve el número de tarjetas tocadas, o None si el tamaño cambió o
+        se pidió un refresco completo y hay que regenerar la lista entera.
+        """
+        if self._completo or len(datos_vista) != len(cupos):
+            self.limpiar()
+            return None
+
+        tocadas = 0
+        for i in self._indices:
+            if not 0 <= i < len(cupos):
+                continue
+            nuevo = vista_cupo(i, cupos[i], estado_pago(i) if estado_pago else SIN_ESTADO_PAGO)
+            actual = datos_vista[i]
+            diferencias = {k: v for k, v in nuevo.items() if actual.get(k) != v}
+            if not diferencias:
+                continue
+            actual.update(diferencias)
+            tocadas += 1
+            vista = obtener_vista(i) if obtener_vista else None
+            if vista is not None:
+                for clave, valor in diferencias.items():
+                    setattr(vista, clave, valor)
+        self._indices.clear()
+        return tocadas
+
+
+def palabras_busqueda(texto):
+    """Palabras normalizadas de `texto`: 'Ana Pérez' -> ['ana', 'perez']."""
+    return _PALABRAS.findall(normalizar(texto))
+
+
+class IndiceCupos:
+    """Índice de prefijos posición -> palabras de los cupos ocupados.
+
+    Es una lista ordenada de pares (palabra, posición): los pares cuya palabra
+    empieza con un prefijo forman un tramo contiguo que se ubica con dos
+    búsquedas binarias, como recorrer un trie. Cambiar un cupo quita y vuelve
+    a insertar solo sus palabras.
+    """
+
+    def __init__(self, cupos=()):
+        self._palabras = {}   # posición -> palabras indexadas
+        self._prefijos = []   # [(palabra, posición)] ordenado
+        self.cargar(cupos)
+
+    def __len__(self):
+        return len(self._palabras)
+
+    @staticmethod
+    def _indexar(cupo):
+        if not cupo.get('ocupado'):
+            return set()
+        return set(palabras_busqueda(' '.join([cupo.get(campo) or '' for campo in CAMPOS_BUSQUEDA])))
+
+    def cargar(self, cupos):
+        """Construye el índice de golpe (un solo ordenamiento)."""
+        self._palabras.clear()
+        prefijos = []
+        for indice, cupo in enumerate(cupos):
+            palabras = self._indexar(cupo)
+            if palabras:
+                self._palabras[indice] = palabras
+                prefijos.extend((palabra, indice) for palabra in palabras)
+        prefijos.sort()
+        self._prefijos = prefijos
+
+    def quitar(self, indice):
+        for palabra in self._palabras.pop(indice, ()):
+            del self._prefijos[bisect_left(self._prefijos, (palabra, indice))]
+
+    def actualizar(self, indice, cupo):
+        """Reindexa el cupo de la posición `indice` (None si ya no existe)."""
+        palabras = set(self._indexar(cupo)) if cupo is not None else set()
+        anteriores = self._palabras.get(indice, set())
+        if palabras == anteriores:
+            return
+        for palabra in anteriores - palabras:
+            del self._prefijos[bisect_left(self._prefijos, (palabra, indice))]
+        for palabra in palabras - anteriores:
+            insort(self._prefijos, (palabra, indice))
+        if palabras:
+            self._palabras[indice] = palabras
+        else:
+            self._palabras.pop(indice, None)
+
+    def _con_prefijo(self, prefijo):
+        prefijos = self._prefijos
+        # Las palabras solo tienen [0-9a-z]: '{' es mayor que cualquier continuación
+        inicio = bisect_left(prefijos, (prefijo,))
+        fin = bisect_left(prefijos, (prefijo + '{',), inicio)
+        return {indice for _, indice in prefijos[inicio:fin]}
+
+    def buscar(self, texto):
+        """Posiciones (en orden) de los cupos donde cada palabra de `texto`
+        es prefijo de alguna palabra de su nombre, DNI, teléfono o correo."""
+        palabras = palabras_busqueda(texto)
+        if not palabras:
+            return sorted(self._palabras)
+        coincidencias = None
+        # Las palabras más largas acotan más: se intersecan primero
+        for palabra in sorted(set(palabras), key=len, reverse=True):
+            encontrados = self._con_prefijo(palabra)
+            coincidencias = encontrados if coincidencias is None else coincidencias & encontrados
+            if not coincidencias:
+                return []
+        return sorted(coincidencias)
@@ -0,0 +1,720 @@
+"""Persistencia local de SAVI sobre SQLite.
+
+Guarda juntas, cupos, solicitudes de intercambio, pagos y reportes en una base
+SQLite en modo WAL. Las escrituras se encolan y un hilo dedicado las aplica
+en lotes dentro de una sola transacción, de modo que el bucle principal de
+Kivy nunca espera al disco. Si una operación del lote falla, el lote se
+repite de a una operación (cada una en su SAVEPOINT): solo se pierde la
+que falló, que se informa por `logging` y por `al_fallar`. La lectura
+inicial trae todas las juntas con sus cupos en una única consulta.
+
+Con `registrar_cambios=True` la base es además la réplica local para la
+sincronización (ver `sincronizacion.py`): cada escritura deja en
+`cambios_locales` la última versión de lo que cambió (una fila por junta,
+entidad y clave, así que editar diez veces el mismo cupo envía un solo
+cambio) y `sync_estado` guarda hasta qué versión del servidor se conoce
+cada junta.
+"""
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS juntas (
+    id TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    monto TEXT NOT NULL DEFAULT '',
+    moneda TEXT NOT NULL DEFAULT 'Soles',
+    periodo TEXT NOT NULL DEFAULT 'Mensual',
+    fecha_inicio TEXT NOT NULL DEFAULT '',
+    fecha_final TEXT NOT NULL DEFAULT '',
+    creada REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cupos (
+    junta_id TEXT NOT NULL REFERENCES juntas(id) ON DELETE CASCADE,
+    indice INTEGER NOT NULL,
+    ocupado INTEGER NOT NULL DEFAULT 0,
+    nombre TEXT NOT NULL DEFAULT '',
+    usuario TEXT NOT NULL DEFAULT '',
+    dni TEXT NOT NULL DEFAULT '',
+    telefono TEXT NOT NULL DEFAULT '',
+    correo TEXT NOT NULL DEFAULT '',
+    numero TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (junta_id, indice)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS solicitudes (
+    id TEXT PRIMARY KEY,
+    junta_id TEXT,
+    desde TEXT NOT NULL,
+    hacia TEXT NOT NULL,
+    creada REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pagos (
+    id INTEGER PRIMARY KEY,
+    junta_id TEXT NOT NULL REFERENCES juntas(id) ON DELETE CASCADE,
+    cupo INTEGER NOT NULL,
+    periodo INTEGER NOT NULL,
+    monto REAL NOT NULL,
+    creado REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pagos_cupo ON pagos(junta_id, cupo);
+CREATE TABLE IF NOT EXISTS saldos_cupo (
+    junta_id TEXT NOT NULL REFERENCES juntas(id) ON DELETE CASCADE,
+    cupo INTEGER NOT NULL,
+    pagado REAL NOT NULL,
+    pagos INTEGER NOT NULL,
+    PRIMARY KEY (junta_id, cupo)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS saldos_periodo (
+    junta_id TEXT NOT NULL REFERENCES juntas(id) ON DELETE CASCADE,
+    periodo INTEGER NOT NULL,
+    recaudado REAL NOT NULL,
+    PRIMARY KEY (junta_id, periodo)
+) WITHOUT ROWID;
+-- Los saldos se suman en la misma sentencia que agrega el movimiento
+CREATE TRIGGER IF NOT EXISTS sumar_pago AFTER INSERT ON pagos BEGIN
+    INSERT INTO saldos_cupo (junta_id, cupo, pagado, pagos) VALUES (NEW.junta_id, NEW.cupo, NEW.monto, 1)
+        ON CONFLICT(junta_id, cupo) DO UPDATE SET pagado = pagado + excluded.pagado, pagos = pagos + 1;
+    INSERT INTO saldos_periodo (junta_id, periodo, recaudado) VALUES (NEW.junta_id, NEW.periodo, NEW.monto)
+        ON CONFLICT(junta_id, periodo) DO UPDATE SET recaudado = recaudado + excluded.recaudado;
+END;
+CREATE TRIGGER IF NOT EXISTS restar_pago AFTER DELETE ON pagos BEGIN
+    UPDATE saldos_periodo SET recaudado = recaudado - OLD.monto
+        WHERE junta_id = OLD.junta_id AND periodo = OLD.periodo;
+END;
+-- Un cupo libre (recortado, o guardado sin ocupar) no tiene pagos: quien lo
+-- ocupe después no hereda los del integrante anterior. INSERT OR REPLACE no
+-- dispara el trigger de borrado, así que editar un cupo ocupado no lo toca.
+CREATE TRIGGER IF NOT EXISTS liberar_cupo_recortado AFTER DELETE ON cupos BEGIN
+    DELETE FROM pagos WHERE junta_id = OLD.junta_id AND cupo = OLD.indice;
+    DELETE FROM saldos_cupo WHERE junta_id = OLD.junta_id AND cupo = OLD.indice;
+END;
+CREATE TRIGGER IF NOT EXISTS liberar_cupo_vacio AFTER INSERT ON cupos WHEN NOT NEW.ocupado BEGIN
+    DELETE FROM pagos WHERE junta_id = NEW.junta_id AND cupo = NEW.indice;
+    DELETE FROM saldos_cupo WHERE junta_id = NEW.junta_id AND cupo = NEW.indice;
+END;
+CREATE TABLE IF NOT EXISTS reportes (
+    id INTEGER PRIMARY KEY,
+    dni TEXT NOT NULL,
+    reclamo TEXT NOT NULL,
+    junta_id TEXT,
+    creado REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reportes_dni ON reportes(dni);
+CREATE TABLE IF NOT EXISTS riesgo_dni (
+    dni TEXT PRIMARY KEY,
+    cantidad INTEGER NOT NULL,
+    puntaje REAL NOT NULL,
+    ultimo REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sorteos (
+    id INTEGER PRIMARY KEY,
+    junta_id TEXT NOT NULL,
+    semilla TEXT NOT NULL,
+    motor TEXT NOT NULL,
+    participantes INTEGER NOT NULL,
+    total_numeros INTEGER NOT NULL,
+    creado REAL NOT NULL,
+    -- JSON: posiciones de los cupos sorteados, en orden, y el número que salió para cada una
+    posiciones TEXT NOT NULL DEFAULT '[]',
+    numeros TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_sorteos_junta ON sorteos(junta_id);
+CREATE TABLE IF NOT EXISTS invitaciones (
+    codigo TEXT PRIMARY KEY,
+    junta_id TEXT NOT NULL REFERENCES juntas(id) ON DELETE CASCADE,
+    clave TEXT NOT NULL DEFAULT ''
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_invitaciones_junta ON invitaciones(junta_id);
+CREATE TABLE IF NOT EXISTS ajustes (
+    nombre TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS cambios_locales (
+    orden INTEGER PRIMARY KEY AUTOINCREMENT,
+    junta_id TEXT NOT NULL,
+    entidad TEXT NOT NULL,
+    clave TEXT NOT NULL,
+    datos TEXT,
+    UNIQUE (junta_id, entidad, clave)
+);
+CREATE TABLE IF NOT EXISTS sync_estado (
+    junta_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+-- En el servidor: último cambio de cada (junta, entidad, clave) y su versión
+CREATE TABLE IF NOT EXISTS sync_servidor (
+    junta_id TEXT NOT NULL,
+    entidad TEXT NOT NULL,
+    clave TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    datos TEXT,
+    PRIMARY KEY (junta_id, entidad, clave)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_sync_servidor_version ON sync_servidor(junta_id, version);
+"""
+
+# Sentencias fijas: el módulo sqlite3 cachea la sentencia preparada por texto,
+# así que reutilizar siempre la misma cadena evita volver a compilarla.
+SQL_GUARDAR_JUNTA = (
+    "INSERT INTO juntas (id, nombre, monto, moneda, periodo, fecha_inicio, fecha_final, creada) "
+    "VALUES (:id, :nombre, :monto, :moneda, :periodo, :fecha_inicio, :fecha_final, :creada) "
+    "ON CONFLICT(id) DO UPDATE SET nombre=excluded.nombre, monto=excluded.monto, "
+    "moneda=excluded.moneda, periodo=excluded.periodo, fecha_inicio=excluded.fecha_inicio, "
+    "fecha_final=excluded.fecha_final"
+)
+SQL_ELIMINAR_JUNTA = "DELETE FROM juntas WHERE id = ?"
+SQL_GUARDAR_CUPO = (
+    "INSERT OR REPLACE INTO cupos (junta_id, indice, ocupado, nombre, usuario, dni, telefono, correo, numero) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+SQL_RECORTAR_CUPOS = "DELETE FROM cupos WHERE junta_id = ? AND indice >= ?"
+SQL_AGREGAR_SOLICITUD = "INSERT OR IGNORE INTO solicitudes (id, junta_id, desde, hacia, creada) VALUES (?, ?, ?, ?, ?)"
+SQL_ELIMINAR_SOLICITUD = "DELETE FROM solicitudes WHERE id = ?"
+SQL_AGREGAR_PAGO = "INSERT INTO pagos (junta_id, cupo, periodo, monto, creado) VALUES (?, ?, ?, ?, ?)"
+SQL_AGREGAR_REPORTE = "INSERT INTO reportes (dni, reclamo, junta_id, creado) VALUES (?, ?, ?, ?)"
+SQL_GUARDAR_RIESGO = "INSERT OR REPLACE INTO riesgo_dni (dni, cantidad, puntaje, ultimo) VALUES (?, ?, ?, ?)"
+SQL_REGISTRAR_CAMBIO = (
+    "INSERT OR REPLACE INTO cambios_locales (junta_id, entidad, clave, datos) VALUES (?, ?, ?, ?)"
+)
+SQL_CONFIRMAR_CAMBIOS = "DELETE FROM cambios_locales WHERE orden <= ?"
+SQL_SEGUIR_JUNTA = "INSERT OR IGNORE INTO sync_estado (junta_id, version) VALUES (?, 0)"
+SQL_GUARDAR_VERSION = (
+    "INSERT INTO sync_estado (junta_id, version) VALUES (?, ?) "
+    "ON CONFLICT(junta_id) DO UPDATE SET version = MAX(version, excluded.version)"
+)
+SQL_PUBLICAR_CAMBIO = (
+    "INSERT OR REPLACE INTO sync_servidor (junta_id, entidad, clave, version, datos) VALUES (?, ?, ?, ?, ?)"
+)
+SQL_GUARDAR_INVITACION = "INSERT OR REPLACE INTO invitaciones (codigo, junta_id, clave) VALUES (?, ?, ?)"
+SQL_AGREGAR_SORTEO = (
+    "INSERT INTO sorteos (junta_id, semilla, motor, participantes, total_numeros, creado, posiciones, numeros) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+SQL_CARGAR_JUNTAS = (
+    "SELECT j.id, j.nombre, j.monto, j.moneda, j.periodo, j.fecha_inicio, j.fecha_final, j.creada, "
+    "c.indice, c.ocupado, c.nombre, c.usuario, c.dni, c.telefono, c.correo, c.numero "
+    "FROM juntas j LEFT JOIN cupos c ON c.junta_id = j.id "
+    "ORDER BY j.creada, j.id, c.indice"
+)
+SQL_CARGAR_JUNTA = (
+    "SELECT j.id, j.nombre, j.monto, j.moneda, j.periodo, j.fecha_inicio, j.fecha_final, j.creada, "
+    "c.indice, c.ocupado, c.nombre, c.usuario, c.dni, c.telefono, c.correo, c.numero "
+    "FROM juntas j LEFT JOIN cupos c ON c.junta_id = j.id "
+    "WHERE j.id = ? ORDER BY c.indice"
+)
+SQL_CARGAR_SOLICITUDES = "SELECT id, junta_id, desde, hacia FROM solicitudes ORDER BY creada"
+SQL_CARGAR_SOLICITUDES_JUNTA = "SELECT id, junta_id, desde, hacia FROM solicitudes WHERE junta_id = ? ORDER BY creada"
+SQL_CARGAR_INVITACION = "SELECT codigo, clave FROM invitaciones WHERE junta_id = ?"
+SQL_CARGAR_SALDOS_CUPO = "SELECT cupo, pagado, pagos FROM saldos_cupo WHERE junta_id = ?"
+SQL_CARGAR_SALDOS_PERIODO = "SELECT periodo, recaudado FROM saldos_periodo WHERE junta_id = ?"
+SQL_PAGOS_CUPO = "SELECT periodo, monto, creado FROM pagos WHERE junta_id = ? AND cupo = ? ORDER BY id"
+SQL_CARGAR_RIESGOS = "SELECT dni, cantidad, puntaje, ultimo FROM riesgo_dni"
+SQL_FECHAS_REPORTES = "SELECT dni, creado FROM reportes"
+SQL_RECLAMOS_DNI = "SELECT reclamo, junta_id, creado FROM reportes WHERE dni = ? ORDER BY creado DESC LIMIT ?"
+SQL_CARGAR_INVITACIONES = "SELECT codigo, junta_id FROM invitaciones"
+SQL_CREAR_DISPOSITIVO = "INSERT OR IGNORE INTO ajustes (nombre, valor) VALUES ('dispositivo', ?)"
+SQL_ID_DISPOSITIVO = "SELECT valor FROM ajustes WHERE nombre = 'dispositivo'"
+SQL_CARGAR_CAMBIOS = (
+    "SELECT orden, junta_id, entidad, clave, datos FROM cambios_locales ORDER BY orden LIMIT ?"
+)
+SQL_CLAVES_PENDIENTES = "SELECT entidad, clave FROM cambios_locales WHERE junta_id = ?"
+SQL_CARGAR_CURSORES = "SELECT junta_id, version FROM sync_estado"
+SQL_CAMBIOS_DESDE = (
+    "SELECT entidad, clave, datos FROM sync_servidor WHERE junta_id = ? AND version > ? ORDER BY version"
+)
+SQL_VERSIONES_SERVIDOR = "SELECT junta_id, MAX(version) FROM sync_servidor GROUP BY junta_id"
+SQL_CARGAR_SORTEOS = (
+    "SELECT semilla, motor, participantes, total_numeros, creado, posiciones, numeros FROM sorteos "
+    "WHERE junta_id = ? ORDER BY id"
+)
+
+# Máximo de operaciones que el escritor agrupa en una transacción.
+TAMANO_LOTE = 500
+
+# Entidades que viajan en la sincronización (ver `sincronizacion.py`)
+ENTIDAD_JUNTA = 'junta'
+ENTIDAD_CUPO = 'cupo'
+ENTIDAD_RECORTE = 'recorte'  # clave '', datos {'cantidad': n}: cupos >= n eliminados
+ENTIDAD_SOLICITUD = 'solicitud'
+
+CAMPOS_JUNTA = ('nombre', 'monto', 'moneda', 'periodo', 'fecha_inicio', 'fecha_final', 'creada')
+CAMPOS_CUPO = ('ocupado', 'nombre', 'usuario', 'dni', 'telefono', 'correo', 'numero')
+
+_FIN = object()
+# Marca de las lecturas que se hacen en el hilo escritor (ver `consultar`)
+_CONSULTA = object()
+
+logger = logging.getLogger(__name__)
+
+
+def nuevo_id():
+    """Identificador estable generado en el cliente (no requiere ida y vuelta a la BD)."""
+    return uuid.uuid4().hex
+
+
+def fila_cupo(junta_id, indice, cupo):
+    """Convierte un cupo (dict) en la tupla que espera `SQL_GUARDAR_CUPO`."""
+    return (
+        junta_id, indice, 1 if cupo.get('ocupado') else 0,
+        cupo.get('nombre', ''), cupo.get('usuario', ''),
+        cupo.get('dni', ''), cupo.get('telefono', ''), cupo.get('correo', ''),
+        str(cupo.get('numero', '') or ''),
+    )
+
+
+def datos_cupo(cupo):
+    """Campos de un cupo (dict o `Cupo`) como dict serializable."""
+    datos = {campo: cupo.get(campo, '') for campo in CAMPOS_CUPO}
+    datos['ocupado'] = bool(datos['ocupado'])
+    datos['numero'] = str(datos['numero'] or '')
+    return datos
+
+
+def _juntas_de_filas(filas):
+    """Agrupa las filas de `SQL_CARGAR_JUNTAS` (junta × cupo) en dicts con su lista `cupos`."""
+    juntas = []
+    actual = None
+    for fila in filas:
+        if actual is None or actual['id'] != fila[0]:
+            actual = {
+                'id': fila[0], 'nombre': fila[1], 'monto': fila[2], 'moneda': fila[3],
+                'periodo': fila[4], 'fecha_inicio': fila[5], 'fecha_final': fila[6],
+                'creada': fila[7], 'cupos': [],
+            }
+            juntas.append(actual)
+        if fila[8] is not None:
+            actual['cupos'].append({
+                'ocupado': bool(fila[9]), 'nombre': fila[10], 'usuario': fila[11],
+                'dni': fila[12], 'telefono': fila[13], 'correo': fila[14], 'numero': fila[15],
+            })
+    return juntas
+
+
+class BaseDatos:
+    """Almacén SQLite con escrituras asíncronas en lote.
+
+    Las lecturas se hacen en el hilo que llama; las escrituras se encolan y
+    las aplica un único hilo escritor, agrupando todo lo pendiente en una
+    transacción. `esperar()` bloquea hasta que la cola se vacía.
+
+    `al_fallar(sql, parametros, error)` se llama, desde el hilo escritor, por
+    cada operación que no se pudo aplicar.
+    """
+
+    def __init__(self, ruta, registrar_cambios=False, al_fallar=None):
+        self.ruta = ruta
+        self.registrar_cambios = registrar_cambios
+        self.al_fallar = al_fallar
+        self._lecturas = threading.local()
+        carpeta = os.path.dirname(ruta)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        self._conexion = self._conectar()
+        self._conexion.executescript(ESQUEMA)
+        self._cola = queue.Queue()
+        self._hilo = threading.Thread(target=self._escritor, name='savi-db', daemon=True)
+        self._hilo.start()
+
+    def _conectar(self):
+        conexion = sqlite3.connect(self.ruta, check_same_thread=False, isolation_level=None,
+                                   cached_statements=64)
+        conexion.execute('PRAGMA journal_mode=WAL')
+        conexion.execute('PRAGMA synchronous=NORMAL')
+        conexion.execute('PRAGMA foreign_keys=ON')
+        return conexion
+
+    # --- Escritura ---
+    def _encolar(self, sql, parametros=(), muchos=False):
+        self._cola.put((sql, parametros, muchos))
+
+    def _escritor(self):
+        conexion = self._conectar()
+        while True:
+            op = self._cola.get()
+            if op is _FIN:
+                self._cola.task_done()
+                break
+            lote = [op]
+            fin = False
+            while len(lote) < TAMANO_LOTE:
+                try:
+                    siguiente = self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if siguiente is _FIN:
+                    fin = True
+                    break
+                lote.append(siguiente)
+            try:
+                conexion.execute('BEGIN')
+                for sql, parametros, muchos in lote:
+                    if sql is None or sql is _CONSULTA:  # barrera o lectura
+                        continue
+                    if muchos:
+                        conexion.executemany(sql, parametros)
+                    else:
+                        conexion.execute(sql, parametros)
+                conexion.execute('COMMIT')
+            except Exception:
+                try:
+                    conexion.execute('ROLLBACK')
+                except sqlite3.Error:
+                    pass
+                self._aplicar_de_a_una(conexion, lote)
+            for sql, parametros, _ in lote:
+                if sql is None:
+                    parametros.set()
+                elif sql is _CONSULTA:
+                    self._consultar(conexion, *parametros)
+                self._cola.task_done()
+            if fin:
+                self._cola.task_done()
+                break
+        conexion.close()
+
+    def _aplicar_de_a_una(self, conexion, lote):
+        """Repite un lote que falló aislando cada operación en un SAVEPOINT."""
+        try:
+            conexion.execute('BEGIN')
+            for sql, parametros, muchos in lote:
+                if sql is None or sql is _CONSULTA:
+                    continue
+                conexion.execute('SAVEPOINT operacion')
+                try:
+                    if muchos:
+                        conexion.executemany(sql, parametros)
+                    else:
+                        conexion.execute(sql, parametros)
+                except Exception as e:
+                    conexion.execute('ROLLBACK TO operacion')
+                    self._informar_fallo(sql, parametros, e)
+                conexion.execute('RELEASE operacion')
+            conexion.execute('COMMIT')
+        except Exception as e:
+            # Falló la transacción en sí (p. ej. disco lleno): se pierde el lote
+            try:
+                conexion.execute('ROLLBACK')
+            except sqlite3.Error:
+                pass
+            self._informar_fallo(None, len(lote), e)
+
+    def _consultar(self, conexion, sql, parametros, al_terminar):
+        try:
+            filas = conexion.execute(sql, parametros).fetchall()
+        except Exception as e:
+            logger.error('Error leyendo de la base de datos (%s): %s', sql.split(' WHERE')[0], e)
+            filas = None
+        try:
+            al_terminar(filas)
+        except Exception:
+            logger.exception('Error entregando una consulta')
+
+    def consultar(self, sql, parametros, al_terminar):
+        """Lee en el hilo escritor, después de todo lo encolado hasta ahora.
+
+        `al_terminar(filas)` se llama desde ese hilo (con None si la lectura
+        falló); quien actualice la interfaz debe pasarla al hilo principal.
+        """
+        self._cola.put((_CONSULTA, (sql, parametros, al_terminar), False))
+
+    def _informar_fallo(self, sql, parametros, error):
+        if sql is None:
+            logger.error('No se pudo guardar un lote de %d operaciones: %s', parametros, error)
+        else:
+            logger.error('Error escribiendo en la base de datos (%s): %s', sql.split(' (')[0], error)
+        if self.al_fallar is not None:
+            try:
+                self.al_fallar(sql, parametros, error)
+            except Exception:
+                logger.exception('Error en al_fallar')
+
+    def guardar_junta(self, junta):
+        """Inserta o actualiza los datos generales de una junta."""
+        datos = {
+            'id': junta['id'],
+            'nombre': junta.get('nombre', ''),
+            'monto': junta.get('monto', ''),
+            'moneda': junta.get('moneda', 'Soles'),
+            'periodo': junta.get('periodo', 'Mensual'),
+            'fecha_inicio': junta.get('fecha_inicio', ''),
+            'fecha_final': junta.get('fecha_final', ''),
+            'creada': junta.get('creada') or time.time(),
+        }
+        self._encolar(SQL_GUARDAR_JUNTA, datos)
+        if self.registrar_cambios:
+            self._encolar(SQL_SEGUIR_JUNTA, (junta['id'],))
+            self._registrar(junta['id'], ENTIDAD_JUNTA, junta['id'],
+                            {campo: datos[campo] for campo in CAMPOS_JUNTA})
+
+    def eliminar_junta(self, junta_id):
+        self._encolar(SQL_ELIMINAR_JUNTA, (junta_id,))
+        if self.registrar_cambios:
+            self._registrar(junta_id, ENTIDAD_JUNTA, junta_id, None)
+
+    def recortar_cupos(self, junta_id, cantidad):
+        """Elimina los cupos con índice mayor o igual a `cantidad`; se sincroniza como un solo cambio."""
+        self._encolar(SQL_RECORTAR_CUPOS, (junta_id, cantidad))
+        if self.registrar_cambios:
+            self._registrar(junta_id, ENTIDAD_RECORTE, '', {'cantidad': cantidad})
+
+    def guardar_cupos(self, junta_id, cupos, indices=None):
+        """Guarda los cupos indicados (o todos) y recorta los sobrantes.
+
+        Con `indices=None` se reescribe la lista completa y se eliminan los
+        cupos con índice mayor o igual a `len(cupos)`. Para un recorte con
+        pocos cambios conviene `recortar_cupos` más los índices cambiados.
+        """
+        if indices is None:
+            indices = range(len(cupos))
+            self.recortar_cupos(junta_id, len(cupos))
+        else:
+            indices = [i for i in indices if 0 <= i < len(cupos)]
+        filas = [fila_cupo(junta_id, i, cupos[i]) for i in indices]
+        if filas:
+            self._encolar(SQL_GUARDAR_CUPO, filas, muchos=True)
+            if self.registrar_cambios:
+                self._encolar(SQL_REGISTRAR_CAMBIO, [
+                    (junta_id, ENTIDAD_CUPO, str(i), json.dumps(datos_cupo(cupos[i]), ensure_ascii=False))
+                    for i in indices
+                ], muchos=True)
+
+    def agregar_solicitud(self, solicitud, junta_id=None):
+        self._encolar(SQL_AGREGAR_SOLICITUD, (
+            solicitud['id'], junta_id, solicitud['from'], solicitud['to'], time.time()))
+        if self.registrar_cambios and junta_id:
+            self._registrar(junta_id, ENTIDAD_SOLICITUD, solicitud['id'],
+                            {'from': solicitud['from'], 'to': solicitud['to']})
+
+    def eliminar_solicitud(self, solicitud_id, junta_id=None):
+        self._encolar(SQL_ELIMINAR_SOLICITUD, (solicitud_id,))
+        if self.registrar_cambios and junta_id:
+            self._registrar(junta_id, ENTIDAD_SOLICITUD, solicitud_id, None)
+
+    def agregar_pago(self, junta_id, cupo, periodo, monto, creado):
+        """Agrega un movimiento al libro de pagos; el trigger `sumar_pago` actualiza los saldos."""
+        self._encolar(SQL_AGREGAR_PAGO, (junta_id, cupo, periodo, monto, creado))
+
+    def agregar_reporte(self, dni, reclamo, junta_id=None, creado=None, historial=None):
+        """Guarda el reclamo y, si se pasa, el `reportes.Historial` ya actualizado del DNI."""
+        self._encolar(SQL_AGREGAR_REPORTE, (dni, reclamo, junta_id, creado or time.time()))
+        if historial is not None:
+            self._encolar(SQL_GUARDAR_RIESGO, (dni, historial.cantidad, historial.puntaje, historial.ultimo))
+
+    def guardar_riesgos(self, filas):
+        self._encolar(SQL_GUARDAR_RIESGO, list(filas), muchos=True)
+
+    def agregar_sorteo(self, junta_id, sorteo):
+        """Registra un sorteo: semilla y parámetros para repetirlo, y su resultado para compararlo.
+
+        `sorteo['posiciones']` son las posiciones de los cupos en el orden en
+        que se sortearon y `sorteo['numeros']` el número que salió para cada una.
+        """
+        posiciones, numeros = list(sorteo['posiciones']), list(sorteo['numeros'])
+        self._encolar(SQL_AGREGAR_SORTEO, (
+            junta_id, str(sorteo['semilla']), sorteo['motor'], len(posiciones),
+            sorteo['total_numeros'], sorteo.get('creado') or time.time(),
+            json.dumps(posiciones), json.dumps(numeros)))
+
+    # --- Sincronización ---
+    def _registrar(self, junta_id, entidad, clave, datos):
+        texto = json.dumps(datos, ensure_ascii=False) if datos is not None else None
+        self._encolar(SQL_REGISTRAR_CAMBIO, (junta_id, entidad, clave, texto))
+
+    def seguir_junta(self, junta_id):
+        """Empieza a sincronizar una junta creada en otro dispositivo."""
+        self._encolar(SQL_SEGUIR_JUNTA, (junta_id,))
+
+    def confirmar_cambios(self, hasta_orden):
+        """Olvida los cambios locales ya enviados (los reeditados después se conservan)."""
+        self._encolar(SQL_CONFIRMAR_CAMBIOS, (hasta_orden,))
+
+    def aplicar_remotos(self, junta_id, version, cambios):
+        """Escribe cambios recibidos del servidor sin volver a registrarlos.
+
+        `cambios` son dicts con entidad, clave y datos (None = borrado; los
+        cupos nunca se borran, se recortan), en el orden del servidor. Los
+        datos de la junta van primero porque los cupos la referencian, y su
+        borrado al final.
+        """
+        alta = [c for c in cambios if c['entidad'] == ENTIDAD_JUNTA and c['datos'] is not None]
+        baja = [c for c in cambios if c['entidad'] == ENTIDAD_JUNTA and c['datos'] is None]
+        resto = [c for c in cambios if c['entidad'] != ENTIDAD_JUNTA]
+        for cambio in alta + resto + baja:
+            entidad, clave, datos = cambio['entidad'], cambio['clave'], cambio['datos']
+            if entidad == ENTIDAD_JUNTA:
+                if datos is None:
+                    self._encolar(SQL_ELIMINAR_JUNTA, (junta_id,))
+                else:
+                    self._encolar(SQL_GUARDAR_JUNTA, dict(
+                        {campo: datos.get(campo, '') for campo in CAMPOS_JUNTA},
+                        id=junta_id, creada=datos.get('creada') or time.time()))
+            elif entidad == ENTIDAD_CUPO:
+                self._encolar(SQL_GUARDAR_CUPO, fila_cupo(junta_id, int(clave), datos))
+            elif entidad == ENTIDAD_RECORTE:
+                self._encolar(SQL_RECORTAR_CUPOS, (junta_id, int(datos['cantidad'])))
+            elif entidad == ENTIDAD_SOLICITUD:
+                if datos is None:
+                    self._encolar(SQL_ELIMINAR_SOLICITUD, (clave,))
+                else:
+                    self._encolar(SQL_AGREGAR_SOLICITUD, (clave, junta_id, datos['from'], datos['to'], time.time()))
+        self._encolar(SQL_GUARDAR_VERSION, (junta_id, version))
+
+    def _lector(self):
+        """Conexión de lectura del hilo actual (el hilo principal usa la suya)."""
+        if threading.current_thread() is threading.main_thread():
+            return self._conexion
+        conexion = getattr(self._lecturas, 'conexion', None)
+        if conexion is None:
+            conexion = self._lecturas.conexion = self._conectar()
+        return conexion
+
+    def cambios_pendientes(self, limite=1000):
+        """Cambios locales sin enviar, del más antiguo al más reciente."""
+        return [
+            {'orden': f[0], 'junta_id': f[1], 'entidad': f[2], 'clave': f[3],
+             'datos': json.loads(f[4]) if f[4] is not None else None}
+            for f in self._lector().execute(SQL_CARGAR_CAMBIOS, (limite,))
+        ]
+
+    def claves_pendientes(self, junta_id):
+        """(entidad, clave) con cambios locales aún sin enviar para la junta."""
+        return set(self._lector().execute(SQL_CLAVES_PENDIENTES, (junta_id,)).fetchall())
+
+    def cursores(self):
+        """Versión del servidor conocida para cada junta sincronizada."""
+        return dict(self._lector().execute(SQL_CARGAR_CURSORES).fetchall())
+
+    # --- Sincronización, lado del servidor ---
+    def publicar_cambios(self, junta_id, base, cambios):
+        """Guarda `cambios` (entidad, clave, datos) con las versiones base+1, base+2...
+
+        Por cada clave queda solo la última versión, como en `cambios_locales`.
+        """
+        self._encolar(SQL_PUBLICAR_CAMBIO, [
+            (junta_id, c['entidad'], str(c['clave']), base + i,
+             json.dumps(c['datos'], ensure_ascii=False) if c['datos'] is not None else None)
+            for i, c in enumerate(cambios, 1)
+        ], muchos=True)
+
+    def cambios_desde(self, junta_id, version):
+        """Cambios publicados de la junta posteriores a `version`, en orden de versión."""
+        return [
+            {'entidad': f[0], 'clave': f[1], 'datos': json.loads(f[2]) if f[2] is not None else None}
+            for f in self._lector().execute(SQL_CAMBIOS_DESDE, (junta_id, version))
+        ]
+
+    def versiones_servidor(self):
+        """Última versión publicada de cada junta."""
+        return dict(self._lector().execute(SQL_VERSIONES_SERVIDOR).fetchall())
+
+    def barrera(self):
+        """Evento que se activa cuando lo encolado hasta ahora ya está escrito.
+
+        A diferencia de `esperar`, no depende de que la cola llegue a vaciarse,
+        así que sirve aunque otros hilos sigan escribiendo.
+        """
+        listo = threading.Event()
+        self._encolar(None, listo)
+        return listo
+
+    def esperar(self):
+        """Bloquea hasta que todas las escrituras encoladas se hayan aplicado."""
+        self._cola.join()
+
+    def cerrar(self):
+        if self._hilo.is_alive():
+            self._cola.put(_FIN)
+            self._hilo.join()
+        self._conexion.close()
+
+    # --- Lectura ---
+    def cargar_todo(self):
+        """Carga todas las juntas (con sus cupos) y las solicitudes pendientes.
+
+        Devuelve `(juntas, solicitudes)` donde `juntas` es una lista de dicts
+        en orden de creación, cada uno con su lista `cupos`.
+        """
+        juntas = _juntas_de_filas(self._conexion.execute(SQL_CARGAR_JUNTAS))
+        solicitudes = [
+            {'id': f[0], 'junta_id': f[1], 'from': f[2], 'to': f[3]}
+            for f in self._conexion.execute(SQL_CARGAR_SOLICITUDES)
+        ]
+        return juntas, solicitudes
+
+    def cargar_junta(self, junta_id):
+        """Una junta con sus cupos y sus solicitudes pendientes, o None.
+
+        Se puede llamar desde cualquier hilo (cada uno lee con su conexión).
+        """
+        conexion = self._lector()
+        juntas = _juntas_de_filas(conexion.execute(SQL_CARGAR_JUNTA, (junta_id,)))
+        if not juntas:
+            return None
+        junta = juntas[0]
+        junta['solicitudes'] = [
+            {'id': f[0], 'junta_id': f[1], 'from': f[2], 'to': f[3]}
+            for f in conexion.execute(SQL_CARGAR_SOLICITUDES_JUNTA, (junta_id,))
+        ]
+        junta['codigo'], junta['clave'] = conexion.execute(
+            SQL_CARGAR_INVITACION, (junta_id,)).fetchone() or ('', '')
+        return junta
+
+    def guardar_invitacion(self, codigo, junta_id, clave=''):
+        """Asocia un código de invitación (y la clave del organizador) a una junta."""
+        self._encolar(SQL_GUARDAR_INVITACION, (codigo, junta_id, clave))
+
+    def saldos_pagos(self, junta_id):
+        """Saldos de una junta: filas (cupo, pagado, pagos) y (periodo, recaudado)."""
+        lector = self._lector()
+        return (lector.execute(SQL_CARGAR_SALDOS_CUPO, (junta_id,)).fetchall(),
+                lector.execute(SQL_CARGAR_SALDOS_PERIODO, (junta_id,)).fetchall())
+
+    def recaudado(self, junta_id, al_terminar):
+        """Pide las filas (periodo, recaudado) de una junta, leídas en el hilo escritor; ver `consultar`."""
+        self.consultar(SQL_CARGAR_SALDOS_PERIODO, (junta_id,), al_terminar)
+
+    def pagos_cupo(self, junta_id, cupo, al_terminar):
+        """Pide los movimientos (periodo, monto, creado) de un cupo, del más antiguo al más reciente.
+
+        Se leen en el hilo escritor con el índice (junta_id, cupo), así que ya
+        incluyen los pagos encolados antes; ver `consultar`.
+        """
+        self.consultar(SQL_PAGOS_CUPO, (junta_id, cupo), al_terminar)
+
+    def cargar_riesgos(self):
+        """Agregados (dni, cantidad, puntaje, ultimo) de todos los DNI reportados."""
+        return self._lector().execute(SQL_CARGAR_RIESGOS).fetchall()
+
+    def fechas_reportes(self):
+        return self._lector().execute(SQL_FECHAS_REPORTES)
+
+    def reclamos(self, dni, limite=20):
+        """Últimos reclamos contra un DNI, del más reciente al más antiguo."""
+        return [
+            {'reclamo': f[0], 'junta_id': f[1], 'creado': f[2]}
+            for f in self._lector().execute(SQL_RECLAMOS_DNI, (dni, limite))
+        ]
+
+    def cargar_invitaciones(self):
+        """Todos los pares (codigo, junta_id), para construir el índice de códigos."""
+        return self._lector().execute(SQL_CARGAR_INVITACIONES).fetchall()
+
+    def id_dispositivo(self):
+        """Id aleatorio de este dispositivo; se genera y guarda la primera vez."""
+        self._conexion.execute(SQL_CREAR_DISPOSITIVO, (nuevo_id(),))
+        return self._conexion.execute(SQL_ID_DISPOSITIVO).fetchone()[0]
+
+    def sorteos(self, junta_id):
+        """Sorteos registrados de una junta, del más antiguo al más reciente."""
+        return [
+            {'semilla': int(f[0]), 'motor': f[1], 'participantes': f[2], 'total_numeros': f[3],
+             'creado': f[4], 'posiciones': json.loads(f[5]), 'numeros': json.loads(f[6])}
+            for f in self._lector().execute(SQL_CARGAR_SORTEOS, (junta_id,))
+        ]
@@ -0,0 +1,274 @@
+"""Diálogos reutilizables: cada tipo se construye una vez y se vuelve a abrir.
+
+Crear un `MDDialog` con sus campos y botones cuesta decenas de milisegundos
+en un teléfono lento, y antes se pagaba en cada toque de una tarjeta.
+`PoolDialogos` guarda un `DialogoReutilizable` por tipo. Cada apertura solo
+reasigna textos, valores y acciones: al cerrarse el diálogo suelta las
+acciones y al abrirse deja en blanco todo campo sin valor nuevo, así nada
+de la apertura anterior se filtra a la siguiente.
+`precalentar` arma los diálogos que probablemente se usen, de a uno por frame,
+mientras la pantalla está quieta.
+
+Las fábricas de cada tipo están al final del módulo. KivyMD se importa dentro
+de ellas, así que importar este módulo no carga los diálogos.
+"""
+from kivy.animation import Animation
+from kivy.clock import Clock
+
+
+class DialogoReutilizable:
+    """Un `MDDialog` con etiquetas, campos de texto y botones fijos.
+
+    - `etiquetas` y `campos`: nombre -> widget, en el orden del contenido.
+    - `botones`: nombre -> botón; un botón sin acción cierra el diálogo.
+
+    Cada apertura puede ocultar etiquetas o botones por nombre.
+    """
+
+    def __init__(self, dialogo, contenido, etiquetas, campos, botones):
+        self.dialogo = dialogo
+        self.contenido = contenido
+        self.etiquetas = etiquetas
+        self.campos = campos
+        self.botones = botones
+        self._orden_contenido = list(reversed(contenido.children))
+        caja = next(iter(botones.values())).parent if botones else None
+        self._caja_botones = caja
+        self._orden_botones = list(reversed(caja.children)) if caja is not None else []
+        self._acciones = {}
+        self._al_escribir = {}
+        self._ocultos = set()
+        # Cuenta las aperturas, para que una respuesta tardía no pise la siguiente
+        self.apertura = 0
+        for nombre, boton in botones.items():
+            boton.bind(on_release=lambda _, n=nombre: self._accionar(n))
+        for nombre, campo in campos.items():
+            campo.bind(text=lambda campo, texto, n=nombre: self._escrito(n, campo, texto))
+        dialogo.bind(on_dismiss=self._reiniciar)
+        # El alto sigue al contenido, que cambia según lo que muestra cada apertura
+        contenido.bind(height=dialogo.update_height)
+        dialogo.ids.container.bind(height=self._ajustar_alto)
+
+    @property
+    def abierto(self):
+        """En pantalla (incluida la animación de cierre)."""
+        return self.dialogo.parent is not None
+
+    def abrir(self, titulo=None, textos=None, valores=None, acciones=None, al_escribir=None, ocultos=()):
+        """Reasigna el contenido y abre el diálogo.
+
+        `textos`: etiqueta -> texto. `valores`: campo -> texto inicial (los
+        demás campos quedan vacíos).
+        `acciones`: botón -> función sin argumentos. `al_escribir`: campo ->
+        función(campo, texto), llamada también con el valor inicial.
+        `ocultos`: etiquetas o botones que no se muestran esta vez.
+        """
+        if self.abierto:
+            # Si aún se está desvaneciendo, esa animación lo cerraría otra vez
+            Animation.cancel_all(self.dialogo, '_anim_alpha')
+            self.dialogo.dismiss(animation=False)
+        self.apertura += 1
+        if titulo is not None:
+            self.dialogo.title = titulo
+        for nombre, texto in (textos or {}).items():
+            self.etiquetas[nombre].text = texto
+        self._mostrar(set(ocultos))
+        self._acciones = dict(acciones or {})
+        self._al_escribir = {}
+        valores = valores or {}
+        for nombre, campo in self.campos.items():
+            campo.text = valores.get(nombre, '')
+            campo.helper_text = ''
+            campo.error = False
+        self._al_escribir = dict(al_escribir or {})
+        for nombre, funcion in self._al_escribir.items():
+            campo = self.campos[nombre]
+            funcion(campo, campo.text)
+        # Medir ya el contenido, para que se abra con el alto correcto
+        for etiqueta in self.etiquetas.values():
+            etiqueta.texture_update()
+        self.contenido.do_layout()
+        self.dialogo.ids.container.do_layout()
+        self.dialogo.open()
+
+    def cerrar(self):
+        self.dialogo.dismiss()
+
+    def _mostrar(self, ocultos):
+        if ocultos == self._ocultos:
+            return
+        self._ocultos = ocultos
+        quitar = {id(w) for n in ocultos for w in (self.etiquetas.get(n), self.botones.get(n)) if w is not None}
+        for contenedor, orden in ((self.contenido, self._orden_contenido),
+                                  (self._caja_botones, self._orden_botones)):
+            if contenedor is None:
+                continue
+            contenedor.clear_widgets()
+            for widget in orden:
+                if id(widget) not in quitar:
+                    contenedor.add_widget(widget)
+
+    def _ajustar_alto(self, contenedor, alto):
+        self.dialogo.height = alto
+
+    def _accionar(self, nombre):
+        accion = self._acciones.get(nombre)
+        if accion is None:
+            self.cerrar()
+        else:
+            accion()
+
+    def _escrito(self, nombre, campo, texto):
+        funcion = self._al_escribir.get(nombre)
+        if funcion is not None:
+            funcion(campo, texto)
+
+    def _reiniciar(self, *args):
+        # Los campos se limpian al volver a abrir, no durante la animación de cierre
+        self._acciones = {}
+        self._al_escribir = {}
+        for campo in self.campos.values():
+            campo.focus = False
+
+
+class PoolDialogos:
+    """Un `DialogoReutilizable` por tipo, creado la primera vez que se pide."""
+
+    def __init__(self):
+        self._dialogos = {}
+        self._pendientes = []
+        self._trigger = Clock.create_trigger(self._precalentar_siguiente, 0.5)
+
+    def __contains__(self, nombre):
+        return nombre in self._dialogos
+
+    def obtener(self, nombre):
+        dialogo = self._dialogos.get(nombre)
+        if dialogo is None:
+            dialogo = self._dialogos[nombre] = FABRICAS[nombre]()
+        return dialogo
+
+    def precalentar(self, *nombres):
+        """Arma los diálogos indicados en segundo plano, uno por frame."""
+        self._pendientes.extend(n for n in nombres if n not in self._dialogos and n not in self._pendientes)
+        if self._pendientes:
+            self._trigger()
+
+    def _precalentar_siguiente(self, *args):
+        if self._pendientes:
+            self.obtener(self._pendientes.pop(0))
+        if self._pendientes:
+            Clock.schedule_once(self._precalentar_siguiente)
+
+
+# --- Fábricas ---
+def _armar(titulo, etiquetas=(), campos=(), botones=(), espacio='8dp'):
+    """Crea el `DialogoReutilizable`.
+
+    `etiquetas` y `campos` son pares (nombre, kwargs) en el orden del
+    contenido. `botones` son tuplas (nombre, texto, principal).
+    """
+    from kivymd.uix.boxlayout import MDBoxLayout
+    from kivymd.uix.button import MDFillRoundFlatButton, MDFlatButton
+    from kivymd.uix.dialog import MDDialog
+    from kivymd.uix.label import MDLabel
+    from kivymd.uix.textfield import MDTextField
+
+    contenido = MDBoxLayout(orientation='vertical', spacing=espacio, adaptive_height=True, size_hint_y=None)
+    widgets_etiquetas, widgets_campos = {}, {}
+    for nombre, opciones in etiquetas:
+        widgets_etiquetas[nombre] = MDLabel(**opciones)
+        contenido.add_widget(widgets_etiquetas[nombre])
+    for nombre, opciones in campos:
+        widgets_campos[nombre] = MDTextField(**opciones)
+        contenido.add_widget(widgets_campos[nombre])
+    widgets_botones = {
+        nombre: (MDFillRoundFlatButton if principal else MDFlatButton)(text=texto)
+        for nombre, texto, principal in botones
+    }
+    dialogo = MDDialog(title=titulo or '', type='custom', content_cls=contenido,
+                       buttons=list(widgets_botones.values()))
+    return DialogoReutilizable(dialogo, contenido, widgets_etiquetas, widgets_campos, widgets_botones)
+
+
+def crear_edicion():
+    """Datos de un integrante (editar un cupo o unirse con el código)."""
+    return _armar(
+        None,
+        etiquetas=(
+            ('titulo', {'font_style': 'H6', 'adaptive_height': True}),
+            ('subtitulo', {'text': 'Datos del participante', 'theme_text_color': 'Secondary',
+                           'font_style': 'Caption', 'adaptive_height': True}),
+            ('pagos', {'theme_text_color': 'Secondary', 'font_style': 'Caption', 'adaptive_height': True}),
+        ),
+        campos=(
+            ('nombre', {'hint_text': 'Nombre Completo'}),
+            ('dni', {'hint_text': 'DNI', 'input_filter': 'int', 'max_text_length': 8}),
+            ('telefono', {'hint_text': 'Celular', 'input_filter': 'int', 'max_text_length': 9}),
+            ('correo', {'hint_text': 'Correo'}),
+        ),
+        botones=(('cancelar', 'CANCELAR', False), ('pagar', 'REGISTRAR PAGO', False),
+                 ('guardar', 'GUARDAR DATOS', True)),
+        espacio='12dp',
+    )
+
+
+def crear_intercambio():
+    """El dueño intercambia dos números de turno."""
+    return _armar(
+        'Intercambiar Números',
+        campos=(('a', {'hint_text': 'Número actual (ej: 2)'}),
+                ('b', {'hint_text': 'Número a intercambiar (ej: 3)'})),
+        botones=(('cancelar', 'CANCELAR', False), ('intercambiar', 'INTERCAMBIAR', True)),
+    )
+
+
+def crear_solicitud_intercambio():
+    """Un participante pide al dueño cambiar su número con otro."""
+    return _armar(
+        'Solicitar Intercambio',
+        campos=(('mio', {'hint_text': 'Tu número (ej: 2)'}),
+                ('otro', {'hint_text': 'Número con quien quieres cambiar (ej: 3)'})),
+        botones=(('cancelar', 'CANCELAR', False), ('enviar', 'ENVIAR', True)),
+    )
+
+
+def crear_cantidad_cupos():
+    """Cambiar la cantidad de cupos de la junta (el máximo lo pone quien lo abre)."""
+    return _armar(
+        'Editar Integrantes',
+        campos=(('cantidad', {'hint_text': 'Cantidad de cupos', 'input_filter': 'int'}),),
+        botones=(('cancelar', 'CANCELAR', False), ('guardar', 'GUARDAR', False)),
+    )
+
+
+def crear_confirmar_union():
+    """Vista previa de la junta de un código de invitación."""
+    return _armar(
+        'Confirmar unión',
+        etiquetas=tuple((nombre, {'theme_text_color': color, 'adaptive_height': True})
+                        for nombre, color in (('nombre', 'Primary'), ('monto', 'Primary'),
+                                              ('organizador', 'Primary'), ('periodo', 'Primary'),
+                                              ('cupos', 'Secondary'))),
+        botones=(('cancelar', 'CANCELAR', False), ('unirse', 'SOLICITAR UNIRSE', True)),
+    )
+
+
+def crear_procesar_solicitud():
+    """El dueño aprueba o rechaza una solicitud de intercambio."""
+    return _armar(
+        'Procesar Solicitud de Intercambio',
+        etiquetas=(('solicitud', {'theme_text_color': 'Primary', 'adaptive_height': True}),),
+        botones=(('rechazar', 'RECHAZAR', False), ('aprobar', 'APROBAR', True)),
+        espacio='6dp',
+    )
+
+
+FABRICAS = {
+    'edicion': crear_edicion,
+    'intercambio': crear_intercambio,
+    'solicitud_intercambio': crear_solicitud_intercambio,
+    'cantidad_cupos': crear_cantidad_cupos,
+    'confirmar_union': crear_confirmar_union,
+    'procesar_solicitud': crear_procesar_solicitud,
+}
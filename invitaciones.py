@@ -0,0 +1,212 @@
+"""Códigos de invitación: asignación sin colisiones e índice código -> junta.
+
+Un código tiene la forma `SAVI-XXXX-XXXX`: 7 símbolos de datos en base 32
+de Crockford (sin I, L, O ni U, que se confunden al dictarlos) y un símbolo
+de control Luhn mod 32, que detecta cualquier símbolo mal escrito y casi
+todas las transposiciones de dos vecinos.
+
+Los datos (35 bits, unos 34 mil millones de códigos) son el número de
+secuencia de la invitación pasado por una permutación con clave (rondas de
+multiplicación impar y xorshift módulo 2^35, todas invertibles): dos
+secuencias distintas nunca dan el mismo código, y consecutivas no se parecen
+entre sí, así que no se pueden adivinar los códigos vecinos. Como la
+permutación se invierte, resolver un código es decodificarlo, recuperar su
+secuencia y leer el id de la junta en esa posición de un `bytearray` de 16
+bytes por código: O(1) y unos 16 MB por millón de códigos.
+
+Un código con el formato o el control equivocado se descarta antes de tocar
+el índice. La unicidad vale dentro de cada índice: el del servidor, que
+asigna los códigos de las juntas sincronizadas, o el de un teléfono sin
+servidor, cuya clave lleva el id del dispositivo (`clave_dispositivo`) para
+que dos teléfonos no repartan los mismos códigos. La clave de cada índice
+debe ser fija.
+"""
+import hashlib
+import os
+import re
+
+PREFIJO = 'SAVI'
+ALFABETO = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+BASE = len(ALFABETO)
+SIMBOLOS = 7
+BITS = SIMBOLOS * 5
+CAPACIDAD = 1 << BITS
+
+# Lectura tolerante como en Crockford: O -> 0, I/L -> 1
+_VALORES = {c: i for i, c in enumerate(ALFABETO)}
+_VALORES.update({'O': 0, 'I': 1, 'L': 1})
+
+PATRON_CODIGO = re.compile(r'SAVI-?([0-9A-Z]{4})-?([0-9A-Z]{4})(?![0-9A-Z])', re.IGNORECASE)
+
+CLAVE = os.environ.get('SAVI_CLAVE_CODIGOS', 'savi-invitaciones')
+
+_MASCARA = CAPACIDAD - 1
+# Desplazamientos de los xorshift de cada ronda
+_DESPLAZAMIENTOS = (17, 13, 16)
+
+TAMANO_ID = 16
+# Huecos admitidos al registrar un código lejos del final (juntas borradas)
+HUECO_MAXIMO = 1 << 16
+
+
+# Luhn: los símbolos en posición par desde la derecha se "duplican"
+_DOBLE = [(2 * v) // BASE + (2 * v) % BASE for v in range(BASE)]
+
+
+def digito_control(valores):
+    """Símbolo de control Luhn mod 32 para los valores dados."""
+    suma = 0
+    doble = True
+    for valor in reversed(valores):
+        suma += _DOBLE[valor] if doble else valor
+        doble = not doble
+    return -suma % BASE
+
+
+def codificar(valor):
+    """Código `SAVI-XXXX-XXXX` para un valor de datos en [0, CAPACIDAD)."""
+    valores = [(valor >> desplazamiento) & 31 for desplazamiento in range(BITS - 5, -1, -5)]
+    valores.append(digito_control(valores))
+    texto = ''.join([ALFABETO[v] for v in valores])
+    return f"{PREFIJO}-{texto[:4]}-{texto[4:]}"
+
+
+def decodificar(texto):
+    """Valor de datos de un código (en cualquier parte de `texto`), o None si no es válido."""
+    texto = texto or ''
+    if len(texto) == 14 and texto.startswith('SAVI-') and texto[9] == '-':
+        simbolos = texto[5:9] + texto[10:]  # ya en forma canónica: sin regex
+    else:
+        m = PATRON_CODIGO.search(texto)
+        if m is None:
+            return None
+        simbolos = m.group(1) + m.group(2)
+    valores = [_VALORES.get(caracter) for caracter in simbolos.upper()]
+    if None in valores or digito_control(valores[:-1]) != valores[-1]:
+        return None
+    resultado = 0
+    for valor in valores[:-1]:
+        resultado = (resultado << 5) | valor
+    return resultado
+
+
+def normalizar_codigo(texto):
+    """Forma canónica del código contenido en `texto` (p. ej. un enlace), o None."""
+    valor = decodificar(texto)
+    return codificar(valor) if valor is not None else None
+
+
+def _deshacer_xorshift(x, desplazamiento):
+    resultado = x
+    paso = desplazamiento
+    while paso < BITS:
+        resultado ^= x >> paso
+        paso += desplazamiento
+    return resultado
+
+
+class Permutacion:
+    """Biyección con clave de [0, CAPACIDAD) en sí mismo, y su inversa.
+
+    Cada ronda suma una subclave, multiplica por un impar (invertible módulo
+    2^35) y mezcla los bits altos en los bajos con un xorshift.
+    """
+
+    def __init__(self, clave=CLAVE):
+        semilla = hashlib.blake2b(clave.encode('utf-8'), digest_size=8 * len(_DESPLAZAMIENTOS)).digest()
+        self._rondas = []
+        for i, desplazamiento in enumerate(_DESPLAZAMIENTOS):
+            suma = int.from_bytes(semilla[8 * i:8 * i + 4], 'big') & _MASCARA
+            factor = (int.from_bytes(semilla[8 * i + 4:8 * i + 8], 'big') | 1) & _MASCARA
+            self._rondas.append((suma, factor, pow(factor, -1, CAPACIDAD), desplazamiento))
+
+    def aplicar(self, n):
+        x = n
+        for suma, factor, _, desplazamiento in self._rondas:
+            x = ((x + suma) * factor) & _MASCARA
+            x ^= x >> desplazamiento
+        return x
+
+    def invertir(self, x):
+        for suma, _, inverso, desplazamiento in reversed(self._rondas):
+            x = _deshacer_xorshift(x, desplazamiento)
+            x = (x * inverso - suma) & _MASCARA
+        return x
+
+
+def clave_dispositivo(id_dispositivo):
+    """Clave del índice local de un dispositivo: su propio espacio de códigos."""
+    return f'{CLAVE}:{id_dispositivo}'
+
+
+class IndiceCodigos:
+    """Asigna códigos en secuencia y resuelve código -> id de junta en O(1).
+
+    Los ids de junta son los de `database.nuevo_id` (uuid hexadecimal) y se
+    guardan como 16 bytes en la posición de su secuencia.
+    """
+
+    def __init__(self, clave=CLAVE):
+        self._permutacion = Permutacion(clave)
+        self._ids = bytearray()
+
+    def __len__(self):
+        return len(self._ids) // TAMANO_ID
+
+    def _secuencia(self, codigo):
+        valor = decodificar(codigo)
+        return self._permutacion.invertir(valor) if valor is not None else None
+
+    def asignar(self, junta_id):
+        """Reserva el siguiente código para la junta y lo devuelve."""
+        n = len(self)
+        if n >= CAPACIDAD:
+            raise OverflowError('No quedan códigos de invitación')
+        self._ids += bytes.fromhex(junta_id)
+        return codificar(self._permutacion.aplicar(n))
+
+    def registrar(self, codigo, junta_id):
+        """Vuelve a cargar un código ya asignado. Devuelve False si no es de este índice."""
+        n = self._secuencia(codigo)
+        if n is None or n > len(self) + HUECO_MAXIMO:
+            return False
+        fin = (n + 1) * TAMANO_ID
+        if len(self._ids) < fin:
+            self._ids.extend(bytes(fin - len(self._ids)))
+        self._ids[n * TAMANO_ID:fin] = bytes.fromhex(junta_id)
+        return True
+
+    def cargar(self, pares):
+        """Registra pares (codigo, junta_id) leídos de la base (una sola reserva de memoria)."""
+        secuencias = []
+        for codigo, junta_id in pares:
+            n = self._secuencia(codigo)
+            if n is not None:
+                secuencias.append((n, junta_id))
+        if not secuencias:
+            return
+        # Los códigos de este índice son consecutivos salvo juntas borradas:
+        # una secuencia desproporcionada viene de otra clave y se descarta.
+        limite = len(self) + len(secuencias) + HUECO_MAXIMO
+        maximo = max((n for n, _ in secuencias if n < limite), default=-1)
+        if (maximo + 1) * TAMANO_ID > len(self._ids):
+            self._ids.extend(bytes((maximo + 1) * TAMANO_ID - len(self._ids)))
+        ids = self._ids
+        for n, junta_id in secuencias:
+            if n <= maximo:
+                ids[n * TAMANO_ID:(n + 1) * TAMANO_ID] = bytes.fromhex(junta_id)
+
+    def buscar(self, codigo):
+        """Id de la junta del código, o None (código inválido, ajeno o liberado)."""
+        n = self._secuencia(codigo)
+        if n is None or n >= len(self):
+            return None
+        datos = self._ids[n * TAMANO_ID:(n + 1) * TAMANO_ID]
+        if not any(datos):
+            return None
+        return datos.hex()
+
+    def liberar(self, codigo):
+        n = self._secuencia(codigo)
+        if n is not None and n < len(self):
+            self._ids[n * TAMANO_ID:(n + 1) * TAMANO_ID] = bytes(TAMANO_ID)
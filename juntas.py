@@ -0,0 +1,156 @@
+"""Índice en memoria de las juntas del usuario para la lista "Mis juntas".
+
+Mantiene, de forma incremental, un índice de prefijos sobre las palabras del
+nombre y el monto de cada junta y una lista ordenada por cada criterio de
+orden. Filtrar mientras se escribe y reordenar no recorren ni reordenan la
+colección completa salvo cuando el resultado abarca casi todas las juntas, y
+una junta nueva se ubica en la lista ya mostrada con una búsqueda binaria
+(`posicion`).
+"""
+import re
+import unicodedata
+from bisect import bisect_left, insort
+
+# Orden de los periodos de menor a mayor frecuencia de pago.
+RANGO_PERIODO = {'Semanal': 0, 'Quincenal': 1, 'Mensual': 2}
+
+CRITERIOS = ('creada', 'monto', 'periodo', 'nombre')
+
+_PALABRAS = re.compile(r"[0-9a-z]+")
+_NUMERO = re.compile(r"\d+(?:[.,]\d+)?")
+
+
+def normalizar(texto):
+    """Minúsculas y sin tildes: 'Viaje a Cañete' -> 'viaje a canete'."""
+    if not texto or texto.isascii():
+        return (texto or '').lower()
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+
+
+def monto_numerico(monto):
+    """Extrae el valor de un monto mostrado como 'S/ 1,200.50' (0.0 si no hay)."""
+    m = _NUMERO.search((monto or '').replace(',', ''))
+    return float(m.group(0)) if m else 0.0
+
+
+class IndiceJuntas:
+    """Índice de búsqueda y orden sobre juntas (dicts con id, nombre, monto...)."""
+
+    def __init__(self):
+        self._claves = {}      # id -> {criterio: clave}
+        self._tokens = {}      # id -> tokens indexados
+        self._prefijos = []    # [(token, id)] ordenado
+        self._ordenes = {c: [] for c in CRITERIOS}  # criterio -> [(clave, id)] ordenado
+
+    def __len__(self):
+        return len(self._claves)
+
+    def __contains__(self, junta_id):
+        return junta_id in self._claves
+
+    @staticmethod
+    def _indexar(junta):
+        """Claves de orden y tokens de búsqueda de una junta."""
+        nombre = normalizar(junta.get('nombre'))
+        monto = junta.get('monto') or ''
+        claves = {
+            'creada': junta.get('creada') or 0.0,
+            'monto': monto_numerico(monto),
+            'periodo': RANGO_PERIODO.get(junta.get('periodo'), len(RANGO_PERIODO)),
+            'nombre': nombre,
+        }
+        tokens = set(_PALABRAS.findall(nombre))
+        tokens.update(m.replace(',', '') for m in _NUMERO.findall(monto.replace(',', '')))
+        return claves, tokens
+
+    def agregar(self, junta):
+        junta_id = junta['id']
+        if junta_id in self._claves:
+            self.quitar(junta_id)
+        claves, tokens = self._indexar(junta)
+        self._claves[junta_id] = claves
+        for criterio, clave in claves.items():
+            insort(self._ordenes[criterio], (clave, junta_id))
+        self._tokens[junta_id] = tokens
+        for token in tokens:
+            insort(self._prefijos, (token, junta_id))
+
+    def cargar(self, juntas):
+        """Construye el índice de golpe (un solo ordenamiento por lista)."""
+        for junta in juntas:
+            junta_id = junta['id']
+            claves, tokens = self._indexar(junta)
+            self._claves[junta_id] = claves
+            for criterio, clave in claves.items():
+                self._ordenes[criterio].append((clave, junta_id))
+            self._tokens[junta_id] = tokens
+            self._prefijos.extend((token, junta_id) for token in tokens)
+        self._prefijos.sort()
+        for orden in self._ordenes.values():
+            orden.sort()
+
+    def quitar(self, junta_id):
+        claves = self._claves.pop(junta_id, None)
+        if claves is None:
+            return
+        for criterio, clave in claves.items():
+            orden = self._ordenes[criterio]
+            del orden[bisect_left(orden, (clave, junta_id))]
+        for token in self._tokens.pop(junta_id):
+            del self._prefijos[bisect_left(self._prefijos, (token, junta_id))]
+
+    def coincide(self, junta_id, texto=''):
+        """True si la junta pasa el filtro `texto` de `buscar`."""
+        tokens = self._tokens.get(junta_id, ())
+        return all(any(token.startswith(palabra) for token in tokens)
+                   for palabra in _PALABRAS.findall(normalizar(texto)))
+
+    def posicion(self, ids, junta_id, orden='creada', descendente=False):
+        """Índice donde insertar `junta_id` en `ids`, ya ordenada como la devuelve `buscar`."""
+        claves = self._claves
+        objetivo = (claves[junta_id][orden], junta_id)
+        inicio, fin = 0, len(ids)
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            actual = (claves[ids[medio]][orden], ids[medio])
+            if (actual > objetivo) if descendente else (actual < objetivo):
+                inicio = medio + 1
+            else:
+                fin = medio
+        return inicio
+
+    def _con_prefijo(self, prefijo):
+        prefijos = self._prefijos
+        i = bisect_left(prefijos, (prefijo,))
+        encontrados = set()
+        while i < len(prefijos) and prefijos[i][0].startswith(prefijo):
+            encontrados.add(prefijos[i][1])
+            i += 1
+        return encontrados
+
+    def buscar(self, texto='', orden='creada', descendente=False):
+        """Ids de las juntas que coinciden con `texto`, en el orden pedido.
+
+        Cada palabra de `texto` debe ser prefijo de alguna palabra del nombre
+        o del monto de la junta.
+        """
+        orden_lista = self._ordenes[orden]
+        palabras = _PALABRAS.findall(normalizar(texto))
+        if not palabras:
+            ids = [junta_id for _, junta_id in orden_lista]
+            return ids[::-1] if descendente else ids
+
+        coincidencias = None
+        for palabra in sorted(palabras, key=len, reverse=True):
+            encontrados = self._con_prefijo(palabra)
+            coincidencias = encontrados if coincidencias is None else coincidencias & encontrados
+            if not coincidencias:
+                return []
+
+        # Pocos resultados: ordenarlos directamente; muchos: filtrar la lista ya ordenada
+        if len(coincidencias) * 8 < len(orden_lista):
+            claves = self._claves
+            return sorted(coincidencias, key=lambda j: (claves[j][orden], j), reverse=descendente)
+        ids = [junta_id for _, junta_id in orden_lista if junta_id in coincidencias]
+        return ids[::-1] if descendente else ids
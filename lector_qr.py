@@ -0,0 +1,136 @@
+"""Lectura de códigos QR desde imágenes subidas por el usuario.
+
+Antes de decodificar, la imagen se reduce y se pasa a escala de grises: en
+JPEG se usa `Image.draft` para que el propio decodificador entregue la foto
+ya reducida (1/2, 1/4 u 1/8), así que una foto de 12 megapíxeles nunca se
+descomprime entera. Los demás formatos (PNG de una captura de pantalla) no
+se pueden reducir al descomprimir: se descomprimen una sola vez, y antes se
+mira el tamaño de la cabecera para rechazar los que pasan de `MAX_PIXELES`.
+Se prueba primero a baja resolución y solo se sube si no se encontró el
+código y queda presupuesto de tiempo.
+
+El decodificador de QR es OpenCV (`opencv-python-headless`, en
+requirements.txt) o, si no está, `pyzbar`. Sin ninguno de los dos `leer_qr`
+lanza `SinDecodificador`, para que la interfaz no lo confunda con una
+imagen sin código.
+"""
+import time
+
+# Lado mayor (px) de cada intento, de menor a mayor costo.
+LADOS = (800, 1200, 1600)
+
+# Tiempo máximo (s) que se dedica a una imagen antes de rendirse.
+PRESUPUESTO = 1.5
+
+# Píxeles que se aceptan descomprimir enteros (formatos sin reducción al
+# descomprimir): unas 5 veces una captura de pantalla de un teléfono.
+MAX_PIXELES = 12_000_000
+
+_decodificador = None
+
+
+class SinDecodificador(RuntimeError):
+    """No hay OpenCV ni pyzbar instalados."""
+
+
+class ImagenDemasiadoGrande(ValueError):
+    """La imagen no se puede reducir al descomprimirla y pasa de `MAX_PIXELES`."""
+
+
+def abrir_gris(ruta, lado_maximo):
+    """Abre `ruta` en escala de grises. Devuelve `(imagen, reducida)`.
+
+    En JPEG la imagen ya sale reducida cerca de `lado_maximo` y `reducida` es
+    True; en otros formatos sale entera (si no pasa de `MAX_PIXELES`, que se
+    comprueba con la cabecera, antes de descomprimir).
+    """
+    from PIL import Image, ImageOps
+
+    imagen = Image.open(ruta)
+    # En JPEG decodifica directamente a tamaño reducido y en luminancia
+    reducida = imagen.draft('L', (lado_maximo, lado_maximo)) is not None
+    if not reducida and imagen.width * imagen.height > MAX_PIXELES:
+        raise ImagenDemasiadoGrande(imagen.size)
+    imagen = ImageOps.exif_transpose(imagen)
+    if imagen.mode != 'L':
+        imagen = imagen.convert('L')
+    return imagen, reducida
+
+
+def reducir(imagen, lado_maximo):
+    """Copia de `imagen` con su lado mayor <= `lado_maximo` (la misma si ya lo cumple)."""
+    if max(imagen.size) <= lado_maximo:
+        return imagen
+    copia = imagen.copy()
+    copia.thumbnail((lado_maximo, lado_maximo))
+    return copia
+
+
+def preparar_imagen(ruta, lado_maximo):
+    """Abre `ruta` en escala de grises con su lado mayor <= `lado_maximo`."""
+    return reducir(abrir_gris(ruta, lado_maximo)[0], lado_maximo)
+
+
+def _cargar_decodificador():
+    """Devuelve una función imagen_L -> texto|None según la librería disponible."""
+    try:
+        import cv2
+        import numpy as np
+
+        detector = cv2.QRCodeDetector()
+
+        def con_opencv(imagen):
+            texto, _, _ = detector.detectAndDecode(np.asarray(imagen))
+            return texto or None
+
+        return con_opencv
+    except ImportError:
+        pass
+
+    try:
+        from pyzbar import pyzbar
+
+        def con_pyzbar(imagen):
+            for simbolo in pyzbar.decode(imagen, symbols=[pyzbar.ZBarSymbol.QRCODE]):
+                return simbolo.data.decode('utf-8', 'replace')
+            return None
+
+        return con_pyzbar
+    except ImportError:
+        return None
+
+
+def decodificador_disponible():
+    global _decodificador
+    if _decodificador is None:
+        _decodificador = _cargar_decodificador() or False
+    return _decodificador or None
+
+
+def leer_qr(ruta, lados=LADOS, presupuesto=PRESUPUESTO):
+    """Texto del primer QR encontrado en la imagen `ruta`, o None.
+
+    Lanza `SinDecodificador` si no hay con qué leer QR e
+    `ImagenDemasiadoGrande` si la imagen no se puede abrir reducida.
+    """
+    decodificar = decodificador_disponible()
+    if decodificar is None:
+        raise SinDecodificador()
+
+    inicio = time.perf_counter()
+    entera = None  # imagen de un formato sin reducción, descomprimida una sola vez
+    for lado in lados:
+        if entera is None:
+            gris, reducida = abrir_gris(ruta, lado)
+            if not reducida:
+                entera = gris
+        else:
+            gris = entera
+        imagen = reducir(gris, lado)
+        texto = decodificar(imagen)
+        if texto:
+            return texto
+        # Imagen más pequeña que el intento: ya se probó a resolución completa
+        if max(imagen.size) < lado or time.perf_counter() - inicio > presupuesto:
+            break
+    return None
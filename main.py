@@ -1,15 +1,17 @@
+import contextlib
 import os
-import qrcode
-from io import BytesIO
-from kivy.core.image import Image as CoreImage
+import re
+import threading
+import time
 from kivy.config import Config
 from kivy.uix.modalview import ModalView
 from kivy.metrics import dp
 from kivy.factory import Factory
-from kivy.properties import StringProperty, NumericProperty, ListProperty
-from kivy.clock import Clock
+from kivy.properties import StringProperty, NumericProperty, ObjectProperty, BooleanProperty, ListProperty
+from kivy.clock import Clock, mainthread
 from kivy.utils import platform
-import re
+from bisect import bisect_left
+from functools import partial
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -31,12 +33,60 @@ from kivymd.uix.screen import MDScreen
 from kivymd.uix.card import MDCard
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.toast import toast
-from kivymd.uix.menu import MDDropdownMenu
 from kivymd.uix.label import MDLabel
 
+from database import BaseDatos, nuevo_id
+from dialogos import PoolDialogos
+from invitaciones import IndiceCodigos, clave_dispositivo, normalizar_codigo
+from cupos import SIN_ESTADO_PAGO, CambiosCupos, Cupo, IndiceCupos, TablaCupos, vista_cupo
+from juntas import IndiceJuntas, monto_numerico, normalizar
+from qr import texturas_qr
+from lector_qr import ImagenDemasiadoGrande, SinDecodificador, leer_qr
+from pagos import LibroPagos, periodos_vencidos
+import planillas
+import recursos
+import rendimiento
+from rendimiento import medir
+from reportes import RegistroReportes, describir
+from solicitudes import SolicitudesPorJunta
+
+# Límite de cupos por junta. La lista de integrantes es un RecycleView, así
+# que el número de tarjetas creadas no depende de este valor.
+MAX_CUPOS = 5000
+
+URL_UNIRSE = "https://savi.app/unirse"
+
+# Servidor de sincronización (vacío = solo local). Ver sincronizacion.py.
+SERVIDOR_SYNC = os.environ.get('SAVI_SERVIDOR', '')
+
+# Pausa tras la última tecla antes de filtrar integrantes o juntas (segundos)
+ESPERA_BUSQUEDA = 0.15
+
+# Cada cuánto se avisa el avance de una importación o exportación (segundos)
+INTERVALO_PROGRESO = 2.0
+
+
+def avisador_progreso(mensaje):
+    """Función para un hilo de trabajo que muestra `mensaje.format(n)` como mucho cada `INTERVALO_PROGRESO`."""
+    ultimo = [time.monotonic()]
+
+    def avisar(cantidad):
+        ahora = time.monotonic()
+        if ahora - ultimo[0] >= INTERVALO_PROGRESO:
+            ultimo[0] = ahora
+            Clock.schedule_once(lambda dt: toast(mensaje.format(cantidad)))
+    return avisar
+
+
+def entregar_por_frame(cupos):
+    """Hace que la `TablaCupos` entregue sus cambios a los observadores una vez por frame."""
+    if cupos.programar is None:
+        cupos.programar = Clock.create_trigger(lambda dt: cupos.entregar())
+
 # --- CLASES PERSONALIZADAS ---
 
 class TarjetaListaJunta(MDCard):
+    junta_id = StringProperty("")
     nombre = StringProperty("")
     monto = StringProperty("")
 
@@ -45,6 +95,18 @@ class TarjetaUnirse(MDCard):
     monto = StringProperty("")
     organizador = StringProperty("")
 
+class FilaSolicitud(MDBoxLayout):
+    solicitud_id = StringProperty("")
+    texto = StringProperty("")
+    orden = NumericProperty(0)  # posición en la cola, para `quitar_fila_solicitud`
+
+class FilaCronograma(MDBoxLayout):
+    turno = StringProperty("")
+    fecha = StringProperty("")
+    receptor = StringProperty("")
+    pozo = StringProperty("")
+    fila = NumericProperty(0)
+
 class MenuCompartir(ModalView):
     url_invitacion = StringProperty("")
     
@@ -66,6 +128,9 @@ class TarjetaIntegrante(MDCard):
     telefono = StringProperty("")
     correo = StringProperty("")
     posicion_numero = StringProperty("left")
+    # Estado de pago ("Al día", "Debe 50.00" o vacío)
+    estado_pago = StringProperty("")
+    atrasado = BooleanProperty(False)
     
     # Índice exacto en la lista de cupos
     indice = NumericProperty(0)
@@ -77,51 +142,113 @@ class TarjetaIntegrante(MDCard):
         pantalla.mostrar_dialogo_edicion(self.indice)
 
 
+# Anchos de texto ya medidos: (texto, fuente, negrita, tamaño) -> px
+_ANCHOS_TEXTO = {}
+_MAX_ANCHOS_TEXTO = 2048
+
+
+def medir_ancho(texto, fuente, tamano, negrita=False):
+    """Ancho en px de `texto` con esa fuente y tamaño, sin rasterizarlo.
+
+    `CoreLabel.get_extents` solo consulta las métricas de la fuente; el
+    resultado se memoiza porque los mismos montos se miden una y otra vez.
+    """
+    clave = (texto, fuente, negrita, tamano)
+    ancho = _ANCHOS_TEXTO.get(clave)
+    if ancho is None:
+        from kivy.core.text import Label as CoreLabel
+        ancho = CoreLabel(font_name=fuente, font_size=tamano, bold=negrita).get_extents(texto)[0]
+        if len(_ANCHOS_TEXTO) >= _MAX_ANCHOS_TEXTO:
+            _ANCHOS_TEXTO.clear()
+        _ANCHOS_TEXTO[clave] = ancho
+    return ancho
+
+
 class FitLabel(MDLabel):
     """Etiqueta que ajusta su `font_size` para que el texto quepa en el ancho.
 
-    Ajusta el tamaño de letra decreciendo desde `max_font_size` hasta
-    `min_font_size` en pasos definidos.
+    Busca por bisección el mayor tamaño entre `min_font_size` y
+    `max_font_size` (en múltiplos de `step`) cuyo texto cabe, midiendo con
+    `medir_ancho`. Los cambios de tamaño y de texto de un mismo frame se
+    agrupan en un solo ajuste.
     """
     max_font_size = NumericProperty(72)
     min_font_size = NumericProperty(24)
     step = NumericProperty(1)
 
     def __init__(self, **kwargs):
+        self._trigger_ajuste = Clock.create_trigger(self._adjust)
         super().__init__(**kwargs)
-        Clock.schedule_once(lambda dt: self._adjust())
+        self._trigger_ajuste()
 
     def on_size(self, *args):
-        Clock.schedule_once(lambda dt: self._adjust(), 0)
+        self._trigger_ajuste()
 
     def on_text(self, *args):
-        Clock.schedule_once(lambda dt: self._adjust(), 0)
+        self._trigger_ajuste()
 
+    @medir('fitlabel.ajustar')
     def _adjust(self, *l):
         try:
-            fs = self.max_font_size
-            self.font_size = fs
-            padding = dp(20)
-            # actualizar textura y reducir hasta que quepa
-            self.texture_update()
             # Si ancho no está disponible aún, salir
             if not self.width or self.width <= 0:
                 return
-            while fs > self.min_font_size:
-                self.texture_update()
-                if self.texture_size[0] <= (self.width - padding) or self.texture_size[0] == 0:
-                    break
-                fs -= self.step
+            disponible = self.width - dp(20)
+            paso = self.step or 1
+            minimo, maximo = self.min_font_size, self.max_font_size
+            pasos = max(0, int((maximo - minimo) // paso))
+
+            def cabe(n):
+                return medir_ancho(self.text, self.font_name, minimo + n * paso, self.bold) <= disponible
+
+            # Mayor número de pasos sobre el mínimo que todavía cabe
+            bajo, alto = 0, pasos
+            if cabe(alto):
+                bajo = alto
+            while bajo < alto:
+                medio = (bajo + alto + 1) // 2
+                if cabe(medio):
+                    bajo = medio
+                else:
+                    alto = medio - 1
+            fs = minimo + bajo * paso
+            if self.font_size != fs:
                 self.font_size = fs
         except Exception:
             pass
 
 # --- PANTALLAS ---
 
-class WelcomeScreen(MDScreen): pass
+class WelcomeScreen(MDScreen):
+    """Carrusel de bienvenida.
+
+    Las páginas usan la variante por densidad de `recursos.imagen` y se piden
+    al Loader de Kivy (FitImage usa AsyncImage), que las decodifica en un
+    hilo: la primera al crear la pantalla, la siguiente en el frame posterior
+    y cada una de las demás cuando el usuario llega a la anterior.
+    """
+    PAGINAS = ('1.png', '2.png', '3.png')
+    color_relleno = ListProperty([1, 0.95, 0.9, 1])
+
+    def on_kv_post(self, base_widget):
+        from kivy.loader import Loader
+
+        # Mientras carga, el Loader muestra un relleno del color de fondo
+        Loader.loading_image = recursos.textura_relleno(self.color_relleno)
+        self.cargar_pagina(0)
+        Clock.schedule_once(lambda dt: self.cargar_pagina(1))
+
+    def cargar_pagina(self, indice):
+        if not 0 <= indice < len(self.PAGINAS):
+            return
+        pagina = self.ids.get(f'pagina_{indice + 1}')
+        if pagina is not None and not pagina.source:
+            pagina.source = recursos.imagen(self.PAGINAS[indice])
 class LoginScreen(MDScreen): pass
 class RegisterScreen(MDScreen): pass
-class HomeScreen(MDScreen): pass
+class HomeScreen(MDScreen):
+    def al_registrar(self):
+        MDApp.get_running_app().mostrar_juntas_guardadas()
 
 class ReportarScreen(MDScreen):
     """Pantalla para reportar incumplimientos."""
@@ -130,6 +257,13 @@ class ReportarScreen(MDScreen):
             toast("Por favor completa todos los campos")
             return
         
+        app = MDApp.get_running_app()
+        dni = dni.strip()
+        creado = time.time()
+        junta_id = app.junta_actual
+        # Si los reportes aún se están cargando, se guarda al terminar la carga
+        app.reportes.agregar(dni, creado, lambda historial: app.db.agregar_reporte(
+            dni, reclamo, junta_id, creado, historial))
         toast(f"Reporte enviado para DNI: {dni}")
         self.ids.input_dni.text = ""
         self.ids.input_reclamo.text = ""
@@ -141,9 +275,22 @@ class DetallesJuntaScreen(MDScreen):
     monto_junta = StringProperty("S/ 0.00")
 
     def ir_a_invitar(self):
+        app = MDApp.get_running_app()
+        junta = app.junta_en_curso()
+        if junta is None:
+            toast('Abre una junta para invitar')
+            return
         invitar_screen = self.manager.get_screen('invitar')
-        codigo = str(hash(self.nombre_junta) % 10000)
-        invitar_screen.codigo_junta = f"SAVI-{codigo}"
+        # Con servidor el código llega después: mientras tanto, el spinner del QR
+        invitar_screen.codigo_junta = "Generando código..."
+        invitar_screen.url_invitacion = ''
+
+        def mostrar(codigo):
+            if app.junta_actual == junta['id']:
+                invitar_screen.codigo_junta = codigo
+                invitar_screen.url_invitacion = f"{URL_UNIRSE}?codigo={codigo}"
+
+        app.codigo_invitacion(junta, mostrar)
         self.manager.current = 'invitar'
 
     def ir_a_info(self):
@@ -160,24 +307,61 @@ class DetallesJuntaScreen(MDScreen):
         self.manager.current = 'reportar'
 
 class InvitarScreen(MDScreen):
-    codigo_junta = StringProperty("SAVI-0000")
-    url_invitacion = StringProperty("https://savi.app/unirse")
+    codigo_junta = StringProperty("")
+    url_invitacion = StringProperty(URL_UNIRSE)
+    # False mientras el QR se genera en segundo plano (se muestra un spinner)
+    qr_listo = BooleanProperty(False)
+    # Texto en lugar del QR si no se pudo generar
+    error_qr = StringProperty("")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._trabajo_qr = None
 
     def on_enter(self):
         self.generar_qr(self.url_invitacion)
 
+    def on_leave(self):
+        self._cancelar_qr()
+
+    def on_url_invitacion(self, instance, value):
+        # Un QR en curso para la URL anterior ya no sirve
+        self._cancelar_qr()
+        if self.manager and self.manager.current == self.name:
+            self.generar_qr(value)
+
+    def _cancelar_qr(self):
+        if self._trabajo_qr is not None:
+            self._trabajo_qr.cancelar()
+            self._trabajo_qr = None
+
     def generar_qr(self, contenido):
-        qr = qrcode.QRCode(version=1, box_size=10, border=2)
-        qr.add_data(contenido)
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white")
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        texture = CoreImage(buffer, ext='png').texture
-        self.ids.img_qr.texture = texture
+        # Reentrar con la misma URL reutiliza la textura de la caché
+        self._cancelar_qr()
+        self.qr_listo = False
+        self.error_qr = ""
+        if not contenido:
+            return
+        self._inicio_qr = time.perf_counter()
+        self._trabajo_qr = texturas_qr.obtener_async(contenido, self._mostrar_qr, al_fallar=self._fallo_qr)
+
+    def _mostrar_qr(self, textura):
+        if rendimiento.ACTIVO:
+            # Desde el pedido hasta que la textura está lista (incluye el hilo de fondo)
+            inicio = getattr(self, '_inicio_qr', time.perf_counter())
+            rendimiento.registrar('tramo', 'invitar.generar_qr', inicio, (time.perf_counter() - inicio) * 1000)
+        self._trabajo_qr = None
+        self.ids.img_qr.texture = textura
+        self.qr_listo = True
+
+    def _fallo_qr(self, error):
+        self._trabajo_qr = None
+        self.error_qr = "No se pudo generar el QR.\nComparte el código o el enlace."
 
     def abrir_menu_compartir(self):
+        if not self.url_invitacion:
+            toast("El código de invitación aún se está generando")
+            return
         menu = MenuCompartir()
         menu.url_invitacion = self.url_invitacion
         menu.open()
@@ -193,66 +377,37 @@ class InfoJuntaScreen(MDScreen):
     fecha_inicio = StringProperty("01/03/2026")
     fecha_final = StringProperty("01/01/2027")
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.dialog_integrantes = None
-
-    def on_pre_enter(self):
-        """Sincronizar el número visual con la lista real al entrar."""
-        app = MDApp.get_running_app()
-        # Usamos self.manager directamente en lugar de app.get_manager() por seguridad
-        if self.manager:
-            try:
-                pagos = self.manager.get_screen('integrantes_pagos')
-                if pagos and hasattr(pagos, 'lista_cupos'):
-                    self.num_personas = str(len(pagos.lista_cupos))
-            except Exception as e:
-                print(f"Error sincronizando integrantes: {e}")
+    def on_enter(self):
+        MDApp.get_running_app().dialogos.precalentar('cantidad_cupos')
 
+    @medir('dialogo.integrantes')
     def abrir_dialogo_editar_integrantes(self):
-        from kivymd.uix.dialog import MDDialog
-        from kivymd.uix.button import MDFlatButton
-        from kivymd.uix.textfield import MDTextField
         from kivymd.toast import toast # Asegúrate de importar toast
-        
-        if self.dialog_integrantes:
-            self.dialog_integrantes.dismiss()
-        
+
         app = MDApp.get_running_app()
         pagos = self.manager.get_screen('integrantes_pagos')
         cantidad_actual = len(pagos.lista_cupos) if pagos.lista_cupos else 1
 
-        self.text_field_integrantes = MDTextField(
-            hint_text="Cantidad de cupos (máx. 10)",
-            text=str(cantidad_actual),
-            input_filter="int",
-            max_text_length=2
-        )
-        
-        def set_integrantes(obj):
-            valor = self.text_field_integrantes.text.strip()
+        dialogo = app.dialogos.obtener('cantidad_cupos')
+        campo = dialogo.campos['cantidad']
+        campo.hint_text = f"Cantidad de cupos (máx. {MAX_CUPOS})"
+        campo.max_text_length = len(str(MAX_CUPOS))
+
+        def set_integrantes():
+            valor = campo.text.strip()
             if valor.isdigit():
                 n = int(valor)
-                if 1 <= n <= 10:
+                if 1 <= n <= MAX_CUPOS:
                     self.num_personas = str(n)
-                    self.dialog_integrantes.dismiss()
+                    dialogo.cerrar()
                     pagos.redimensionar_cupos(n)
                     toast(f"Junta actualizada a {n} integrantes")
                 else:
-                    toast("Mínimo 1, Máximo 10")
+                    toast(f"Mínimo 1, Máximo {MAX_CUPOS}")
             else:
                 toast("Número inválido")
 
-        self.dialog_integrantes = MDDialog(
-            title="Editar Integrantes",
-            type="custom",
-            content_cls=self.text_field_integrantes,
-            buttons=[
-                MDFlatButton(text="CANCELAR", on_release=lambda x: self.dialog_integrantes.dismiss()),
-                MDFlatButton(text="GUARDAR", on_release=set_integrantes)
-            ]
-        )
-        self.dialog_integrantes.open()
+        dialogo.abrir(valores={'cantidad': str(cantidad_actual)}, acciones={'guardar': set_integrantes})
 
     def abrir_calendario(self, tipo):
         """Abre un selector de fechas para actualizar fecha_inicio o fecha_final."""
@@ -260,16 +415,58 @@ class InfoJuntaScreen(MDScreen):
 
         def on_date_selected(instance, value, date_range):
             fecha_str = value.strftime('%d/%m/%Y')
+            app = MDApp.get_running_app()
             if tipo == 'inicio':
                 self.fecha_inicio = fecha_str
+                app.actualizar_junta(fecha_inicio=fecha_str)
             else:
                 self.fecha_final = fecha_str
+                app.actualizar_junta(fecha_final=fecha_str)
 
         # Importante: MDDatePicker a veces requiere parámetros según la versión de KivyMD
         date_picker = MDDatePicker()
         date_picker.bind(on_save=on_date_selected)
         date_picker.open()
 
+class CronogramaScreen(MDScreen):
+    resumen = StringProperty("")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._junta = None
+
+    def on_pre_enter(self):
+        """Vuelca el cronograma en caché; si solo cambiaron algunas filas, parchea esas."""
+        app = MDApp.get_running_app()
+        rv = self.ids.get('lista_cronograma')
+        if rv is None:
+            return
+        try:
+            cronograma, filas = app.cronograma_actual()
+        except Exception as e:
+            print(f"Error calculando el cronograma: {e}")
+            return
+        if cronograma is None:
+            rv.data = []
+            self.resumen = ""
+            return
+
+        cupos = app.junta_en_curso()['cupos']
+        if filas is None or self._junta != app.junta_actual or len(rv.data) != len(cronograma):
+            rv.data = cronograma.filas(cupos)
+        elif filas:
+            adaptador = rv.view_adapter
+            for nueva in cronograma.filas(cupos, filas):
+                k = nueva['fila']
+                rv.data[k].update(nueva)
+                vista = adaptador.get_visible_view(k) if adaptador is not None else None
+                if vista is not None:
+                    for clave, valor in nueva.items():
+                        setattr(vista, clave, valor)
+        self._junta = app.junta_actual
+        self.resumen = (f"{len(cronograma)} periodos · {cronograma.periodo} · "
+                        f"cuota {cronograma.cuota:,.2f} · pozo {cronograma.pozo:,.2f}")
+
 class SorteoScreen(MDScreen):
     pass
 
@@ -289,122 +486,395 @@ class SorteoScreen(MDScreen):
 
 class IntegrantesPagosScreen(MDScreen):
     nombre_junta = StringProperty("")
-    lista_cupos = ListProperty([])
+    # TablaCupos de la junta abierta (índices por número, cupos vacíos y números libres)
+    lista_cupos = ObjectProperty(None, rebind=False)
 
     def __init__(self, **kwargs):
+        # Búsqueda de integrantes: índice de prefijos (se arma al buscar) y filtro aplicado
+        self._indice = None
+        self._filtro = ''
+        self._texto_busqueda = ''
+        # (junta, cuota, periodos vencidos) con que se pintó el estado de pago
+        self._clave_pagos = None
+        # TablaCupos cuyos cambios se están observando
+        self._observada = None
         super().__init__(**kwargs)
+        self.lista_cupos = TablaCupos()
+        # Índices modificados pendientes de pintar; se aplican una vez por frame
+        self._cambios = CambiosCupos()
+        self._trigger_cambios = Clock.create_trigger(self._aplicar_cambios)
+        self._trigger_filtro = Clock.create_trigger(self._aplicar_filtro, ESPERA_BUSQUEDA)
         # Inicializamos los datos lo antes posible para evitar crashes
         Clock.schedule_once(self.inicializar_datos_default)
 
     def inicializar_datos_default(self, dt):
         """Crea el cupo de administrador si la lista está vacía."""
         if not self.lista_cupos:
-            self.redimensionar_cupos(1)
-            self.lista_cupos[0] = {
-                'ocupado': True,
-                'nombre': 'Tú (Organizador)',
-                'usuario': 'Administrador',
-                'dni': '', 'telefono': '', 'correo': '',
-                'numero': '1'
-            }
+            with self.lista_cupos.lote():
+                self.redimensionar_cupos(1)
+                self.lista_cupos.actualizar(
+                    0,
+                    ocupado=True,
+                    nombre='Tú (Organizador)',
+                    usuario='Administrador',
+                    dni='', telefono='', correo='',
+                    numero=1
+                )
 
     def redimensionar_cupos(self, nueva_cantidad):
-        """Ajusta el tamaño de la lista conservando los datos existentes."""
-        actual = len(self.lista_cupos)
-        
-        if nueva_cantidad > actual:
-            for _ in range(nueva_cantidad - actual):
-                self.lista_cupos.append({
-                    'ocupado': False,
-                    'nombre': 'Cupo Disponible',
-                    'usuario': 'Toque para editar',
-                    'dni': '', 'telefono': '', 'correo': '',
-                    'numero': ''
-                })
-        elif nueva_cantidad < actual:
-            self.lista_cupos = self.lista_cupos[:nueva_cantidad]
-        self.renderizar_lista()
+        """Ajusta el tamaño de la lista conservando los datos existentes.
+
+        La lista se guarda y se vuelve a pintar en la próxima entrega de cambios.
+        """
+        self.lista_cupos.redimensionar(nueva_cantidad)
 
     def ocupar_siguiente_cupo_vacio(self, datos_usuario):
         """Busca el primer cupo 'ocupado': False y lo llena."""
         
-        # Auto-expandir si está lleno
-        todos_llenos = all(c['ocupado'] for c in self.lista_cupos)
-        if todos_llenos and len(self.lista_cupos) < 10:
-            self.redimensionar_cupos(len(self.lista_cupos) + 1)
-            toast("Capacidad aumentada automáticamente")
-
-        for i, cupo in enumerate(self.lista_cupos):
-            if not cupo['ocupado']:
-                nuevo_cupo = cupo.copy()
-                nuevo_cupo.update(datos_usuario)
-                nuevo_cupo['ocupado'] = True
-                nuevo_cupo['usuario'] = 'Miembro Verificado'
-                # Asignar número disponible (1 reservado para organizador)
-                try:
-                    usados = {int(c.get('numero')) for c in self.lista_cupos if c.get('numero')}
-                except Exception:
-                    usados = set()
-                max_num = len(self.lista_cupos)
-                asignado = None
-                for n in range(2, max_num + 1):
-                    if n not in usados:
-                        asignado = n
-                        break
-                if asignado is None:
-                    asignado = max_num
-                nuevo_cupo['numero'] = str(asignado)
-
-                self.lista_cupos[i] = nuevo_cupo
-                self.renderizar_lista()
-                return True, i + 1 
-        
-        return False, 0
-
+        with self.lista_cupos.lote():
+            # Auto-expandir si está lleno
+            if self.lista_cupos.todos_ocupados and len(self.lista_cupos) < MAX_CUPOS:
+                self.redimensionar_cupos(len(self.lista_cupos) + 1)
+                toast("Capacidad aumentada automáticamente")
+
+            # Primer cupo vacío y menor número libre (1 reservado para organizador)
+            datos = dict(datos_usuario, usuario='Miembro Verificado')
+            i = self.lista_cupos.ocupar_siguiente(**datos)
+        if i is None:
+            return False, 0
+
+        historial = MDApp.get_running_app().reportes.alerta(datos.get('dni'))
+        if historial is not None:
+            toast(f"Atención: el DNI {datos['dni']} tiene {describir(historial)}")
+        return True, i + 1
+
+    def on_lista_cupos(self, instance, cupos):
+        # Otra junta: se observan sus cupos y se descarta la búsqueda anterior
+        anterior = self._observada
+        if anterior is not None:
+            anterior.dejar_de_observar(self._cupos_cambiados)
+            # Lo que quedó sin entregar llega a los demás observadores (p. ej. se guarda)
+            anterior.entregar()
+        self._observada = cupos
+        if cupos is not None:
+            entregar_por_frame(cupos)
+            cupos.observar(self._cupos_cambiados)
+        self._indice = None
+        self._filtro = ''
+        campo = self.ids.get('buscar_integrantes')
+        if campo is not None:
+            campo.text = ''
+
+    def _cupos_cambiados(self, cambios):
+        """Refleja en la lista y en la búsqueda un `ConjuntoCambios` de `lista_cupos`."""
+        if cambios.completo:
+            self.renderizar_lista()
+            return
+        if self._indice is not None:
+            cupos = self.lista_cupos
+            for i in cambios.indices:
+                self._indice.actualizar(i, cupos[i])
+        self._cambios.marcar(*cambios.indices)
+        # La entrega ya es una por frame: se pinta ahora, sin esperar otro frame
+        self._aplicar_cambios()
+
+    @medir('pagos.renderizar_lista')
     def renderizar_lista(self):
-        grid = self.ids.get('grid_integrantes', None)
-        if not grid: return
+        """Vuelca `lista_cupos` en el RecycleView; solo se crean las tarjetas visibles."""
+        rv = self.ids.get('grid_integrantes', None)
+        if not rv: return
+
+        self._cambios.limpiar()
+        # La tabla pudo cambiar entera: el índice se vuelve a armar al buscar
+        self._indice = None
+        self._volcar(rv)
+
+    def _volcar(self, rv):
+        cupos = self.lista_cupos
+        estado = self.estado_pago() or (lambda index: SIN_ESTADO_PAGO)
+        if not self._filtro:
+            rv.data = [vista_cupo(index, datos, estado(index)) for index, datos in enumerate(cupos)]
+            return
+        # Con filtro la columna de cada tarjeta depende de su fila, no de su posición
+        rv.data = [
+            dict(vista_cupo(index, cupos[index], estado(index)),
+                 posicion_numero="left" if fila % 2 == 0 else "right")
+            for fila, index in enumerate(self.indice_busqueda().buscar(self._filtro))
+        ]
 
-        grid.clear_widgets()
-        
-        for index, datos in enumerate(self.lista_cupos):
-            card = TarjetaIntegrante()
-            card.numero = str(index + 1)
-            card.posicion_numero = "left" if (index + 1) % 2 != 0 else "right"
-            
-            card.nombre_alias = datos.get('nombre', 'Cupo Disponible')
-            card.usuario = datos.get('usuario', 'Toque para editar')
-            card.dni = datos.get('dni', '')
-            card.telefono = datos.get('telefono', '')
-            card.correo = datos.get('correo', '')
-            
-            card.indice = index
-            grid.add_widget(card)
+    def on_pre_enter(self, *args):
+        # Si cambió la cuota o venció otro periodo, el estado de todas las tarjetas cambia
+        junta, cuota, vencidos = self._parametros_pago()
+        if self._clave_pagos != (junta['id'] if junta else None, cuota, vencidos):
+            self.renderizar_lista()
+
+    def on_enter(self, *args):
+        # Los diálogos de esta pantalla se arman mientras el usuario mira la lista
+        MDApp.get_running_app().dialogos.precalentar('edicion', 'intercambio', 'solicitud_intercambio',
+                                                     'procesar_solicitud')
+
+    # --- IMPORTAR / EXPORTAR ---
+    def abrir_menu_planilla(self, caller):
+        """Menú para importar integrantes de un CSV/JSONL o exportarlos."""
+        from kivymd.uix.menu import MDDropdownMenu
+        opciones = [
+            ("Importar CSV o JSONL", self.elegir_archivo_importacion),
+            ("Exportar CSV", lambda: self.exportar_integrantes('csv')),
+            ("Exportar JSONL", lambda: self.exportar_integrantes('jsonl')),
+        ]
+
+        def elegir(accion):
+            self.menu_planilla.dismiss()
+            accion()
+
+        items = [{"text": texto, "viewclass": "OneLineListItem", "on_release": lambda a=accion: elegir(a)}
+                 for texto, accion in opciones]
+        self.menu_planilla = MDDropdownMenu(caller=caller, items=items)
+        self.menu_planilla.open()
+
+    def elegir_archivo_importacion(self):
+        from kivymd.uix.filemanager import MDFileManager
+
+        def elegido(ruta):
+            self.gestor_archivos.close()
+            self.importar_integrantes(ruta)
+
+        self.gestor_archivos = MDFileManager(
+            select_path=elegido,
+            exit_manager=lambda *a: self.gestor_archivos.close(),
+            ext=['.csv', '.txt', *planillas.EXTENSIONES_JSONL],
+        )
+        try:
+            self.gestor_archivos.show(os.path.expanduser('~'))
+        except Exception as e:
+            print('FileManager error:', e)
+
+    def importar_integrantes(self, ruta):
+        """Importa integrantes de `ruta` sin bloquear la interfaz.
+
+        Un hilo lee y valida el archivo por lotes; cada lote se aplica a los
+        cupos y se encola en la base desde el hilo principal. Como mucho hay
+        dos lotes esperando, así la memoria no depende del tamaño del archivo.
+        El avance y el resultado se muestran con `Clock.schedule_once`.
+        """
+        app = MDApp.get_running_app()
+        junta_id = app.junta_actual
+        if not junta_id:
+            toast("Abre una junta para importar integrantes")
+            return
+        cupos = self.lista_cupos
+        dnis = {c.dni for c in cupos if c.ocupado and c.dni}
+        resumen = planillas.Resumen()
+        en_vuelo = threading.Semaphore(2)
+
+        def aplicar(validos, rechazados):
+            try:
+                # Si mientras tanto se abrió otra junta, el resto del archivo se descarta
+                if self.lista_cupos is not cupos:
+                    return
+                # Cada lote se guarda y se pinta en una sola entrega de cambios
+                with cupos.lote():
+                    _, sobrantes = planillas.aplicar_lote(cupos, validos, MAX_CUPOS)
+                resumen.sumar(len(validos) - len(sobrantes),
+                              rechazados + [(fila, 'junta_llena') for fila in sobrantes])
+            finally:
+                en_vuelo.release()
+
+        def terminar(error):
+            if error is not None:
+                toast("No se pudo leer el archivo")
+                return
+            toast(resumen.texto())
+
+        progreso = avisador_progreso("Importando... {} filas leídas")
+
+        def trabajo():
+            error = None
+            leidas = 0
+            try:
+                for validos, rechazados in planillas.leer_lotes(ruta, dnis):
+                    en_vuelo.acquire()
+                    Clock.schedule_once(lambda dt, v=validos, r=rechazados: aplicar(v, r))
+                    leidas += len(validos) + len(rechazados)
+                    progreso(leidas)
+            except Exception as e:
+                print('Error importando integrantes:', e)
+                error = e
+            Clock.schedule_once(lambda dt: terminar(error))
+
+        toast("Importando integrantes...")
+        threading.Thread(target=trabajo, name='savi-importar', daemon=True).start()
+
+    def exportar_integrantes(self, formato='csv'):
+        """Escribe los integrantes de la junta abierta en la carpeta de datos de la app.
+
+        Las filas se copian aquí (la tabla es del hilo principal) y un hilo
+        las escribe; el avance y el resultado se muestran con `Clock.schedule_once`.
+        """
+        app = MDApp.get_running_app()
+        junta = app.junta_en_curso()
+        if junta is None:
+            toast("Abre una junta para exportar")
+            return
+        nombre = re.sub(r'[^0-9a-z]+', '_', normalizar(junta['nombre'])).strip('_') or 'junta'
+        ruta = os.path.join(app.user_data_dir, f"{nombre}.{formato}")
+        filas = planillas.filas_exportar(self.lista_cupos)
+        progreso = avisador_progreso("Exportando... {} integrantes escritos")
+
+        def terminar(escritas, error):
+            if error is not None:
+                toast("No se pudo escribir el archivo")
+                return
+            toast(f"{escritas} integrantes exportados a {ruta}")
+
+        def trabajo():
+            escritas, error = 0, None
+            try:
+                escritas = planillas.escribir(filas, ruta, progreso)
+            except OSError as e:
+                print('Error exportando integrantes:', e)
+                error = e
+            Clock.schedule_once(lambda dt: terminar(escritas, error))
+
+        toast("Exportando integrantes...")
+        threading.Thread(target=trabajo, name='savi-exportar', daemon=True).start()
+
+    # --- PAGOS ---
+    def _parametros_pago(self):
+        """(junta, cuota, periodos vencidos) de la junta abierta, o (None, 0, 0)."""
+        app = MDApp.get_running_app()
+        junta = app.junta_en_curso() if app is not None else None
+        if junta is None:
+            return None, 0.0, 0
+        return (junta, monto_numerico(junta['monto']),
+                periodos_vencidos(junta['fecha_inicio'], junta['periodo'], len(self.lista_cupos)))
+
+    def estado_pago(self):
+        """Función posición -> (texto, atrasado) según el libro de pagos, o None sin junta."""
+        junta, cuota, vencidos = self._parametros_pago()
+        self._clave_pagos = (junta['id'] if junta else None, cuota, vencidos)
+        if junta is None:
+            return None
+        libro = MDApp.get_running_app().libro_pagos(junta['id'])
+        cupos = self.lista_cupos
+
+        def estado(index):
+            return libro.estado(index, cuota, vencidos) if cupos[index].ocupado else SIN_ESTADO_PAGO
+        return estado
+
+    def registrar_pago(self, indice):
+        """Registra la cuota del siguiente periodo que el integrante no tiene cubierto."""
+        junta, cuota, _ = self._parametros_pago()
+        if junta is None or not 0 <= indice < len(self.lista_cupos):
+            return
+        if cuota <= 0:
+            toast("Define el monto de la junta para registrar pagos")
+            return
+        app = MDApp.get_running_app()
+        libro = app.libro_pagos(junta['id'])
+        periodo = libro.siguiente_periodo(indice, cuota)
+        if periodo >= len(self.lista_cupos):
+            toast("Ya pagó todos los periodos")
+            return
+        app.db.agregar_pago(junta['id'], *libro.registrar(indice, periodo, cuota))
+        self.marcar_cambios(indice)
+        toast(f"Pago del periodo {periodo + 1} registrado")
+
+    def indice_busqueda(self):
+        if self._indice is None:
+            self._indice = IndiceCupos(self.lista_cupos)
+        return self._indice
+
+    def filtrar_integrantes(self, texto):
+        """Filtra las tarjetas cuando se deja de escribir por `ESPERA_BUSQUEDA`."""
+        self._texto_busqueda = texto
+        self._trigger_filtro()
+
+    @medir('pagos.filtrar')
+    def _aplicar_filtro(self, *args):
+        filtro = self._texto_busqueda.strip()
+        rv = self.ids.get('grid_integrantes', None)
+        if filtro == self._filtro or not rv:
+            return
+        self._filtro = filtro
+        self._cambios.limpiar()
+        self._volcar(rv)
+        rv.scroll_y = 1
+
+    def marcar_cambios(self, *indices):
+        """Programa el repintado de tarjetas cuyos cupos no cambiaron (p. ej. un pago).
+
+        Los cambios de `lista_cupos` llegan solos, por `_cupos_cambiados`.
+        """
+        self._cambios.marcar(*indices)
+        self._trigger_cambios()
+
+    def _aplicar_cambios(self, *args):
+        rv = self.ids.get('grid_integrantes', None)
+        if not rv or not self._cambios.pendiente:
+            return
+        if self._filtro:
+            # Un cambio puede sacar o meter cupos en el resultado: se vuelve a filtrar
+            self._cambios.limpiar()
+            self._volcar(rv)
+            return
+        adaptador = rv.view_adapter
+        obtener = adaptador.get_visible_view if adaptador is not None else None
+        if self._cambios.aplicar(self.lista_cupos, rv.data, obtener, self.estado_pago()) is None:
+            self.renderizar_lista()
 
     # --- SORTEO / NÚMEROS ---
-    def generar_sorteo(self):
+    def generar_sorteo(self, semilla=None):
         """Genera números aleatorios para los integrantes (organizador = 1).
 
         Solo redistribuye números entre los integrantes ocupados (excluye organizador).
+        La semilla queda registrada en la base de datos, así que pasando la misma
+        semilla con los mismos integrantes se obtiene el mismo resultado.
         """
-        import random
+        from sorteo import MOTOR, nueva_semilla, sortear  # NumPy solo se carga al sortear
+
         app = MDApp.get_running_app()
         max_num = len(self.lista_cupos)
         # participantes ocupados excepto índice 0
-        participantes = [ (i, c) for i,c in enumerate(self.lista_cupos) if c.get('ocupado') and i != 0 ]
+        participantes = self.lista_cupos.participantes()
         if not participantes:
             toast('No hay integrantes para sortear')
             return
 
-        numeros_disponibles = list(range(2, max_num+1))
-        random.shuffle(numeros_disponibles)
+        if semilla is None:
+            semilla = nueva_semilla()
+        numeros = sortear(len(participantes), max_num, semilla)
+        self.lista_cupos.asignar_numeros(zip(participantes, numeros))
+        if app.junta_actual:
+            app.db.agregar_sorteo(app.junta_actual, {
+                'semilla': semilla, 'motor': MOTOR, 'total_numeros': max_num,
+                'posiciones': participantes, 'numeros': numeros,
+            })
+        toast(f'Números asignados aleatoriamente (semilla {semilla:x})')
+
+    def verificar_ultimo_sorteo(self):
+        """Repite el último sorteo guardado de la junta desde su semilla y compara los números."""
+        from sorteo import verificar  # NumPy solo se carga al sortear
 
-        for (i, _), num in zip(participantes, numeros_disponibles):
-            self.lista_cupos[i]['numero'] = str(num)
-
-        self.renderizar_lista()
-        toast('Números asignados aleatoriamente')
+        app = MDApp.get_running_app()
+        sorteos = app.db.sorteos(app.junta_actual) if app.junta_actual else []
+        if not sorteos:
+            toast('Esta junta aún no tiene sorteos')
+            return
+        ultimo = sorteos[-1]
+        try:
+            correcto = verificar(ultimo)
+        except (RuntimeError, ValueError) as e:
+            toast(f'No se pudo repetir el sorteo: {e}')
+            return
+        fecha = time.strftime('%d/%m/%Y', time.localtime(ultimo['creado']))
+        if correcto:
+            toast(f"Sorteo del {fecha} verificado: la semilla {ultimo['semilla']:x} "
+                  f"da los mismos {len(ultimo['numeros'])} números")
+        else:
+            toast(f'El sorteo del {fecha} no coincide con su semilla')
 
+    @medir('dialogo.intercambio')
     def abrir_dialogo_intercambio(self):
         """Abre un diálogo simple para intercambiar números entre integrantes.
 
@@ -415,93 +885,57 @@ class IntegrantesPagosScreen(MDScreen):
             toast('Solo el dueño de la junta puede cambiar números')
             return
 
-        from kivymd.uix.dialog import MDDialog
-        from kivymd.uix.button import MDFlatButton, MDFillRoundFlatButton
-        from kivymd.uix.textfield import MDTextField
+        dialogo = app.dialogos.obtener('intercambio')
 
-        campo_a = MDTextField(hint_text='Número actual (ej: 2)')
-        campo_b = MDTextField(hint_text='Número a intercambiar (ej: 3)')
-        contenido = MDBoxLayout(orientation='vertical', spacing='8dp', adaptive_height=True)
-        contenido.add_widget(campo_a)
-        contenido.add_widget(campo_b)
-
-        def intercambiar(obj):
-            a = campo_a.text.strip()
-            b = campo_b.text.strip()
+        def intercambiar():
+            a = dialogo.campos['a'].text.strip()
+            b = dialogo.campos['b'].text.strip()
             if not a.isdigit() or not b.isdigit():
                 toast('Ingrese números válidos')
                 return
-            na = a; nb = b
-            idx_a = next((i for i,c in enumerate(self.lista_cupos) if c.get('numero') == na), None)
-            idx_b = next((i for i,c in enumerate(self.lista_cupos) if c.get('numero') == nb), None)
-            if idx_a is None or idx_b is None:
-                toast('Uno de los números no existe')
-                return
+            na = int(a); nb = int(b)
             # impedir cambiar el organizador (numero 1)
-            if na == '1' or nb == '1':
+            if na == 1 or nb == 1:
                 toast('No se puede cambiar el número del organizador')
                 return
             # swap
-            self.lista_cupos[idx_a]['numero'], self.lista_cupos[idx_b]['numero'] = self.lista_cupos[idx_b]['numero'], self.lista_cupos[idx_a]['numero']
-            self.renderizar_lista()
-            dialog.dismiss()
+            posiciones = self.lista_cupos.intercambiar_numeros(na, nb)
+            if posiciones is None:
+                toast('Uno de los números no existe')
+                return
+            dialogo.cerrar()
             toast('Intercambio realizado')
 
-        dialog = MDDialog(
-            title='Intercambiar Números',
-            type='custom',
-            content_cls=contenido,
-            buttons=[
-                MDFlatButton(text='CANCELAR', on_release=lambda x: dialog.dismiss()),
-                MDFillRoundFlatButton(text='INTERCAMBIAR', on_release=intercambiar)
-            ]
-        )
-        dialog.open()
+        dialogo.abrir(acciones={'intercambiar': intercambiar})
 
+    @medir('dialogo.solicitar_intercambio')
     def solicitar_intercambio_participante(self):
         """Permite a un participante enviar una solicitud de intercambio al dueño.
 
         Pide al usuario su número y el número del otro integrante y guarda la
-        solicitud en `app.pending_swap_requests`.
+        solicitud en `app.pending_swap_requests`; si ya hay una pendiente para
+        el mismo par de números (en cualquier sentido) no se duplica.
         """
-        from kivymd.uix.dialog import MDDialog
-        from kivymd.uix.button import MDFlatButton, MDFillRoundFlatButton
-        from kivymd.uix.textfield import MDTextField
-
-        campo_mio = MDTextField(hint_text='Tu número (ej: 2)')
-        campo_otro = MDTextField(hint_text='Número con quien quieres cambiar (ej: 3)')
-        contenido = MDBoxLayout(orientation='vertical', spacing='8dp', adaptive_height=True)
-        contenido.add_widget(campo_mio)
-        contenido.add_widget(campo_otro)
-
         app = MDApp.get_running_app()
+        dialogo = app.dialogos.obtener('solicitud_intercambio')
 
-        def enviar(obj):
-            a = campo_mio.text.strip()
-            b = campo_otro.text.strip()
+        def enviar():
+            a = dialogo.campos['mio'].text.strip()
+            b = dialogo.campos['otro'].text.strip()
             if not a.isdigit() or not b.isdigit():
                 toast('Ingrese números válidos')
                 return
             if a == '1' or b == '1':
                 toast('No se puede solicitar intercambio con el organizador')
                 return
-            # Guardar solicitud
-            req = {'from': a, 'to': b}
-            app.pending_swap_requests.append(req)
-            dialog.dismiss()
+            if not app.encolar_solicitud(a, b):
+                return
+            dialogo.cerrar()
             toast('Solicitud enviada al dueño de la junta')
 
-        dialog = MDDialog(
-            title='Solicitar Intercambio',
-            type='custom',
-            content_cls=contenido,
-            buttons=[
-                MDFlatButton(text='CANCELAR', on_release=lambda x: dialog.dismiss()),
-                MDFillRoundFlatButton(text='ENVIAR', on_release=enviar)
-            ]
-        )
-        dialog.open()
+        dialogo.abrir(acciones={'enviar': enviar})
 
+    @medir('dialogo.ver_solicitudes')
     def ver_solicitudes_intercambio(self):
         """Permite al dueño procesar las solicitudes pendientes una a una."""
         app = MDApp.get_running_app()
@@ -509,105 +943,125 @@ class IntegrantesPagosScreen(MDScreen):
             toast('Solo el dueño de la junta puede ver las solicitudes')
             return
 
-        if not app.pending_swap_requests:
+        # Solo las solicitudes de la junta abierta: los números son de esta junta
+        junta_id = app.junta_actual
+        if not app.solicitudes_actuales():
             toast('No hay solicitudes pendientes')
             return
 
-        # Procesar la primera solicitud en cola
-        req = app.pending_swap_requests.pop(0)
-        from kivymd.uix.dialog import MDDialog
-        from kivymd.uix.button import MDFlatButton, MDFillRoundFlatButton
-        contenido = MDBoxLayout(orientation='vertical', spacing='6dp', adaptive_height=True)
-        contenido.add_widget(MDLabel(text=f"Solicitud: {req['from']} ⇄ {req['to']}", theme_text_color='Primary'))
+        # La primera solicitud en cola sigue pendiente hasta que el dueño elija:
+        # cerrar el diálogo sin responder no la pierde
+        req = app.pending_swap_requests.primera(junta_id)
+        dialogo = app.dialogos.obtener('procesar_solicitud')
 
-        def aprobar(obj):
-            na = req['from']; nb = req['to']
-            idx_a = next((i for i,c in enumerate(self.lista_cupos) if c.get('numero') == na), None)
-            idx_b = next((i for i,c in enumerate(self.lista_cupos) if c.get('numero') == nb), None)
-            if idx_a is None or idx_b is None:
-                toast('Uno de los números ya no existe')
+        def responder(aprobar):
+            app._procesar_solicitud_inline(req['id'], aprobar)
+            if app.junta_actual == junta_id and app.solicitudes_actuales():
+                self.ver_solicitudes_intercambio()
             else:
-                # swap
-                self.lista_cupos[idx_a]['numero'], self.lista_cupos[idx_b]['numero'] = self.lista_cupos[idx_b]['numero'], self.lista_cupos[idx_a]['numero']
-                self.renderizar_lista()
-                toast('Solicitud aprobada: números intercambiados')
-            dialog.dismiss()
-            # llamar recursivamente para seguir procesando
-            Clock.schedule_once(lambda dt: self.ver_solicitudes_intercambio(), 0.2)
-
-        def rechazar(obj):
-            toast('Solicitud rechazada')
-            dialog.dismiss()
-            Clock.schedule_once(lambda dt: self.ver_solicitudes_intercambio(), 0.2)
-
-        dialog = MDDialog(
-            title='Procesar Solicitud de Intercambio',
-            type='custom',
-            content_cls=contenido,
-            buttons=[
-                MDFlatButton(text='RECHAZAR', on_release=rechazar),
-                MDFillRoundFlatButton(text='APROBAR', on_release=aprobar)
-            ]
+                dialogo.cerrar()
+
+        dialogo.abrir(
+            textos={'solicitud': f"Solicitud: {req['from']} ⇄ {req['to']}"},
+            acciones={'aprobar': lambda: responder(True), 'rechazar': lambda: responder(False)},
         )
-        dialog.open()
 
     def _aprobar_solicitud(self, req):
-        """Procesa (aprueba) una solicitud de intercambio proporcionada por el owner."""
+        """Procesa (aprueba) una solicitud de intercambio proporcionada por el owner.
+
+        Solo se aplica si la solicitud es de la junta abierta.
+        """
         try:
-            na = req['from']; nb = req['to']
-            idx_a = next((i for i,c in enumerate(self.lista_cupos) if c.get('numero') == na), None)
-            idx_b = next((i for i,c in enumerate(self.lista_cupos) if c.get('numero') == nb), None)
-            if idx_a is None or idx_b is None:
-                toast('Uno de los números ya no existe')
+            if req.get('junta_id') != MDApp.get_running_app().junta_actual:
+                toast('La solicitud es de otra junta')
                 return False
+            na = req['from']; nb = req['to']
             if na == '1' or nb == '1':
                 toast('No se puede cambiar el número del organizador')
                 return False
-            self.lista_cupos[idx_a]['numero'], self.lista_cupos[idx_b]['numero'] = self.lista_cupos[idx_b]['numero'], self.lista_cupos[idx_a]['numero']
-            self.renderizar_lista()
+            posiciones = self.lista_cupos.intercambiar_numeros(na, nb)
+            if posiciones is None:
+                toast('Uno de los números ya no existe')
+                return False
             return True
         except Exception as e:
             print('Error _aprobar_solicitud:', e)
             return False
 
+    def resumen_pagos(self, indice, al_terminar):
+        """Pide el historial del cupo a la base; devuelve el texto provisional, o None sin junta.
+
+        `al_terminar(texto)` recibe en el hilo principal el resumen para el
+        diálogo: '3 pagos, el último el 12/10/2026 · Debe 50.00'.
+        """
+        junta, cuota, vencidos = self._parametros_pago()
+        if junta is None:
+            return None
+        app = MDApp.get_running_app()
+        estado = app.libro_pagos(junta['id']).estado(indice, cuota, vencidos)[0]
+
+        def unir(texto):
+            return f"{texto} · {estado}" if estado else texto
+
+        def recibir(movimientos):
+            # Hilo de la base de datos
+            if movimientos is None:
+                texto = "No se pudieron leer los pagos"
+            elif movimientos:
+                ultimo = time.strftime('%d/%m/%Y', time.localtime(movimientos[-1][2]))
+                texto = f"{len(movimientos)} {'pago' if len(movimientos) == 1 else 'pagos'}, el último el {ultimo}"
+            else:
+                texto = "Sin pagos registrados"
+            Clock.schedule_once(lambda dt: al_terminar(unir(texto)))
+
+        app.db.pagos_cupo(junta['id'], indice, recibir)
+        return unir("Cargando pagos…")
+
+    @medir('dialogo.edicion')
     def mostrar_dialogo_edicion(self, indice, es_registro_qr=False):
-        from kivymd.uix.dialog import MDDialog
-        from kivymd.uix.button import MDFlatButton, MDFillRoundFlatButton
-        from kivymd.uix.textfield import MDTextField
-        from kivymd.uix.label import MDLabel
-        
         datos_actuales = {}
         if not es_registro_qr and indice >= 0:
             if indice < len(self.lista_cupos):
                 datos_actuales = self.lista_cupos[indice]
-        
-        campo_nombre = MDTextField(hint_text="Nombre Completo", text=datos_actuales.get('nombre', ''), input_filter=None)
-        campo_dni = MDTextField(hint_text="DNI", text=datos_actuales.get('dni', ''), input_filter="int", max_text_length=8)
-        campo_telefono = MDTextField(hint_text="Celular", text=datos_actuales.get('telefono', ''), input_filter="int", max_text_length=9)
-        campo_correo = MDTextField(hint_text="Correo", text=datos_actuales.get('correo', ''))
 
-        contenido = MDBoxLayout(orientation="vertical", spacing="12dp", adaptive_height=True, size_hint_y=None)
-        
+        app = MDApp.get_running_app()
+        dialogo = app.dialogos.obtener('edicion')
+        campos = dialogo.campos
+
+        # Aviso al organizador si el DNI tiene reportes (consulta O(1) en cada tecla)
+        reportes = app.reportes
+
+        def revisar_dni(campo, texto):
+            historial = reportes.alerta(texto.strip())
+            if historial is not None:
+                campo.helper_text_mode = 'on_error'
+                campo.helper_text = f"Reportado: {describir(historial)}"
+                campo.error = True
+            elif campo.helper_text:
+                campo.helper_text = ''
+                campo.error = False
+
         titulo = "¡Únete a la Junta!" if es_registro_qr else "Editar Integrante"
-        subtitulo = "Datos del participante"
+        pagos = None
+        if datos_actuales and datos_actuales.get('ocupado'):
+            apertura = dialogo.apertura + 1
 
-        contenido.add_widget(MDLabel(text=titulo, font_style="H6", adaptive_height=True))
-        contenido.add_widget(MDLabel(text=subtitulo, theme_text_color="Secondary", font_style="Caption"))
-        contenido.add_widget(campo_nombre)
-        contenido.add_widget(campo_dni)
-        contenido.add_widget(campo_telefono)
-        contenido.add_widget(campo_correo)
+            def mostrar_pagos(texto):
+                if dialogo.apertura == apertura and dialogo.abierto:
+                    dialogo.etiquetas['pagos'].text = texto
 
-        def guardar(obj):
-            if not campo_nombre.text.strip():
+            pagos = self.resumen_pagos(indice, mostrar_pagos)
+
+        def guardar():
+            if not campos['nombre'].text.strip():
                 toast("El nombre es obligatorio")
                 return
             
             nuevos_datos = {
-                'nombre': campo_nombre.text,
-                'dni': campo_dni.text,
-                'telefono': campo_telefono.text,
-                'correo': campo_correo.text,
+                'nombre': campos['nombre'].text,
+                'dni': campos['dni'].text,
+                'telefono': campos['telefono'].text,
+                'correo': campos['correo'].text,
                 'usuario': 'Miembro Manual'
             }
 
@@ -615,33 +1069,117 @@ class IntegrantesPagosScreen(MDScreen):
                 exito, num = self.ocupar_siguiente_cupo_vacio(nuevos_datos)
                 if exito:
                     toast(f"¡Bienvenido! Cupo #{num}")
-                    MDApp.get_running_app().get_manager().current = 'integrantes_pagos'
+                    app.get_manager().current = 'integrantes_pagos'
                 else:
-                    toast("¡La junta está llena! (Max 10)")
+                    toast(f"¡La junta está llena! (Max {MAX_CUPOS})")
             else:
                 nuevos_datos['ocupado'] = True
                 if indice < len(self.lista_cupos):
-                    self.lista_cupos[indice].update(nuevos_datos)
-                    self.renderizar_lista()
+                    self.lista_cupos.actualizar(indice, **nuevos_datos)
                     toast("Datos guardados")
 
-            self.dialogo.dismiss()
+            dialogo.cerrar()
+
+        def pagar():
+            dialogo.cerrar()
+            self.registrar_pago(indice)
 
-        self.dialogo = MDDialog(
-            type="custom",
-            content_cls=contenido,
-            buttons=[
-                MDFlatButton(text="CANCELAR", on_release=lambda x: self.dialogo.dismiss()),
-                MDFillRoundFlatButton(text="GUARDAR DATOS", on_release=guardar)
-            ],
+        dialogo.abrir(
+            textos={'titulo': titulo, 'pagos': pagos or ''},
+            valores={campo: datos_actuales.get(campo, '') for campo in campos},
+            acciones={'guardar': guardar, 'pagar': pagar},
+            al_escribir={'dni': revisar_dni},
+            ocultos=() if pagos is not None else ('pagos', 'pagar'),
         )
-        self.dialogo.open()
 
-class SaviScreenManager(ScreenManager): pass
+# Pantallas de la app: nombre -> clase (reglas en design.kv). Se crean al pedirlas.
+PANTALLAS = {
+    'welcome': 'WelcomeScreen',
+    'login': 'LoginScreen',
+    'register': 'RegisterScreen',
+    'home': 'HomeScreen',
+    'detalles_junta': 'DetallesJuntaScreen',
+    'invitar': 'InvitarScreen',
+    'info_junta': 'InfoJuntaScreen',
+    'cronograma': 'CronogramaScreen',
+    'integrantes_pagos': 'IntegrantesPagosScreen',
+    'reportar': 'ReportarScreen',
+    'sorteo': 'SorteoScreen',
+}
+PANTALLA_INICIAL = 'welcome'
+
+# Pantallas que probablemente se abren después de cada una; se crean por
+# adelantado cuando la app está ociosa.
+SIGUIENTES = {
+    'welcome': ('login', 'home'),
+    'login': ('home',),
+    'home': ('detalles_junta',),
+    'detalles_junta': ('info_junta', 'integrantes_pagos', 'invitar'),
+    'info_junta': ('sorteo', 'cronograma'),
+}
+
+
+class SaviScreenManager(ScreenManager):
+    """ScreenManager que construye cada pantalla la primera vez que se usa.
+
+    Al arrancar solo existe `PANTALLA_INICIAL`. `get_screen` (y por lo tanto
+    asignar `current`) crea la pantalla pedida si aún no existe y la deja en
+    caché. Con `precalentar` activo, tras cada cambio de pantalla se crean
+    las de `SIGUIENTES` de a una por frame, mientras el usuario no navega
+    (`SAVI_PRECALENTAR=0` lo desactiva).
+    """
+    precalentar = BooleanProperty(os.environ.get('SAVI_PRECALENTAR', '1') != '0')
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._precalentado = Clock.create_trigger(self._precalentar_siguiente, 0.5)
+        self._pendientes = []
+        self.current = PANTALLA_INICIAL
+
+    def get_screen(self, name):
+        if name in PANTALLAS and not self.has_screen(name):
+            self.crear_pantalla(name)
+        return super().get_screen(name)
+
+    def crear_pantalla(self, name):
+        with rendimiento.tramo('pantalla.crear', pantalla=name):
+            pantalla = Factory.get(PANTALLAS[name])()
+        self.add_widget(pantalla)
+        if hasattr(pantalla, 'al_registrar'):
+            pantalla.al_registrar()
+        return pantalla
+
+    def on_current(self, instance, value):
+        super().on_current(instance, value)
+        if self.precalentar:
+            self._pendientes = [n for n in SIGUIENTES.get(value, ()) if not self.has_screen(n)]
+            self._precalentado.cancel()
+            if self._pendientes:
+                self._precalentado()
+
+    def _precalentar_siguiente(self, *args):
+        # Una pantalla por frame para no trabar la interfaz
+        while self._pendientes:
+            nombre = self._pendientes.pop(0)
+            if not self.has_screen(nombre):
+                self.crear_pantalla(nombre)
+                break
+        if self._pendientes:
+            Clock.schedule_once(self._precalentar_siguiente)
 
 class SaviApp(MDApp):
     moneda_seleccionada = StringProperty("Soles")
     menu_periodo = None
+    menu_orden = None
+    # Opciones de orden de "Mis juntas": texto -> (criterio, descendente)
+    ORDENES_JUNTAS = {
+        "Más recientes": ('creada', True),
+        "Más antiguas": ('creada', False),
+        "Mayor monto": ('monto', True),
+        "Menor monto": ('monto', False),
+        "Periodo": ('periodo', False),
+        "Nombre": ('nombre', False),
+    }
     DEBUG = 0
     def build(self):
         # Configurar tema
@@ -649,10 +1187,51 @@ class SaviApp(MDApp):
         self.theme_cls.theme_style = "Light"
         self.theme_cls.material_style = "M3"
 
-        # inicializar lista de solicitudes de intercambio
-        self.pending_swap_requests = []
+        # Cargar el estado guardado (juntas, cupos y solicitudes) en una sola lectura
+        self.db = BaseDatos(os.path.join(self.user_data_dir, 'savi.db'), registrar_cambios=bool(SERVIDOR_SYNC))
+        juntas, solicitudes = self.db.cargar_todo()
+        self.juntas = {j['id']: j for j in juntas}
+        self.junta_actual = None
+        self.indice_juntas = IndiceJuntas()
+        self.indice_juntas.cargar(juntas)
+        self.filtro_juntas = ""
+        self.orden_juntas = ('creada', True)
+        self._trigger_juntas = Clock.create_trigger(lambda dt: self.mostrar_juntas_guardadas(), ESPERA_BUSQUEDA)
+        self.cronogramas = {}  # junta_id -> Cronograma (se calcula al abrirlo)
+        self.libros_pagos = {}  # junta_id -> LibroPagos (saldos leídos al abrirla)
+        # Diálogos armados una vez y reutilizados en cada apertura
+        self.dialogos = PoolDialogos()
+
+        # Códigos de invitación ya asignados -> junta (resolución en O(1)). Sin
+        # servidor se asignan con la clave de este dispositivo; los que no son
+        # de ese índice (asignados por el servidor o recibidos al unirse) van
+        # en un diccionario aparte.
+        self.codigos = IndiceCodigos(clave_dispositivo(self.db.id_dispositivo()))
+        invitaciones = self.db.cargar_invitaciones()
+        self.codigos.cargar(invitaciones)
+        self.codigos_ajenos = {}
+        for codigo, junta_id in invitaciones:
+            if junta_id in self.juntas:
+                self.juntas[junta_id]['codigo'] = codigo
+            if self.codigos.buscar(codigo) != junta_id:
+                self.codigos_ajenos[codigo] = junta_id
+
+        # Reportes por DNI: los agregados se leen en un hilo para no demorar el arranque
+        self.reportes = RegistroReportes()
+        threading.Thread(target=self.reportes.cargar, args=(self.db,), name='savi-reportes', daemon=True).start()
+
+        # Solicitudes de intercambio: una cola por junta (por id, sin pares repetidos)
+        self.pending_swap_requests = SolicitudesPorJunta(solicitudes)
         self.is_creator = True
 
+        # Réplica local sincronizada en segundo plano (solo con servidor configurado)
+        self.sincronizador = None
+        if SERVIDOR_SYNC:
+            from sincronizacion import Sincronizador
+            self.sincronizador = Sincronizador(self.db, SERVIDOR_SYNC, entregar=mainthread(self._aplicar_remotos))
+            # Varias ediciones seguidas se envían juntas, un segundo después de la última
+            self._trigger_sincronizar = Clock.create_trigger(lambda dt: self.sincronizador.avisar(), 1)
+
         # Cargamos el archivo explícitamente pero manejando errores de ruta
         try:
             Builder.load_file('design.kv')
@@ -663,6 +1242,11 @@ class SaviApp(MDApp):
 
     def on_start(self):
         """Solicitar permisos en Android al iniciar la app."""
+        rendimiento.iniciar()
+        rendimiento.observar_transiciones(self.root)
+        if self.sincronizador is not None:
+            self.sincronizador.iniciar()
+
         if platform == 'android':
             try:
                 import importlib
@@ -685,6 +1269,21 @@ class SaviApp(MDApp):
             except Exception as e:
                 print('No se pudieron solicitar permisos runtime:', e)
 
+    def on_stop(self):
+        if self.sincronizador is not None:
+            self.sincronizador.detener()
+        # Entregar los cambios de cupos del último frame y vaciar la cola de escrituras
+        for junta in self.juntas.values():
+            if isinstance(junta['cupos'], TablaCupos):
+                junta['cupos'].entregar()
+        self.db.cerrar()
+        if rendimiento.ACTIVO:
+            try:
+                ruta = os.path.join(self.user_data_dir, 'rendimiento.jsonl')
+                print(f'Traza de rendimiento: {rendimiento.volcar(ruta)} registros en {ruta}')
+            except Exception as e:
+                print('No se pudo guardar la traza de rendimiento:', e)
+
     def set_moneda(self, moneda):
         self.moneda_seleccionada = moneda
 
@@ -709,6 +1308,7 @@ class SaviApp(MDApp):
                 "on_release": lambda x=opcion: self.set_periodo(x, caller),
             } for opcion in opciones
         ]
+        from kivymd.uix.menu import MDDropdownMenu
         self.menu_periodo = MDDropdownMenu(
             caller=caller,
             items=items,
@@ -741,6 +1341,9 @@ class SaviApp(MDApp):
             if not sorteo_area:
                 return
             sorteo_area.clear_widgets()
+            rv = pantalla.ids.get('lista_solicitudes')
+            if rv is not None:
+                rv.data = []
 
             from kivymd.uix.textfield import MDTextField
             from kivymd.uix.boxlayout import MDBoxLayout
@@ -772,8 +1375,8 @@ class SaviApp(MDApp):
                 toast('No se puede solicitar intercambio con el organizador')
                 return
 
-            req = {'from': a, 'to': b}
-            self.pending_swap_requests.append(req)
+            if not self.encolar_solicitud(a, b):
+                return
             toast('Solicitud enviada al dueño de la junta')
             pantalla = self.get_manager().get_screen('sorteo')
             sorteo_area = pantalla.ids.get('sorteo_area')
@@ -782,44 +1385,80 @@ class SaviApp(MDApp):
         except Exception as e:
             print('Error _enviar_solicitud_inline:', e)
 
+    def encolar_solicitud(self, a, b):
+        """Guarda la solicitud a ⇄ b salvo que ya haya una para ese par."""
+        if a == b:
+            toast('Los números deben ser distintos')
+            return False
+        if not self.junta_actual:
+            toast('Abre una junta para solicitar un intercambio')
+            return False
+        req = {'id': nuevo_id(), 'junta_id': self.junta_actual, 'from': a, 'to': b}
+        if not self.pending_swap_requests.agregar(req):
+            toast('Ya hay una solicitud pendiente para esos números')
+            return False
+        self.db.agregar_solicitud(req, self.junta_actual)
+        self.avisar_cambios()
+        return True
+
+    def solicitudes_actuales(self):
+        """Cola de solicitudes de la junta abierta."""
+        return self.pending_swap_requests.cola(self.junta_actual)
+
     def mostrar_solicitudes_sorteo(self):
+        """Muestra las solicitudes pendientes en el RecycleView del sorteo."""
         try:
             pantalla = self.get_manager().get_screen('sorteo')
             sorteo_area = pantalla.ids.get('sorteo_area')
-            if not sorteo_area:
+            rv = pantalla.ids.get('lista_solicitudes')
+            if not sorteo_area or rv is None:
                 return
             sorteo_area.clear_widgets()
 
-            from kivymd.uix.boxlayout import MDBoxLayout
-            from kivymd.uix.button import MDRectangleFlatButton
-            from kivymd.uix.label import MDLabel
-
-            app = self
-            if not getattr(app, 'is_creator', False):
-                sorteo_area.add_widget(MDLabel(text='Solo el dueño puede ver las solicitudes', halign='center'))
-                return
-
-            if not self.pending_swap_requests:
-                sorteo_area.add_widget(MDLabel(text='No hay solicitudes pendientes', halign='center'))
+            if not getattr(self, 'is_creator', False):
+                rv.data = []
+                sorteo_area.add_widget(MDLabel(text='Solo el dueño puede ver las solicitudes', halign='center', adaptive_height=True))
                 return
 
-            for i, req in enumerate(list(self.pending_swap_requests)):
-                row = MDBoxLayout(size_hint_y=None, height=dp(48), spacing=dp(8))
-                row.add_widget(MDLabel(text=f"{req['from']} ⇄ {req['to']}", halign='left'))
-                btn_ap = MDRectangleFlatButton(text='Aprobar', on_release=lambda x, r=req: self._procesar_solicitud_inline(r, True))
-                btn_re = MDRectangleFlatButton(text='Rechazar', on_release=lambda x, r=req: self._procesar_solicitud_inline(r, False))
-                row.add_widget(btn_ap)
-                row.add_widget(btn_re)
-                sorteo_area.add_widget(row)
+            rv.data = [self._fila_solicitud(req) for req in self.solicitudes_actuales()]
+            if not rv.data:
+                sorteo_area.add_widget(MDLabel(text='No hay solicitudes pendientes', halign='center', adaptive_height=True))
         except Exception as e:
             print('Error mostrar_solicitudes_sorteo:', e)
 
-    def _procesar_solicitud_inline(self, req, aprobar):
+    @staticmethod
+    def _fila_solicitud(req):
+        return {'solicitud_id': req['id'], 'texto': f"{req['from']} ⇄ {req['to']}", 'orden': req['orden']}
+
+    def quitar_fila_solicitud(self, req):
+        """Retira la fila de `req` de la lista del sorteo, si está visible.
+
+        Las filas están en orden de llegada, así que se localiza por búsqueda
+        binaria sobre `orden` en lugar de recorrer la lista.
+        """
         try:
-            try:
-                self.pending_swap_requests.remove(req)
-            except ValueError:
-                pass
+            rv = self.get_manager().get_screen('sorteo').ids.get('lista_solicitudes')
+        except Exception:
+            return
+        if rv is None:
+            return
+        i = bisect_left(rv.data, req['orden'], key=lambda fila: fila['orden'])
+        if i < len(rv.data) and rv.data[i]['solicitud_id'] == req['id']:
+            del rv.data[i]
+
+    def _procesar_solicitud_inline(self, solicitud_id, aprobar):
+        try:
+            req = self.pending_swap_requests.get(solicitud_id)
+            if req is None:
+                return
+            if req.get('junta_id') != self.junta_actual:
+                # Fila de otra junta que quedó en pantalla: no se toca
+                toast('La solicitud es de otra junta')
+                self.mostrar_solicitudes_sorteo()
+                return
+            self.pending_swap_requests.quitar(solicitud_id)
+            self.db.eliminar_solicitud(req['id'], req.get('junta_id'))
+            self.quitar_fila_solicitud(req)
 
             pagos = self.get_manager().get_screen('integrantes_pagos')
             if aprobar:
@@ -831,7 +1470,8 @@ class SaviApp(MDApp):
             else:
                 toast('Solicitud rechazada')
 
-            self.mostrar_solicitudes_sorteo()
+            if not self.solicitudes_actuales():
+                self.mostrar_solicitudes_sorteo()
         except Exception as e:
             print('Error procesar solicitud inline:', e)
 
@@ -893,6 +1533,8 @@ class SaviApp(MDApp):
             try:
                 invitar = manager.get_screen('invitar')
                 if invitar and hasattr(invitar, 'ids') and 'img_qr' in invitar.ids:
+                    invitar._cancelar_qr()
+                    invitar.qr_listo = True
                     invitar.ids.img_qr.source = path
                     try:
                         invitar.ids.img_qr.reload()
@@ -914,10 +1556,46 @@ class SaviApp(MDApp):
                 pass
 
             toast('Imagen QR cargada')
+
+            # En el flujo de unirse, leer el código de la imagen en segundo plano
+            if manager.current == 'home':
+                try:
+                    self.file_manager.close()
+                except Exception:
+                    pass
+                self.leer_codigo_de_imagen(path)
         except Exception as e:
             print('Error al seleccionar archivo:', e)
             toast('Error al cargar imagen')
 
+    def leer_codigo_de_imagen(self, path):
+        """Decodifica el QR de `path` en un hilo y pasa el resultado a `procesar_codigo_invitacion`."""
+        def trabajo():
+            texto = aviso = None
+            try:
+                texto = leer_qr(path)
+            except SinDecodificador:
+                aviso = 'Este dispositivo no tiene un lector de QR disponible. Ingresa el código a mano'
+            except ImagenDemasiadoGrande:
+                aviso = 'La imagen es demasiado grande. Prueba con una captura o una foto del QR'
+            except Exception as e:
+                print('Error leyendo QR:', e)
+            Clock.schedule_once(lambda dt: toast(aviso) if aviso else self._codigo_leido(texto))
+
+        threading.Thread(target=trabajo, name='savi-lector-qr', daemon=True).start()
+
+    def _codigo_leido(self, texto):
+        if not texto:
+            toast('No se encontró un código QR en la imagen')
+            return
+        try:
+            home = self.get_manager().get_screen('home')
+            home.ids.input_codigo_unirse.text = texto
+        except Exception:
+            pass
+        self.procesar_codigo_invitacion(texto)
+
+    @medir('app.crear_junta')
     def crear_junta(self, nombre, monto, cantidad, periodo, inicio, final):
         if not (nombre and nombre.strip()) or not (monto and str(monto).strip()):
             toast("Nombre y Monto obligatorios")
@@ -927,38 +1605,42 @@ class SaviApp(MDApp):
         cant_int = 1
         if cantidad and cantidad.isdigit():
             cant_int = int(cantidad)
-            if cant_int > 10: cant_int = 10
+            if cant_int > MAX_CUPOS: cant_int = MAX_CUPOS
             if cant_int < 1: cant_int = 1
         
+        simbolo = "S/" if self.moneda_seleccionada == "Soles" else "$"
+        monto_final = f"{simbolo} {monto}"
+
+        junta = {
+            'id': nuevo_id(),
+            'nombre': nombre,
+            'monto': monto_final,
+            'moneda': self.moneda_seleccionada,
+            'periodo': periodo,
+            'fecha_inicio': inicio if inicio != "Fecha Inicio" else "Pendiente",
+            'fecha_final': final if final != "Fecha Fin" else "Pendiente",
+            'creada': time.time(),
+            'cupos': [],
+        }
+        self.juntas[junta['id']] = junta
+        self.db.guardar_junta(junta)
+
         manager = self.get_manager()
         
         # 1. Configurar Pantallas
         info_screen = manager.get_screen('info_junta')
         pagos_screen = manager.get_screen('integrantes_pagos')
         
-        info_screen.periodo = periodo
-        info_screen.fecha_inicio = inicio if inicio != "Fecha Inicio" else "Pendiente"
-        info_screen.fecha_final = final if final != "Fecha Fin" else "Pendiente"
+        self.abrir_junta(junta)
         info_screen.num_personas = str(cant_int)
         
-        # Inicializar cupos reales
+        # Inicializar cupos reales (organizador + cupos libres)
+        pagos_screen.inicializar_datos_default(0)
         pagos_screen.redimensionar_cupos(cant_int)
 
         # 2. UI Updates en Home
         home_screen = manager.get_screen('home')
-        contenedor = home_screen.ids.lista_juntas
-        mensaje_guia = home_screen.ids.mensaje_vacio
-        mensaje_guia.opacity = 0
-        mensaje_guia.height = 0
-
-        simbolo = "S/" if self.moneda_seleccionada == "Soles" else "$"
-        monto_final = f"{simbolo} {monto}"
-        
-        nueva_tarjeta = TarjetaListaJunta(
-            nombre=nombre,
-            monto=monto_final
-        )
-        contenedor.add_widget(nueva_tarjeta)
+        self.agregar_tarjeta_junta(junta)
 
         # Marcar que el dispositivo actual es el creador de la junta
         try:
@@ -973,8 +1655,302 @@ class SaviApp(MDApp):
         
         home_screen.ids.nav_bottom.switch_tab('tab_mis_juntas')
 
-    def ver_detalles_junta(self, nombre, monto):
+    def agregar_tarjeta_junta(self, junta):
+        """Indexa la junta e inserta su fila en 'Mis juntas' en su lugar, sin rehacer la lista."""
+        self.indice_juntas.agregar(junta)
+        manager = self.get_manager()
+        if not manager.has_screen('home'):
+            return
+        home_screen = manager.get_screen('home')
+        self._mensaje_sin_juntas(home_screen)
+        if not self.indice_juntas.coincide(junta['id'], self.filtro_juntas):
+            return
+        rv = home_screen.ids.lista_juntas
+        criterio, descendente = self.orden_juntas
+        posicion = self.indice_juntas.posicion([fila['junta_id'] for fila in rv.data], junta['id'],
+                                              criterio, descendente)
+        rv.data.insert(posicion, self._fila_junta(junta['id']))
+
+    def _fila_junta(self, junta_id):
+        junta = self.juntas[junta_id]
+        return {'junta_id': junta_id, 'nombre': junta['nombre'], 'monto': junta['monto']}
+
+    def _mensaje_sin_juntas(self, home_screen):
+        mensaje_guia = home_screen.ids.mensaje_vacio
+        vacio = not self.juntas
+        mensaje_guia.opacity = 1 if vacio else 0
+        mensaje_guia.height = dp(300) if vacio else 0
+
+    def mostrar_juntas_guardadas(self):
+        """Vuelca en 'Mis juntas' las juntas que pasan el filtro, en el orden elegido.
+
+        Si la pantalla de inicio aún no se creó no hay nada que pintar: lo hace
+        `HomeScreen.al_registrar` cuando se construye.
+        """
         manager = self.get_manager()
+        if not manager.has_screen('home'):
+            return
+        home_screen = manager.get_screen('home')
+        self._mensaje_sin_juntas(home_screen)
+        criterio, descendente = self.orden_juntas
+        home_screen.ids.lista_juntas.data = [
+            self._fila_junta(junta_id)
+            for junta_id in self.indice_juntas.buscar(self.filtro_juntas, criterio, descendente)
+        ]
+
+    def filtrar_juntas(self, texto):
+        """Filtra 'Mis juntas' cuando se deja de escribir por `ESPERA_BUSQUEDA`."""
+        self.filtro_juntas = texto
+        self._trigger_juntas()
+
+    def abrir_menu_orden_juntas(self, caller):
+        """Menú para ordenar 'Mis juntas' por fecha, monto, periodo o nombre."""
+        items = [
+            {
+                "text": opcion,
+                "viewclass": "OneLineListItem",
+                "on_release": lambda x=opcion: self.set_orden_juntas(x),
+            } for opcion in self.ORDENES_JUNTAS
+        ]
+        from kivymd.uix.menu import MDDropdownMenu
+        self.menu_orden = MDDropdownMenu(caller=caller, items=items)
+        self.menu_orden.open()
+
+    def set_orden_juntas(self, opcion):
+        self.orden_juntas = self.ORDENES_JUNTAS[opcion]
+        self.menu_orden.dismiss()
+        self.mostrar_juntas_guardadas()
+
+    def junta_en_curso(self):
+        """Devuelve el dict de la junta abierta, o None."""
+        juntas = getattr(self, 'juntas', None)
+        junta_id = getattr(self, 'junta_actual', None)
+        if not juntas or not junta_id:
+            return None
+        return juntas.get(junta_id)
+
+    def abrir_junta(self, junta):
+        """Carga en las pantallas de detalle los datos de `junta`."""
+        self.junta_actual = junta['id']
+        manager = self.get_manager()
+        info_screen = manager.get_screen('info_junta')
+        info_screen.monto = junta['monto']
+        info_screen.periodo = junta['periodo']
+        info_screen.fecha_inicio = junta['fecha_inicio']
+        info_screen.fecha_final = junta['fecha_final']
+        info_screen.num_personas = str(len(junta['cupos']) or 1)
+
+        pagos_screen = manager.get_screen('integrantes_pagos')
+        pagos_screen.nombre_junta = junta['nombre']
+        if not isinstance(junta['cupos'], TablaCupos):
+            junta['cupos'] = TablaCupos.desde_dicts(junta['cupos'])
+            self.observar_cupos(junta['id'], junta['cupos'])
+        pagos_screen.lista_cupos = junta['cupos']
+        pagos_screen.renderizar_lista()
+        # La lista de solicitudes visible era de la junta anterior
+        if manager.has_screen('sorteo'):
+            rv = manager.get_screen('sorteo').ids.get('lista_solicitudes')
+            if rv is not None and rv.data:
+                rv.data = [self._fila_solicitud(req) for req in self.solicitudes_actuales()]
+        # Se muestra la réplica local y se piden las novedades en segundo plano
+        if self.sincronizador is not None:
+            self.sincronizador.pedir(junta['id'])
+
+    def observar_cupos(self, junta_id, cupos):
+        """Guarda y propaga los cambios de los cupos de `junta_id`, una vez por frame."""
+        entregar_por_frame(cupos)
+        cupos.observar(partial(self._cupos_cambiados, junta_id, cupos))
+
+    def _cupos_cambiados(self, junta_id, cupos, cambios):
+        if junta_id not in self.juntas:
+            return
+        # Lo que vino del servidor ya está en la base
+        if not cambios.remoto:
+            # Un recorte viaja como un solo registro; el resto, solo lo que cambió
+            if cambios.recortada:
+                self.db.recortar_cupos(junta_id, len(cupos))
+            self.db.guardar_cupos(junta_id, cupos, sorted(cambios.indices))
+            self.avisar_cambios()
+        cronograma = self.cronogramas.get(junta_id)
+        if cronograma is not None:
+            cronograma.marcar(*cambios.indices)
+        libro = self.libros_pagos.get(junta_id)
+        if libro is not None:
+            # Un cupo que quedó libre pierde sus pagos; en la base lo hacen los
+            # triggers `liberar_cupo_*` y los totales por periodo se releen
+            libres = [i for i in cambios.indices if not cupos[i].ocupado]
+            if cambios.recortada:
+                libres += [i for i in libro.pagado if i >= len(cupos)]
+            if libro.vaciar(libres):
+                self.db.recaudado(junta_id, mainthread(libro.cargar_recaudado))
+        if cambios.completo and junta_id == self.junta_actual:
+            manager = self.get_manager()
+            if manager.has_screen('info_junta'):
+                manager.get_screen('info_junta').num_personas = str(len(cupos) or 1)
+
+    # --- SINCRONIZACIÓN ---
+    def avisar_cambios(self):
+        """Programa el envío de las ediciones locales al servidor."""
+        if self.sincronizador is not None:
+            self._trigger_sincronizar()
+
+    def _aplicar_remotos(self, junta_id, cambios):
+        """Refleja en memoria y en pantalla cambios del servidor (ya guardados en la base).
+
+        Los cambios a los cupos de una junta ya abierta se aplican en un lote
+        remoto: la pantalla los recibe en una sola entrega y no se vuelven a
+        guardar ni a enviar.
+        """
+        manager = self.get_manager()
+        junta = self.juntas.get(junta_id)
+        lista = solicitudes = False
+        tabla = junta['cupos'] if junta is not None else None
+        lote = tabla.lote(remoto=True) if isinstance(tabla, TablaCupos) else contextlib.nullcontext()
+        with lote:
+            # Los datos de la junta primero: los cupos de una junta nueva la necesitan
+            for cambio in sorted(cambios, key=lambda c: c['entidad'] != 'junta'):
+                entidad, clave, datos = cambio['entidad'], cambio['clave'], cambio['datos']
+                if entidad == 'junta':
+                    if datos is None:
+                        self.juntas.pop(junta_id, None)
+                        self.indice_juntas.quitar(junta_id)
+                        self.cronogramas.pop(junta_id, None)
+                        self.libros_pagos.pop(junta_id, None)
+                        junta = None
+                    else:
+                        if junta is None:
+                            junta = self.juntas[junta_id] = {'id': junta_id, 'cupos': []}
+                        junta.update(datos)
+                        self.indice_juntas.agregar(junta)
+                    lista = True
+                elif entidad == 'solicitud':
+                    if datos is None:
+                        req = self.pending_swap_requests.quitar(clave)
+                        if req is not None and manager.has_screen('sorteo'):
+                            self.quitar_fila_solicitud(req)
+                    else:
+                        solicitudes = self.pending_swap_requests.agregar(
+                            {'id': clave, 'junta_id': junta_id, 'from': datos['from'], 'to': datos['to']}) or solicitudes
+                elif junta is None:
+                    continue
+                elif entidad == 'recorte':
+                    cupos = junta['cupos']
+                    if isinstance(cupos, TablaCupos):
+                        cupos.redimensionar(datos['cantidad'])
+                    else:
+                        del cupos[datos['cantidad']:]
+                elif entidad == 'cupo':
+                    i = int(clave)
+                    cupos = junta['cupos']
+                    if isinstance(cupos, TablaCupos):
+                        if i >= len(cupos):
+                            cupos.redimensionar(i + 1)
+                        cupos.actualizar(i, **datos)
+                    else:
+                        cupos.extend(Cupo().a_dict() for _ in range(i + 1 - len(cupos)))
+                        cupos[i] = dict(datos)
+
+        if junta_id == self.junta_actual:
+            if junta is None:
+                self.junta_actual = None
+            else:
+                if manager.has_screen('info_junta'):
+                    info_screen = manager.get_screen('info_junta')
+                    info_screen.monto = junta['monto']
+                    info_screen.periodo = junta['periodo']
+                    info_screen.fecha_inicio = junta['fecha_inicio']
+                    info_screen.fecha_final = junta['fecha_final']
+                if manager.has_screen('integrantes_pagos'):
+                    manager.get_screen('integrantes_pagos').nombre_junta = junta['nombre']
+        if lista:
+            self.mostrar_juntas_guardadas()
+        if solicitudes and junta_id == self.junta_actual and manager.has_screen('sorteo'):
+            self.mostrar_solicitudes_sorteo()
+
+    def libro_pagos(self, junta_id):
+        """`LibroPagos` de la junta: los saldos se leen una vez (el historial, con `db.pagos_cupo`)."""
+        libro = self.libros_pagos.get(junta_id)
+        if libro is None:
+            libro = self.libros_pagos[junta_id] = LibroPagos(junta_id)
+            libro.cargar_saldos(*self.db.saldos_pagos(junta_id))
+        return libro
+
+    def cronograma_actual(self):
+        """Cronograma de la junta abierta, puesto al día con sus datos y cupos.
+
+        Devuelve `(cronograma, filas)`: `filas` son los periodos que cambiaron
+        desde la última consulta, o None si cambió todo (junta nueva, fechas,
+        cuota o cantidad de integrantes). Sin junta abierta devuelve `(None, None)`.
+        """
+        junta = self.junta_en_curso()
+        if junta is None:
+            return None, None
+        from cronograma import Cronograma  # NumPy solo se carga al ver un cronograma
+
+        cupos = junta['cupos']
+        cuota = monto_numerico(junta['monto'])
+        cronograma = self.cronogramas.get(junta['id'])
+        if cronograma is None:
+            cronograma = Cronograma(junta['fecha_inicio'], junta['periodo'], cuota, cupos)
+            self.cronogramas[junta['id']] = cronograma
+            return cronograma, None
+
+        todo = cronograma.cambiar_fechas(junta['fecha_inicio'], junta['periodo'])
+        if cuota != cronograma.cuota:
+            cronograma.cuota = cuota
+            todo = True
+        # El pozo depende de la cantidad de integrantes
+        todo = todo or len(cupos) != len(cronograma)
+        filas = cronograma.sincronizar(cupos)
+        return cronograma, None if todo else filas
+
+    def actualizar_junta(self, **campos):
+        """Modifica campos de la junta abierta y los guarda."""
+        junta = self.junta_en_curso()
+        if junta is None:
+            return
+        junta.update(campos)
+        self.db.guardar_junta(junta)
+        self.avisar_cambios()
+
+    def codigo_invitacion(self, junta, al_obtener):
+        """Obtiene el código de invitación de la junta y se lo pasa a `al_obtener` en el hilo principal.
+
+        Con servidor el código lo asigna el servidor, único entre todos los
+        dispositivos; sin servidor sale del índice local de este dispositivo.
+        Se guarda la primera vez.
+        """
+        codigo = junta.get('codigo')
+        # Un código local no lo conoce el servidor: con servidor se pide uno
+        if codigo and (self.sincronizador is None or codigo in self.codigos_ajenos):
+            al_obtener(codigo)
+            return
+        if self.sincronizador is None:
+            codigo = junta['codigo'] = self.codigos.asignar(junta['id'])
+            self.db.guardar_invitacion(codigo, junta['id'])
+            al_obtener(codigo)
+            return
+
+        def recibir(codigo, error):
+            if not codigo:
+                toast("Sin conexión: no se pudo generar el código de invitación")
+                return
+            junta['codigo'] = codigo
+            self.codigos_ajenos[codigo] = junta['id']
+            self.db.guardar_invitacion(codigo, junta['id'])
+            al_obtener(codigo)
+
+        self.sincronizador.pedir_codigo(junta['id'], mainthread(recibir))
+
+    def buscar_codigo(self, codigo):
+        """Id de la junta de un código de invitación conocido en este dispositivo, o None."""
+        return self.codigos.buscar(codigo) or self.codigos_ajenos.get(codigo)
+
+    def ver_detalles_junta(self, nombre, monto, junta_id=''):
+        manager = self.get_manager()
+        junta = self.juntas.get(junta_id)
+        if junta is not None and junta_id != self.junta_actual:
+            self.abrir_junta(junta)
         detalles = manager.get_screen('detalles_junta')
         detalles.nombre_junta = nombre
         detalles.monto_junta = monto
@@ -985,42 +1961,56 @@ class SaviApp(MDApp):
             toast("Ingresa un código válido")
             return
 
-        # Validación local: formato SAVI-0000 o URL que contenga SAVI-0000
-        pattern = re.compile(r"SAVI-\d{4}")
-        m = pattern.search(codigo)
-        if not m:
-            toast("Código inválido. Formato esperado: SAVI-1234")
+        # Código suelto o dentro del enlace; formato y dígito de control se
+        # validan sin tocar el índice
+        codigo_valido = normalizar_codigo(codigo)
+        if codigo_valido is None:
+            toast("Código inválido. Formato esperado: SAVI-XXXX-XXXX")
             return
 
-        codigo_valido = m.group(0)
+        junta = self.juntas.get(self.buscar_codigo(codigo_valido))
+        if junta is not None:
+            self.previsualizar_union(junta)
+        elif self.sincronizador is not None:
+            # Junta de otro dispositivo: se pide al servidor y se empieza a seguir
+            toast("Buscando la junta...")
+            self.sincronizador.unirse(codigo_valido, mainthread(
+                lambda junta_id, error: self._junta_de_codigo(codigo_valido, junta_id, error)))
+        else:
+            toast("No se encontró una junta con ese código")
 
-        # Preparar previsualización con datos locales (mock si no hay servidor)
+    def _junta_de_codigo(self, codigo, junta_id, error):
+        """Resultado de buscar un código en el servidor (la junta ya llegó por `_aplicar_remotos`)."""
+        junta = self.juntas.get(junta_id)
+        if junta is None:
+            toast("Sin conexión con el servidor" if error is not None else "No se encontró una junta con ese código")
+            return
+        if junta.get('codigo') != codigo:
+            junta['codigo'] = codigo
+            self.codigos_ajenos[codigo] = junta_id
+            self.db.guardar_invitacion(codigo, junta_id)
+        self.previsualizar_union(junta)
+
+    def previsualizar_union(self, junta):
+        """Vista previa de `junta` con la opción de unirse."""
         try:
             manager = self.get_manager()
             pagos_screen = manager.get_screen('integrantes_pagos')
-            # determinar cupos disponibles si es posible
-            capacidad = len(pagos_screen.lista_cupos) if pagos_screen.lista_cupos else None
-            ocupados = sum(1 for c in pagos_screen.lista_cupos if c.get('ocupado')) if pagos_screen.lista_cupos else 0
-
-            nombre = f"Junta {codigo_valido}"
-            monto = "S/ 100.00"
-            organizador = "Organizador Ejemplo"
-            periodo = "Mensual"
-            cupos_text = f"{ocupados}/{capacidad}" if capacidad is not None else "Desconocido"
-
-            from kivymd.uix.dialog import MDDialog
-            from kivymd.uix.button import MDFlatButton, MDFillRoundFlatButton
-            from kivymd.uix.label import MDLabel
-
-            contenido = MDBoxLayout(orientation='vertical', spacing='8dp', adaptive_height=True)
-            contenido.add_widget(MDLabel(text=f"Nombre: {nombre}", theme_text_color='Primary'))
-            contenido.add_widget(MDLabel(text=f"Monto: {monto}", theme_text_color='Primary'))
-            contenido.add_widget(MDLabel(text=f"Organizador: {organizador}", theme_text_color='Primary'))
-            contenido.add_widget(MDLabel(text=f"Periodo: {periodo}", theme_text_color='Primary'))
-            contenido.add_widget(MDLabel(text=f"Cupos: {cupos_text}", theme_text_color='Secondary'))
-
-            def solicitar_unirse(obj):
+            cupos = junta['cupos']
+            capacidad = len(cupos)
+            ocupados = cupos.ocupados if isinstance(cupos, TablaCupos) else sum(1 for c in cupos if c.get('ocupado'))
+
+            nombre = junta['nombre']
+            monto = junta['monto']
+            organizador = cupos[0].get('nombre') if capacidad else "Sin organizador"
+            periodo = junta['periodo']
+            cupos_text = f"{ocupados}/{capacidad}"
+
+            dialogo = self.dialogos.obtener('confirmar_union')
+
+            def solicitar_unirse():
                 try:
+                    self.abrir_junta(junta)
                     if not pagos_screen.lista_cupos:
                         pagos_screen.inicializar_datos_default(0)
 
@@ -1028,21 +2018,21 @@ class SaviApp(MDApp):
                         pagos_screen.mostrar_dialogo_edicion(-1, es_registro_qr=True)
 
                     Clock.schedule_once(lanzar_formulario, 0.2)
-                    dialog.dismiss()
+                    dialogo.cerrar()
                 except Exception as e:
                     print('Error al solicitar unirse:', e)
                     toast('Error al solicitar unirse')
 
-            dialog = MDDialog(
-                title='Confirmar unión',
-                type='custom',
-                content_cls=contenido,
-                buttons=[
-                    MDFlatButton(text='CANCELAR', on_release=lambda x: dialog.dismiss()),
-                    MDFillRoundFlatButton(text='SOLICITAR UNIRSE', on_release=solicitar_unirse),
-                ]
+            dialogo.abrir(
+                textos={
+                    'nombre': f"Nombre: {nombre}",
+                    'monto': f"Monto: {monto}",
+                    'organizador': f"Organizador: {organizador}",
+                    'periodo': f"Periodo: {periodo}",
+                    'cupos': f"Cupos: {cupos_text}",
+                },
+                acciones={'unirse': solicitar_unirse},
             )
-            dialog.open()
 
         except Exception as e:
             print(f"Error: {e}")
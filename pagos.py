@@ -0,0 +1,122 @@
+"""Libro de pagos de una junta: movimientos de solo agregado y saldos al día.
+
+Cada pago es un movimiento (cupo, periodo, monto, fecha) que nunca se
+modifica; una corrección es otro movimiento. Solo se borran los de un cupo
+que queda libre, para que quien lo ocupe después empiece de cero. En la
+base van a la tabla `pagos` y un trigger los suma, en la misma sentencia, a
+los saldos por cupo (`saldos_cupo`) y por periodo (`saldos_periodo`). Abrir una
+junta solo lee esos saldos, una fila por integrante y por periodo, aunque
+el libro tenga años de movimientos; registrar un pago los actualiza en O(1).
+
+`LibroPagos` solo guarda esos saldos; el historial de un integrante se
+pide a la base (`BaseDatos.pagos_cupo`), que lo busca por (junta, cupo). Los
+movimientos no se copian a memoria: la tabla con su índice ya es el
+almacén, y copiarlos duplicaría el libro entero para leer un solo cupo.
+
+El estado de cada integrante compara lo pagado con lo que ya debía pagar:
+la cuota por cada periodo vencido hasta hoy. `DIAS_PERIODO` y
+`parsear_fecha` también los usa `cronograma.py`, que calcula las mismas
+fechas con NumPy; viven aquí para que abrir una junta no cargue NumPy.
+"""
+import calendar
+import datetime
+import time
+
+DIAS_PERIODO = {'Semanal': 7, 'Quincenal': 15}
+
+# Diferencias menores se consideran redondeo, no deuda
+TOLERANCIA = 0.005
+
+
+def parsear_fecha(texto):
+    """'dd/mm/aaaa' -> date, o None si el texto no es una fecha."""
+    try:
+        dia, mes, anio = (int(p) for p in texto.strip().split('/'))
+        return datetime.date(anio, mes, dia)
+    except (AttributeError, ValueError):
+        return None
+
+
+def periodos_vencidos(fecha_inicio, periodo, cantidad, hoy=None):
+    """Cuántos de los `cantidad` periodos tienen fecha de pago en o antes de `hoy`.
+
+    Usa las mismas fechas que `cronograma.fechas_periodos`, sin NumPy.
+    """
+    inicio = parsear_fecha(fecha_inicio)
+    hoy = hoy or datetime.date.today()
+    if inicio is None or hoy < inicio:
+        return 0
+    if periodo in DIAS_PERIODO:
+        ultimo = (hoy - inicio).days // DIAS_PERIODO[periodo]
+    else:
+        # Mensual: el mismo día de cada mes, recortado en los meses más cortos
+        ultimo = (hoy.year - inicio.year) * 12 + hoy.month - inicio.month
+        dias_mes = calendar.monthrange(hoy.year, hoy.month)[1]
+        if min(inicio.day, dias_mes) > hoy.day:
+            ultimo -= 1
+    return max(0, min(cantidad, ultimo + 1))
+
+
+class LibroPagos:
+    """Pagos de una junta: saldos por cupo y por periodo."""
+
+    def __init__(self, junta_id):
+        self.junta_id = junta_id
+        self.pagado = {}       # posición del cupo -> total pagado
+        self.recaudado = {}    # periodo -> total cobrado
+        self._pagos = {}       # posición del cupo -> cantidad de movimientos
+
+    def __len__(self):
+        """Cantidad de movimientos del libro."""
+        return sum(self._pagos.values())
+
+    def cargar_saldos(self, saldos_cupo, saldos_periodo):
+        """Filas (cupo, pagado, pagos) y (periodo, recaudado) de la base."""
+        for cupo, pagado, pagos in saldos_cupo:
+            self.pagado[cupo] = pagado
+            self._pagos[cupo] = pagos
+        self.cargar_recaudado(saldos_periodo)
+
+    def cargar_recaudado(self, saldos_periodo):
+        """Reemplaza los totales por periodo con filas (periodo, recaudado)."""
+        self.recaudado = dict(saldos_periodo or ())
+
+    def registrar(self, cupo, periodo, monto, creado=None):
+        """Agrega un movimiento y lo suma a los saldos. Devuelve la fila a guardar."""
+        creado = time.time() if creado is None else creado
+        self.pagado[cupo] = self.pagado.get(cupo, 0.0) + monto
+        self.recaudado[periodo] = self.recaudado.get(periodo, 0.0) + monto
+        self._pagos[cupo] = self._pagos.get(cupo, 0) + 1
+        return cupo, periodo, monto, creado
+
+    def vaciar(self, cupos):
+        """Olvida los pagos de los cupos que quedaron libres, como los triggers `liberar_cupo_*`.
+
+        Los totales por periodo no se pueden descontar desde aquí: hay que
+        recargarlos (`BaseDatos.recaudado`). Devuelve True si algún cupo tenía pagos.
+        """
+        vaciados = False
+        for cupo in cupos:
+            vaciados = self.pagado.pop(cupo, None) is not None or vaciados
+            self._pagos.pop(cupo, None)
+        return vaciados
+
+    # --- Estado ---
+    def siguiente_periodo(self, cupo, cuota):
+        """Primer periodo que el cupo aún no cubre con lo pagado."""
+        if cuota <= 0:
+            return 0
+        return int((self.pagado.get(cupo, 0.0) + TOLERANCIA) // cuota)
+
+    def deuda(self, cupo, cuota, vencidos):
+        """Lo que el cupo debe hoy (negativo si pagó por adelantado)."""
+        return cuota * vencidos - self.pagado.get(cupo, 0.0)
+
+    def estado(self, cupo, cuota, vencidos):
+        """(texto, atrasado) para la tarjeta del integrante."""
+        deuda = self.deuda(cupo, cuota, vencidos)
+        if deuda > TOLERANCIA:
+            return f"Debe {deuda:,.2f}", True
+        if vencidos or cupo in self.pagado:
+            return "Al día", False
+        return "", False
@@ -0,0 +1,253 @@
+"""Importar y exportar los integrantes de una junta en CSV o JSON Lines.
+
+Pensado para organizadores que vienen de una hoja de cálculo. Las filas se
+leen de a una (nunca el archivo entero) y se validan en lotes de
+`TAMANO_LOTE`: nombre obligatorio, DNI de 8 dígitos, celular de 9 y correo
+con forma de correo. Un DNI repetido, en el archivo o en la junta, también
+se rechaza. Cada lote válido se aplica a la `TablaCupos` con
+`aplicar_lote` y se guarda con una sola escritura en bloque, así que la
+memoria no crece con el tamaño del archivo (salvo los cupos en sí y el
+conjunto de DNIs) y no se crea ningún widget por fila.
+
+Exportar toma primero las filas de los cupos ocupados (`filas_exportar`,
+en el hilo que es dueño de la tabla) y luego las escribe (`escribir`), lo
+que puede hacerse en otro hilo.
+El número de turno se exporta, pero al importar cada integrante recibe el
+siguiente número libre, como al unirse.
+
+Los encabezados de un CSV se reconocen sin tildes ni mayúsculas y con
+sinónimos comunes ('Celular', 'Teléfono', 'Email', 'Nombre completo'...).
+"""
+import csv
+import json
+import os
+import re
+
+from juntas import normalizar
+
+TAMANO_LOTE = 1000
+
+# Campos que se importan/exportan, en el orden de las columnas del CSV
+CAMPOS = ('numero', 'nombre', 'dni', 'telefono', 'correo')
+
+SINONIMOS = {
+    'numero': 'numero', 'n': 'numero', 'turno': 'numero',
+    'nombre': 'nombre', 'nombres': 'nombre', 'nombre completo': 'nombre', 'integrante': 'nombre',
+    'dni': 'dni', 'documento': 'dni',
+    'telefono': 'telefono', 'celular': 'telefono', 'movil': 'telefono', 'whatsapp': 'telefono',
+    'correo': 'correo', 'email': 'correo', 'e-mail': 'correo', 'correo electronico': 'correo',
+}
+
+_DNI = re.compile(r'\d{8}')
+_TELEFONO = re.compile(r'\d{9}')
+_CORREO = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+
+# Ejemplos de rechazo que se guardan en el resumen (el resto solo se cuenta)
+MAX_EJEMPLOS = 20
+
+EXTENSIONES_JSONL = ('.jsonl', '.ndjson')
+
+
+def es_jsonl(ruta):
+    return os.path.splitext(ruta)[1].lower() in EXTENSIONES_JSONL
+
+
+def _columna(encabezado):
+    return SINONIMOS.get(normalizar((encabezado or '').strip()).replace('_', ' '))
+
+
+def leer_filas(archivo, jsonl=False):
+    """Genera dicts {campo: texto} de un archivo abierto en modo texto."""
+    if jsonl:
+        for linea in archivo:
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                objeto = json.loads(linea)
+            except ValueError:
+                yield None  # línea ilegible: se cuenta como rechazada
+                continue
+            if not isinstance(objeto, dict):
+                yield None
+                continue
+            fila = {}
+            for clave, valor in objeto.items():
+                campo = _columna(clave)
+                if campo is not None and valor is not None:
+                    fila[campo] = str(valor)
+            yield fila
+        return
+
+    muestra = archivo.read(4096)
+    archivo.seek(0)
+    try:
+        dialecto = csv.Sniffer().sniff(muestra, delimiters=',;\t')
+    except csv.Error:
+        dialecto = csv.excel
+    lector = csv.reader(archivo, dialecto)
+    encabezados = next(lector, None)
+    if encabezados is None:
+        return
+    columnas = [(i, _columna(e)) for i, e in enumerate(encabezados)]
+    columnas = [(i, campo) for i, campo in columnas if campo is not None]
+    for valores in lector:
+        if not any(valores):
+            continue
+        yield {campo: valores[i] for i, campo in columnas if i < len(valores)}
+
+
+def _limpiar_digitos(texto):
+    # Las hojas de cálculo suelen dejar espacios, guiones o un '.0' al final
+    texto = (texto or '').strip()
+    if texto.endswith('.0'):
+        texto = texto[:-2]
+    return re.sub(r'[\s\-]', '', texto)
+
+
+def validar_lote(filas, dnis):
+    """Separa un lote en (validos, rechazados).
+
+    `dnis` es el conjunto de DNIs ya presentes (junta y filas anteriores) y
+    se actualiza con los aceptados. Cada rechazado es (fila, motivo).
+    """
+    validos, rechazados = [], []
+    for fila in filas:
+        if fila is None:
+            rechazados.append((None, 'fila_ilegible'))
+            continue
+        nombre = ' '.join((fila.get('nombre') or '').split())
+        dni = _limpiar_digitos(fila.get('dni'))
+        telefono = _limpiar_digitos(fila.get('telefono'))
+        if telefono.startswith('+51'):
+            telefono = telefono[3:]
+        correo = (fila.get('correo') or '').strip()
+        if not nombre:
+            motivo = 'nombre_vacio'
+        elif dni and not _DNI.fullmatch(dni):
+            motivo = 'dni_invalido'
+        elif dni and dni in dnis:
+            motivo = 'dni_repetido'
+        elif telefono and not _TELEFONO.fullmatch(telefono):
+            motivo = 'telefono_invalido'
+        elif correo and not _CORREO.fullmatch(correo):
+            motivo = 'correo_invalido'
+        else:
+            if dni:
+                dnis.add(dni)
+            validos.append({'nombre': nombre, 'dni': dni, 'telefono': telefono, 'correo': correo})
+            continue
+        rechazados.append((fila, motivo))
+    return validos, rechazados
+
+
+def leer_lotes(ruta, dnis=(), tamano=TAMANO_LOTE):
+    """Genera (validos, rechazados) del archivo en lotes de `tamano` filas."""
+    dnis = set(dnis)
+    # utf-8-sig: Excel suele guardar los CSV con BOM
+    with open(ruta, newline='', encoding='utf-8-sig', errors='replace') as archivo:
+        lote = []
+        for fila in leer_filas(archivo, es_jsonl(ruta)):
+            lote.append(fila)
+            if len(lote) >= tamano:
+                yield validar_lote(lote, dnis)
+                lote = []
+        if lote:
+            yield validar_lote(lote, dnis)
+
+
+class Resumen:
+    """Cuenta de filas importadas y rechazadas (con algunos ejemplos)."""
+
+    def __init__(self):
+        self.importados = 0
+        self.rechazados = 0
+        self.motivos = {}
+        self.ejemplos = []
+
+    def sumar(self, importados, rechazados):
+        self.importados += importados
+        for fila, motivo in rechazados:
+            self.rechazados += 1
+            self.motivos[motivo] = self.motivos.get(motivo, 0) + 1
+            if len(self.ejemplos) < MAX_EJEMPLOS:
+                self.ejemplos.append((fila, motivo))
+
+    def texto(self):
+        texto = f"{self.importados} integrantes importados"
+        if self.rechazados:
+            detalle = ', '.join(f"{n} {m.replace('_', ' ')}" for m, n in sorted(self.motivos.items()))
+            texto += f", {self.rechazados} rechazados ({detalle})"
+        return texto
+
+
+def aplicar_lote(cupos, validos, limite=None):
+    """Ocupa cupos vacíos (agregando los que falten hasta `limite`) con las filas válidas.
+
+    Devuelve (posiciones modificadas, filas que no entraron). Las posiciones
+    incluyen los cupos agregados que quedaron vacíos, que también hay que guardar.
+    """
+    antes = len(cupos)
+    faltan = len(validos) - (antes - cupos.ocupados)
+    if faltan > 0:
+        nuevo = antes + faltan
+        cupos.redimensionar(nuevo if limite is None else max(antes, min(limite, nuevo)))
+    posiciones = set(range(antes, len(cupos)))
+    sobrantes = []
+    for i, datos in enumerate(validos):
+        indice = cupos.ocupar_siguiente(usuario='Miembro Importado', **datos)
+        if indice is None:
+            sobrantes = validos[i:]
+            break
+        posiciones.add(indice)
+    return sorted(posiciones), sobrantes
+
+
+def importar(ruta, cupos, guardar=None, limite=None, tamano=TAMANO_LOTE):
+    """Importa `ruta` en `cupos` de forma síncrona y devuelve el `Resumen`.
+
+    `guardar(posiciones)` se llama por cada lote aplicado (p. ej. para
+    encolar la escritura en la base).
+    """
+    resumen = Resumen()
+    dnis = {c.dni for c in cupos if c.ocupado and c.dni}
+    for validos, rechazados in leer_lotes(ruta, dnis, tamano):
+        posiciones, sobrantes = aplicar_lote(cupos, validos, limite)
+        if posiciones and guardar is not None:
+            guardar(posiciones)
+        resumen.sumar(len(validos) - len(sobrantes), rechazados + [(fila, 'junta_llena') for fila in sobrantes])
+    return resumen
+
+
+def filas_exportar(cupos):
+    """Valores de `CAMPOS` de cada cupo ocupado, copiados para escribirlos en otro hilo."""
+    return [tuple(cupo.get(campo) for campo in CAMPOS) for cupo in cupos if cupo.ocupado]
+
+
+def escribir(filas, ruta, al_avanzar=None, tamano=TAMANO_LOTE):
+    """Escribe `filas` (de `filas_exportar`) en `ruta`, CSV o JSON Lines según la extensión.
+
+    `al_avanzar(escritas)` se llama cada `tamano` filas. Devuelve la
+    cantidad de filas escritas.
+    """
+    escritas = 0
+    with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+        if es_jsonl(ruta):
+            def escribir_fila(fila):
+                archivo.write(json.dumps(dict(zip(CAMPOS, fila)), ensure_ascii=False))
+                archivo.write('\n')
+        else:
+            escritor = csv.writer(archivo)
+            escritor.writerow(CAMPOS)
+            escribir_fila = escritor.writerow
+        for fila in filas:
+            escribir_fila(fila)
+            escritas += 1
+            if al_avanzar is not None and escritas % tamano == 0:
+                al_avanzar(escritas)
+    return escritas
+
+
+def exportar(cupos, ruta):
+    """Escribe los cupos ocupados en `ruta` de forma síncrona; devuelve las filas escritas."""
+    return escribir(filas_exportar(cupos), ruta)
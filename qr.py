@@ -0,0 +1,170 @@
+"""Códigos QR de invitación como texturas de Kivy.
+
+La matriz de módulos que calcula `qrcode` se convierte directamente en un
+buffer de luminancia de 8 bits y se sube a una `Texture`, sin pasar por PIL
+ni por una codificación/decodificación PNG. Las texturas generadas se
+guardan en una caché LRU indexada por contenido y parámetros de dibujo.
+
+`CacheTexturasQR.obtener_async` calcula el buffer en un hilo de fondo y
+entrega la textura en el hilo principal a través de `Clock`; el trabajo
+devuelto puede cancelarse si la pantalla deja de necesitarlo. Si el cálculo
+falla (falta `qrcode`, o el contenido no cabe en un QR) el error también se
+entrega en el hilo principal, para que la pantalla deje de esperar.
+"""
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from kivy.clock import Clock
+from kivy.graphics.texture import Texture
+
+NEGRO = b'\x00'
+BLANCO = b'\xff'
+
+# Patrón de máscara fijo: cualquier máscara es válida para los lectores y
+# así se evita probar las ocho.
+MASCARA = 0
+
+logger = logging.getLogger(__name__)
+
+
+def matriz_qr(contenido, borde=2, mascara=MASCARA):
+    """Matriz de módulos (lista de filas de bool, con borde) para `contenido`.
+
+    Con `mascara=None` qrcode evalúa los 8 patrones de máscara y elige el de
+    menor penalización, lo que multiplica por cuatro el tiempo de cálculo.
+    """
+    import qrcode  # Solo se carga al generar el primer código
+
+    qr = qrcode.QRCode(version=1, box_size=1, border=borde, mask_pattern=mascara)
+    qr.add_data(contenido)
+    qr.make(fit=True)
+    return qr.get_matrix()
+
+
+def buffer_luminancia(matriz, tamano_modulo=10):
+    """Convierte la matriz en píxeles de luminancia (1 byte por píxel).
+
+    Devuelve `(buffer, lado)`. Las filas van de abajo hacia arriba, que es el
+    origen de coordenadas de las texturas de Kivy.
+    """
+    negro = NEGRO * tamano_modulo
+    blanco = BLANCO * tamano_modulo
+    filas = []
+    for fila in reversed(matriz):
+        pixeles = b''.join(negro if modulo else blanco for modulo in fila)
+        filas.append(pixeles * tamano_modulo)
+    lado = len(matriz) * tamano_modulo
+    return b''.join(filas), lado
+
+
+def crear_textura(buffer, lado):
+    """Sube un buffer de luminancia cuadrado a una textura nueva."""
+    textura = Texture.create(size=(lado, lado), colorfmt='luminance')
+    # Escalado sin suavizado para que los módulos se mantengan nítidos
+    textura.mag_filter = 'nearest'
+    textura.min_filter = 'nearest'
+    textura.blit_buffer(buffer, colorfmt='luminance', bufferfmt='ubyte')
+    return textura
+
+
+class TrabajoQR:
+    """Generación en curso; `cancelar()` evita que se entregue el resultado."""
+
+    def __init__(self, clave):
+        self.clave = clave
+        self.cancelado = False
+
+    def cancelar(self):
+        self.cancelado = True
+
+
+class CacheTexturasQR:
+    """Caché LRU de texturas QR indexada por contenido y parámetros de dibujo."""
+
+    def __init__(self, capacidad=16):
+        self.capacidad = capacidad
+        self._texturas = OrderedDict()
+        self._hilo = None
+
+    def __len__(self):
+        return len(self._texturas)
+
+    @staticmethod
+    def clave(contenido, tamano_modulo=10, borde=2, mascara=MASCARA):
+        return (contenido, tamano_modulo, borde, mascara)
+
+    def buscar(self, clave):
+        textura = self._texturas.get(clave)
+        if textura is not None:
+            self._texturas.move_to_end(clave)
+        return textura
+
+    def guardar(self, clave, textura):
+        self._texturas[clave] = textura
+        self._texturas.move_to_end(clave)
+        while len(self._texturas) > self.capacidad:
+            self._texturas.popitem(last=False)
+
+    def obtener(self, contenido, tamano_modulo=10, borde=2, mascara=MASCARA):
+        """Textura del QR para `contenido`; la genera solo si no está en caché."""
+        clave = self.clave(contenido, tamano_modulo, borde, mascara)
+        textura = self.buscar(clave)
+        if textura is None:
+            matriz = matriz_qr(contenido, borde, mascara)
+            buffer, lado = buffer_luminancia(matriz, tamano_modulo)
+            textura = crear_textura(buffer, lado)
+            self.guardar(clave, textura)
+        return textura
+
+    def obtener_async(self, contenido, al_terminar, tamano_modulo=10, borde=2, mascara=MASCARA, al_fallar=None):
+        """Como `obtener`, pero sin bloquear el hilo principal.
+
+        Si la textura está en caché se llama a `al_terminar(textura)` en el
+        acto y se devuelve None. Si no, se devuelve un `TrabajoQR`: la matriz
+        y el buffer se calculan en segundo plano y la textura se sube en el
+        siguiente frame, salvo que el trabajo se haya cancelado antes. Si el
+        cálculo falla se llama a `al_fallar(error)` en el hilo principal,
+        también salvo cancelación.
+        """
+        clave = self.clave(contenido, tamano_modulo, borde, mascara)
+        textura = self.buscar(clave)
+        if textura is not None:
+            al_terminar(textura)
+            return None
+
+        trabajo = TrabajoQR(clave)
+        if self._hilo is None:
+            self._hilo = ThreadPoolExecutor(max_workers=1, thread_name_prefix='savi-qr')
+
+        def calcular():
+            if trabajo.cancelado:
+                return
+            try:
+                matriz = matriz_qr(contenido, borde, mascara)
+                buffer, lado = buffer_luminancia(matriz, tamano_modulo)
+            except Exception as e:
+                logger.exception('No se pudo generar el QR')
+                Clock.schedule_once(partial(fallar, e))
+                return
+            Clock.schedule_once(lambda dt: entregar(buffer, lado))
+
+        def fallar(error, dt):
+            if not trabajo.cancelado and al_fallar is not None:
+                al_fallar(error)
+
+        def entregar(buffer, lado):
+            # La textura solo puede crearse en el hilo principal (contexto GL)
+            textura = self.buscar(clave)
+            if textura is None:
+                textura = crear_textura(buffer, lado)
+                self.guardar(clave, textura)
+            if not trabajo.cancelado:
+                al_terminar(textura)
+
+        self._hilo.submit(calcular)
+        return trabajo
+
+
+texturas_qr = CacheTexturasQR()
@@ -0,0 +1,76 @@
+"""Rutas de imágenes según la densidad de pantalla.
+
+`construir_assets.py` genera en `assets/generados/<densidad>/` versiones
+reducidas de las ilustraciones del carrusel (JPEG, sin canal alfa) y un
+atlas `iconos.atlas` con los logos e imágenes pequeñas ya escaladas a su
+tamaño en pantalla. Aquí se elige la variante más pequeña que cubre la
+densidad del dispositivo y, si no se generaron los assets, se devuelve la
+imagen original de `assets/`.
+"""
+import os
+
+from kivy.metrics import Metrics
+
+CARPETA = 'assets'
+CARPETA_GENERADOS = os.path.join(CARPETA, 'generados')
+
+# Sufijo de carpeta -> factor de densidad (px por dp)
+DENSIDADES = (('mdpi', 1.0), ('hdpi', 1.5), ('xhdpi', 2.0), ('xxhdpi', 3.0))
+
+ATLAS = 'iconos'
+
+_rutas = {}
+
+
+def _sin_extension(nombre):
+    return os.path.splitext(nombre)[0]
+
+
+def variantes(densidad=None):
+    """Carpetas de densidad en orden de preferencia para `densidad`.
+
+    Primero la menor que sea >= densidad, luego las mayores y al final las
+    menores (mejor reducir una imagen grande que estirar una chica).
+    """
+    densidad = densidad or Metrics.density
+    mayores = [s for s, d in DENSIDADES if d >= densidad]
+    menores = [s for s, d in reversed(DENSIDADES) if d < densidad]
+    return mayores + menores
+
+
+def imagen(nombre):
+    """Ruta de la ilustración `nombre` (p. ej. '1.png') para esta pantalla."""
+    ruta = _rutas.get(nombre)
+    if ruta is None:
+        ruta = os.path.join(CARPETA, nombre)
+        for sufijo in variantes():
+            candidata = os.path.join(CARPETA_GENERADOS, sufijo, _sin_extension(nombre) + '.jpg')
+            if os.path.exists(candidata):
+                ruta = candidata
+                break
+        _rutas[nombre] = ruta
+    return ruta
+
+
+def icono(nombre):
+    """Fuente de la imagen pequeña `nombre`: del atlas si existe, si no el PNG."""
+    clave = ('atlas', nombre)
+    ruta = _rutas.get(clave)
+    if ruta is None:
+        ruta = os.path.join(CARPETA, nombre)
+        for sufijo in variantes():
+            atlas = os.path.join(CARPETA_GENERADOS, sufijo, ATLAS)
+            if os.path.exists(atlas + '.atlas'):
+                ruta = f"atlas://{atlas}/{_sin_extension(nombre)}"
+                break
+        _rutas[clave] = ruta
+    return ruta
+
+
+def textura_relleno(color):
+    """Textura de 1×1 px de `color` (RGBA 0-1) para mostrar mientras carga una imagen."""
+    from kivy.graphics.texture import Texture
+
+    textura = Texture.create(size=(1, 1), colorfmt='rgba')
+    textura.blit_buffer(bytes(int(c * 255) for c in color), colorfmt='rgba', bufferfmt='ubyte')
+    return textura
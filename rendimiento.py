@@ -0,0 +1,184 @@
+"""Instrumentación de rendimiento: tiempos de frame, tramos y traza JSONL.
+
+Se activa con la variable de entorno `SAVI_PERF=1` (y `SAVI_PERF_OVERLAY=1`
+para ver FPS y latencia en pantalla). Desactivada, `medir` devuelve la
+función sin envolver y `tramo` un contexto vacío compartido, así que el
+costo es prácticamente nulo.
+
+Cada medición se guarda en un buffer circular (`deque` de tamaño fijo) como
+`(tipo, nombre, inicio, duracion_ms, datos)`; `volcar` lo escribe como JSONL,
+una línea por registro, para adjuntarlo a los reportes de teléfonos lentos.
+"""
+import json
+import os
+import time
+from collections import deque
+from functools import wraps
+
+ACTIVO = os.environ.get('SAVI_PERF', '') not in ('', '0')
+OVERLAY = ACTIVO and os.environ.get('SAVI_PERF_OVERLAY', '') not in ('', '0')
+
+# Registros que se conservan (los más antiguos se descartan)
+CAPACIDAD = 20000
+
+registros = deque(maxlen=CAPACIDAD)
+_reloj = time.perf_counter
+
+
+def registrar(tipo, nombre, inicio, duracion_ms, **datos):
+    registros.append((tipo, nombre, inicio, duracion_ms, datos or None))
+
+
+class _Tramo:
+    __slots__ = ('nombre', 'datos', 'inicio')
+
+    def __init__(self, nombre, datos):
+        self.nombre = nombre
+        self.datos = datos
+
+    def __enter__(self):
+        self.inicio = _reloj()
+        return self
+
+    def __exit__(self, *exc):
+        fin = _reloj()
+        registros.append(('tramo', self.nombre, self.inicio, (fin - self.inicio) * 1000, self.datos or None))
+        return False
+
+
+class _TramoNulo:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULO = _TramoNulo()
+
+
+def tramo(nombre, **datos):
+    """Contexto que mide el bloque `with` como un tramo llamado `nombre`."""
+    if not ACTIVO:
+        return _NULO
+    return _Tramo(nombre, datos)
+
+
+def medir(nombre=None):
+    """Decorador que registra cada llamada como un tramo.
+
+    Sin instrumentación activa devuelve la función original.
+    """
+    def decorar(funcion):
+        if not ACTIVO:
+            return funcion
+        etiqueta = nombre or funcion.__qualname__
+
+        @wraps(funcion)
+        def medida(*args, **kwargs):
+            inicio = _reloj()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                registros.append(('tramo', etiqueta, inicio, (_reloj() - inicio) * 1000, None))
+        return medida
+    return decorar
+
+
+# --- Frames y transiciones ---
+_ultimo_frame = None
+
+
+def _frame(dt):
+    global _ultimo_frame
+    ahora = _reloj()
+    if _ultimo_frame is not None:
+        registros.append(('frame', '', _ultimo_frame, (ahora - _ultimo_frame) * 1000, None))
+    _ultimo_frame = ahora
+
+
+def iniciar():
+    """Empieza a registrar la duración de cada frame (y muestra el overlay)."""
+    if not ACTIVO:
+        return
+    from kivy.clock import Clock
+
+    Clock.schedule_interval(_frame, 0)
+    if OVERLAY:
+        Clock.schedule_once(lambda dt: _crear_overlay())
+
+
+def observar_transiciones(manager):
+    """Registra cuánto tarda cada cambio de pantalla hasta terminar la transición."""
+    if not ACTIVO:
+        return
+    pendiente = {}
+
+    def al_cambiar(instancia, nombre):
+        pendiente['nombre'] = nombre
+        pendiente['inicio'] = _reloj()
+
+    def al_completar(*args):
+        if 'inicio' in pendiente:
+            inicio = pendiente.pop('inicio')
+            registrar('transicion', pendiente.pop('nombre'), inicio, (_reloj() - inicio) * 1000)
+
+    manager.bind(current=al_cambiar)
+    manager.bind(transition=lambda m, t: t.bind(on_complete=al_completar))
+    manager.transition.bind(on_complete=al_completar)
+
+
+# --- Consultas y volcado ---
+def tiempos_frame(ultimos=120):
+    """Duración (ms) de los últimos `ultimos` frames registrados."""
+    tiempos = []
+    for tipo, _, _, duracion, _ in reversed(registros):
+        if tipo == 'frame':
+            tiempos.append(duracion)
+            if len(tiempos) >= ultimos:
+                break
+    return tiempos
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def volcar(ruta):
+    """Escribe el buffer como JSONL en `ruta` y devuelve cuántos registros se escribieron."""
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    copia = list(registros)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        for tipo, nombre, inicio, duracion, datos in copia:
+            linea = {'tipo': tipo, 'nombre': nombre, 't': round(inicio, 6), 'ms': round(duracion, 3)}
+            if datos:
+                linea.update(datos)
+            archivo.write(json.dumps(linea, ensure_ascii=False) + '\n')
+    return len(copia)
+
+
+# --- Overlay ---
+def _crear_overlay():
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    from kivy.uix.label import Label
+
+    etiqueta = Label(size_hint=(None, None), size=(220, 40), font_size='12sp', halign='left',
+                     color=(0, 0.6, 0, 1), pos=(4, Window.height - 44))
+    Window.bind(height=lambda w, alto: setattr(etiqueta, 'y', alto - 44))
+
+    def actualizar(dt):
+        tiempos = tiempos_frame()
+        if tiempos:
+            media = sum(tiempos) / len(tiempos)
+            etiqueta.text = (f"{1000 / media if media else 0:.0f} FPS  "
+                             f"p95 {percentil(tiempos, 95):.1f} ms")
+    Window.add_widget(etiqueta, canvas='after')
+    Clock.schedule_interval(actualizar, 0.5)
@@ -0,0 +1,148 @@
+"""Registro de reportes por DNI con un puntaje de riesgo que decae con el tiempo.
+
+Los reclamos completos quedan en la tabla `reportes`; aquí solo se guarda,
+por DNI, un `Historial` con la cantidad de reportes, la fecha del último y
+un puntaje en el que cada reporte vale 1 al hacerse y pierde la mitad de su
+peso cada `VIDA_MEDIA_DIAS`. El puntaje se guarda referido a la fecha del
+último reporte, así que sumar uno nuevo es O(1):
+
+    puntaje(t) = puntaje * exp(-λ · (t - ultimo))
+
+Consultar un DNI es una búsqueda en un diccionario, así que el registro de
+integrantes puede avisar al organizador mientras escribe, aunque haya
+cientos de miles de reportes. Los agregados se guardan en `riesgo_dni` y se
+cargan en un hilo al iniciar la app; mientras tanto nada espera a la carga:
+las consultas responden "sin datos" y los reportes nuevos se encolan y se
+suman al terminar.
+"""
+import math
+import threading
+import time
+
+VIDA_MEDIA_DIAS = 180
+_LAMBDA = math.log(2) / (VIDA_MEDIA_DIAS * 86400)
+
+# Un solo reporte de hace más de dos vidas medias (< 0.25) ya no genera aviso
+UMBRAL_ALERTA = 0.25
+
+
+class Historial:
+    __slots__ = ('cantidad', 'puntaje', 'ultimo')
+
+    def __init__(self, cantidad=0, puntaje=0.0, ultimo=0.0):
+        self.cantidad = cantidad
+        self.puntaje = puntaje
+        self.ultimo = ultimo
+
+    def sumar(self, creado):
+        """Agrega un reporte hecho en `creado` (también si es anterior al último)."""
+        if creado >= self.ultimo:
+            self.puntaje = self.puntaje * math.exp(-_LAMBDA * (creado - self.ultimo)) + 1.0
+            self.ultimo = creado
+        else:
+            self.puntaje += math.exp(-_LAMBDA * (self.ultimo - creado))
+        self.cantidad += 1
+
+    def puntaje_en(self, ahora=None):
+        ahora = time.time() if ahora is None else ahora
+        return self.puntaje * math.exp(-_LAMBDA * max(0.0, ahora - self.ultimo))
+
+
+def describir(historial, ahora=None):
+    """Texto corto para el organizador, p. ej. '3 reportes, el último hace 20 días'."""
+    ahora = time.time() if ahora is None else ahora
+    dias = int(max(0.0, ahora - historial.ultimo) // 86400)
+    cuando = 'hoy' if dias == 0 else 'hace 1 día' if dias == 1 else f'hace {dias} días'
+    plural = 'reporte' if historial.cantidad == 1 else 'reportes'
+    return f"{historial.cantidad} {plural}, el último {cuando}"
+
+
+class RegistroReportes:
+    """DNI -> `Historial`. Nada se bloquea mientras dura la carga inicial."""
+
+    def __init__(self):
+        self._por_dni = {}
+        self._listo = False
+        self._pendientes = []  # (dni, creado, al_sumar) recibidos durante la carga
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._por_dni)
+
+    def cargar(self, db):
+        """Lee los agregados de la base (pensado para un hilo aparte).
+
+        Si la tabla de agregados está vacía pero hay reportes (bases
+        anteriores a este registro), los reconstruye una vez y los guarda.
+        Al terminar suma los reportes encolados por `agregar`.
+        """
+        por_dni = {}
+        try:
+            filas = db.cargar_riesgos()
+            if filas:
+                for dni, cantidad, puntaje, ultimo in filas:
+                    por_dni[dni] = Historial(cantidad, puntaje, ultimo)
+            else:
+                for dni, creado in db.fechas_reportes():
+                    historial = por_dni.get(dni)
+                    if historial is None:
+                        historial = por_dni[dni] = Historial()
+                    historial.sumar(creado)
+                if por_dni:
+                    db.guardar_riesgos(
+                        (dni, h.cantidad, h.puntaje, h.ultimo) for dni, h in por_dni.items())
+        except Exception as e:
+            print('Error cargando el registro de reportes:', e)
+        with self._lock:
+            self._por_dni = por_dni
+            pendientes, self._pendientes = self._pendientes, []
+            sumados = [(self._sumar(dni, creado), al_sumar) for dni, creado, al_sumar in pendientes]
+            self._listo = True
+        for historial, al_sumar in sumados:
+            if al_sumar is not None:
+                try:
+                    al_sumar(historial)
+                except Exception as e:
+                    print('Error guardando un reporte encolado:', e)
+
+    def _sumar(self, dni, creado):
+        historial = self._por_dni.get(dni)
+        if historial is None:
+            historial = self._por_dni[dni] = Historial()
+        historial.sumar(creado)
+        return historial
+
+    def agregar(self, dni, creado=None, al_sumar=None):
+        """Suma un reporte al DNI; `al_sumar(historial)` recibe el historial actualizado.
+
+        Con la carga terminada se suma en el acto, se llama a `al_sumar` y se
+        devuelve el historial. Durante la carga el reporte se encola y se
+        devuelve None; `al_sumar` se llamará desde el hilo de carga.
+        """
+        creado = time.time() if creado is None else creado
+        with self._lock:
+            if not self._listo:
+                self._pendientes.append((dni, creado, al_sumar))
+                return None
+            historial = self._sumar(dni, creado)
+        if al_sumar is not None:
+            al_sumar(historial)
+        return historial
+
+    def consultar(self, dni):
+        """Historial del DNI, o None si nunca fue reportado o si la carga aún no terminó."""
+        return self._por_dni.get(dni) if self._listo else None
+
+    def reportado(self, dni):
+        return self.consultar(dni) is not None
+
+    def alerta(self, dni, ahora=None):
+        """Historial si el DNI tiene reportes con peso suficiente para avisar, o None.
+
+        No espera a la carga inicial: mientras tanto no hay avisos, pero la
+        interfaz nunca se bloquea.
+        """
+        historial = self.consultar(dni) if dni else None
+        if historial is None or historial.puntaje_en(ahora) < UMBRAL_ALERTA:
+            return None
+        return historial
@@ -0,0 +1,570 @@
+"""Servicio HTTP de juntas sobre asyncio: invitaciones, uniones, intercambios, reportes y sincronización.
+
+Es la contraparte en servidor de lo que las pantallas hoy simulan. Solo usa
+la biblioteca estándar y los mismos módulos de datos que la app:
+
+- `database.BaseDatos` como almacén: las escrituras se encolan y un hilo las
+  aplica en lote (nunca bloquean el bucle de eventos); las lecturas en frío
+  van a un `ThreadPoolExecutor` donde cada hilo tiene su propia conexión
+  SQLite, es decir, un pool de conexiones de lectura.
+- `CacheJuntas`, un LRU en memoria con las juntas activas ya convertidas en
+  `TablaCupos` y `ColaSolicitudes`. Como todo corre en el hilo del bucle de
+  eventos, ocupar un cupo o aprobar un intercambio es atómico sin locks; la
+  base se actualiza después (write-through).
+- La sincronización por deltas de `sincronizacion.py`: cada junta tiene una
+  versión que crece con cada cambio, venga de una réplica (`/sync/push`) o
+  de las rutas de arriba, y la tabla `sync_servidor` guarda el último cambio
+  de cada (entidad, clave) con su versión. Lo que envía una réplica se
+  aplica también a las tablas de la junta, así que las demás rutas lo ven.
+
+Rutas (cuerpos y respuestas JSON):
+
+    POST /juntas                                   crea una junta -> id, codigo, clave
+    GET  /invitaciones/<codigo>                    junta a la que lleva el código
+    POST /juntas/<id>/invitacion                   código de una junta sincronizada (el mismo siempre)
+    GET  /juntas/<id>                              vista previa (nombre, monto, cupos...)
+    POST /juntas/<id>/cupos                        ocupa el siguiente cupo libre
+    POST /juntas/<id>/solicitudes                  solicitud de intercambio de números
+    POST /juntas/<id>/solicitudes/<sid>/aprobar    aprueba (requiere X-Clave-Organizador)
+    POST /reportes                                 reporte sobre un DNI
+    POST /sync/push                                cambios de una réplica -> versiones
+    POST /sync/pull                                cursores -> cambios posteriores (304 sin novedades)
+    GET  /sync/juntas/<id>?desde=<v>               cambios de una junta (ETag / If-None-Match)
+
+Los cuerpos pueden venir comprimidos con gzip y la respuesta se comprime si
+el cliente manda `Accept-Encoding: gzip`.
+
+Uso:
+    python servidor.py [--host 127.0.0.1] [--puerto 8080] [--base savi_servidor.db]
+"""
+import argparse
+import asyncio
+import gzip
+import hmac
+import json
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from cupos import Cupo, TablaCupos
+from database import (CAMPOS_JUNTA, ENTIDAD_CUPO, ENTIDAD_JUNTA, ENTIDAD_RECORTE, ENTIDAD_SOLICITUD,
+                      BaseDatos, datos_cupo, nuevo_id)
+from invitaciones import IndiceCodigos, decodificar
+from reportes import RegistroReportes
+from solicitudes import ColaSolicitudes
+
+MAX_CUPOS = 5000
+# Juntas que se mantienen en memoria
+CAPACIDAD_CACHE = 4096
+# Conexiones SQLite de lectura (una por hilo del pool)
+HILOS_LECTURA = 4
+# Bytes de un cuerpo, comprimido o no (un lote de `/sync/push` cabe holgado)
+MAX_CUERPO = 1024 * 1024
+COLA_CONEXIONES = 4096
+
+ENTIDADES_SYNC = (ENTIDAD_JUNTA, ENTIDAD_CUPO, ENTIDAD_RECORTE, ENTIDAD_SOLICITUD)
+_ID_JUNTA = re.compile(r'[0-9a-f]{1,32}')
+
+MOTIVOS = {200: 'OK', 201: 'Created', 304: 'Not Modified', 400: 'Bad Request', 403: 'Forbidden', 404: 'Not Found',
+           405: 'Method Not Allowed', 409: 'Conflict', 413: 'Payload Too Large',
+           500: 'Internal Server Error'}
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, estado, error):
+        super().__init__(error)
+        self.estado = estado
+        self.error = error
+
+
+class JuntaViva:
+    """Junta en memoria: datos, cupos indexados y cola de solicitudes."""
+    __slots__ = ('datos', 'cupos', 'solicitudes', 'dnis')
+
+    def __init__(self, datos, cupos, solicitudes=()):
+        self.datos = datos
+        self.cupos = cupos
+        self.solicitudes = ColaSolicitudes(solicitudes)
+        self.dnis = {c.dni for c in cupos if c.ocupado and c.dni}
+
+    @classmethod
+    def desde_fila(cls, fila):
+        return cls({k: v for k, v in fila.items() if k not in ('cupos', 'solicitudes')},
+                   TablaCupos.desde_dicts(fila['cupos']), fila['solicitudes'])
+
+
+class CacheJuntas:
+    """LRU de `JuntaViva` por id; las faltas se leen de la base en el pool.
+
+    Varias peticiones que piden a la vez la misma junta fría comparten una
+    sola lectura.
+    """
+
+    def __init__(self, db, pool, capacidad=CAPACIDAD_CACHE):
+        self.db = db
+        self.pool = pool
+        self.capacidad = capacidad
+        self._juntas = OrderedDict()
+        self._cargando = {}
+        # Juntas cambiadas por fuera de la caché (p. ej. `/sync/push`) mientras se leían
+        self._invalidadas = set()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self._juntas)
+
+    def quitar(self, junta_id):
+        """Olvida la junta: la próxima petición la vuelve a leer de la base."""
+        self._juntas.pop(junta_id, None)
+        if junta_id in self._cargando:
+            self._invalidadas.add(junta_id)
+
+    def poner(self, junta_id, junta):
+        self._juntas[junta_id] = junta
+        self._juntas.move_to_end(junta_id)
+        if len(self._juntas) > self.capacidad:
+            # Escritura inmediata en la base: expulsar no pierde nada
+            self._juntas.popitem(last=False)
+
+    async def obtener(self, junta_id):
+        junta = self._juntas.get(junta_id)
+        if junta is not None:
+            self._juntas.move_to_end(junta_id)
+            self.aciertos += 1
+            return junta
+        tarea = self._cargando.get(junta_id)
+        if tarea is None:
+            self.fallos += 1
+            tarea = self._cargando[junta_id] = asyncio.ensure_future(self._cargar(junta_id))
+        return await asyncio.shield(tarea)
+
+    async def _cargar(self, junta_id):
+        try:
+            fila = await asyncio.get_running_loop().run_in_executor(self.pool, self._leer, junta_id)
+            if fila is None:
+                return None
+            junta = self._juntas.get(junta_id)  # pudo crearse mientras se leía
+            if junta is None:
+                junta = JuntaViva.desde_fila(fila)
+                # Si cambió mientras se leía, sirve a esta petición pero no se guarda
+                if junta_id not in self._invalidadas:
+                    self.poner(junta_id, junta)
+            return junta
+        finally:
+            del self._cargando[junta_id]
+            self._invalidadas.discard(junta_id)
+
+    def _leer(self, junta_id):
+        # Lo que se encoló antes (p. ej. una junta recién expulsada) ya está escrito
+        self.db.barrera().wait()
+        return self.db.cargar_junta(junta_id)
+
+
+class ServicioJuntas:
+    """Operaciones del servicio; cada método recibe el cuerpo y los ids de la ruta."""
+
+    def __init__(self, db, capacidad_cache=CAPACIDAD_CACHE, hilos=HILOS_LECTURA):
+        self.db = db
+        self.pool = ThreadPoolExecutor(hilos, thread_name_prefix='savi-lectura')
+        self.cache = CacheJuntas(db, self.pool, capacidad_cache)
+        # Código de invitación -> junta en O(1), cargado una vez al arrancar
+        self.codigos = IndiceCodigos()
+        invitaciones = db.cargar_invitaciones()
+        self.codigos.cargar(invitaciones)
+        self.codigo_de = {junta_id: codigo for codigo, junta_id in invitaciones}
+        # Historial de reportes por DNI para avisar al ocupar un cupo
+        self.reportes = RegistroReportes()
+        self.reportes.cargar(db)
+        # Versión de sincronización de cada junta
+        self.versiones = db.versiones_servidor()
+        self.peticiones = 0
+
+    def cerrar(self):
+        self.pool.shutdown(wait=True)
+
+    async def _junta(self, junta_id):
+        junta = await self.cache.obtener(junta_id)
+        if junta is None:
+            raise ErrorHTTP(404, 'junta_inexistente')
+        return junta
+
+    # --- Operaciones ---
+    async def crear_junta(self, cuerpo):
+        nombre = str(cuerpo.get('nombre') or '').strip()
+        try:
+            cantidad = int(cuerpo.get('cupos') or 0)
+        except (TypeError, ValueError):
+            cantidad = 0
+        if not nombre or not 1 <= cantidad <= MAX_CUPOS:
+            raise ErrorHTTP(400, 'datos_invalidos')
+        datos = {
+            'id': nuevo_id(), 'nombre': nombre, 'monto': str(cuerpo.get('monto') or ''),
+            'moneda': str(cuerpo.get('moneda') or 'Soles'), 'periodo': str(cuerpo.get('periodo') or 'Mensual'),
+            'fecha_inicio': str(cuerpo.get('fecha_inicio') or 'Pendiente'),
+            'fecha_final': str(cuerpo.get('fecha_final') or 'Pendiente'), 'creada': time.time(),
+        }
+        cupos = TablaCupos([Cupo(ocupado=True, nombre=str(cuerpo.get('organizador') or 'Organizador'),
+                                 usuario='Administrador', numero=1)])
+        cupos.redimensionar(cantidad)
+        datos['codigo'] = self.codigo_de[datos['id']] = self.codigos.asignar(datos['id'])
+        datos['clave'] = secrets.token_urlsafe(16)
+
+        self.db.guardar_junta(datos)
+        self.db.guardar_cupos(datos['id'], cupos)
+        self.db.guardar_invitacion(datos['codigo'], datos['id'], datos['clave'])
+        self.cache.poner(datos['id'], JuntaViva(datos, cupos))
+        self._publicar(datos['id'], [_cambio(ENTIDAD_JUNTA, datos['id'], {c: datos[c] for c in CAMPOS_JUNTA})]
+                       + [_cambio_cupo(cupos, i) for i in range(len(cupos))])
+        return 201, {'id': datos['id'], 'codigo': datos['codigo'], 'clave': datos['clave']}
+
+    async def resolver_invitacion(self, cuerpo, codigo):
+        # Un código mal formado o con el control equivocado no llega al índice
+        if decodificar(codigo) is None:
+            raise ErrorHTTP(400, 'codigo_invalido')
+        junta_id = self.codigos.buscar(codigo)
+        if junta_id is None:
+            raise ErrorHTTP(404, 'codigo_inexistente')
+        return 200, {'junta_id': junta_id}
+
+    async def asignar_invitacion(self, cuerpo, junta_id):
+        # Las juntas creadas en un dispositivo llegan por /sync/push; el código
+        # se asigna aquí para que sea único entre todos los dispositivos
+        await self._junta(junta_id)
+        codigo = self.codigo_de.get(junta_id)
+        if codigo is None:
+            codigo = self.codigo_de[junta_id] = self.codigos.asignar(junta_id)
+            self.db.guardar_invitacion(codigo, junta_id)
+        return 200, {'codigo': codigo}
+
+    async def vista_previa(self, cuerpo, junta_id):
+        junta = await self._junta(junta_id)
+        datos = junta.datos
+        return 200, {
+            'id': junta_id, 'nombre': datos['nombre'], 'monto': datos['monto'], 'moneda': datos['moneda'],
+            'periodo': datos['periodo'], 'fecha_inicio': datos['fecha_inicio'],
+            'organizador': junta.cupos[0].nombre if len(junta.cupos) else '',
+            'ocupados': junta.cupos.ocupados, 'capacidad': len(junta.cupos),
+        }
+
+    async def ocupar_cupo(self, cuerpo, junta_id):
+        junta = await self._junta(junta_id)
+        nombre = str(cuerpo.get('nombre') or '').strip()
+        dni = str(cuerpo.get('dni') or '').strip()
+        if not nombre:
+            raise ErrorHTTP(400, 'nombre_requerido')
+        if dni and dni in junta.dnis:
+            raise ErrorHTTP(409, 'ya_inscrito')
+        indice = junta.cupos.ocupar_siguiente(
+            nombre=nombre, usuario='Miembro Verificado', dni=dni,
+            telefono=str(cuerpo.get('telefono') or ''), correo=str(cuerpo.get('correo') or ''))
+        if indice is None:
+            raise ErrorHTTP(409, 'junta_llena')
+        if dni:
+            junta.dnis.add(dni)
+        self.db.guardar_cupos(junta_id, junta.cupos, [indice])
+        self._publicar(junta_id, [_cambio_cupo(junta.cupos, indice)])
+        respuesta = {'indice': indice, 'numero': junta.cupos[indice].numero}
+        historial = self.reportes.alerta(dni)
+        if historial is not None:
+            respuesta['reportes'] = historial.cantidad
+        return 201, respuesta
+
+    async def solicitar_intercambio(self, cuerpo, junta_id):
+        junta = await self._junta(junta_id)
+        desde, hacia = str(cuerpo.get('from') or ''), str(cuerpo.get('to') or '')
+        if junta.cupos.indice_de_numero(desde) is None or junta.cupos.indice_de_numero(hacia) is None:
+            raise ErrorHTTP(400, 'numero_inexistente')
+        solicitud = {'id': nuevo_id(), 'junta_id': junta_id, 'from': desde, 'to': hacia}
+        if not junta.solicitudes.agregar(solicitud):
+            raise ErrorHTTP(409, 'solicitud_repetida')
+        self.db.agregar_solicitud(solicitud, junta_id)
+        self._publicar(junta_id, [_cambio(ENTIDAD_SOLICITUD, solicitud['id'], {'from': desde, 'to': hacia})])
+        return 201, {'id': solicitud['id']}
+
+    async def aprobar_intercambio(self, cuerpo, junta_id, solicitud_id, clave=''):
+        junta = await self._junta(junta_id)
+        if not hmac.compare_digest(clave, junta.datos.get('clave') or ''):
+            raise ErrorHTTP(403, 'solo_organizador')
+        solicitud = junta.solicitudes.quitar(solicitud_id)
+        if solicitud is None:
+            raise ErrorHTTP(404, 'solicitud_inexistente')
+        self.db.eliminar_solicitud(solicitud_id, junta_id)
+        retirada = _cambio(ENTIDAD_SOLICITUD, solicitud_id, None)
+        posiciones = junta.cupos.intercambiar_numeros(solicitud['from'], solicitud['to'])
+        if posiciones is None:
+            self._publicar(junta_id, [retirada])
+            raise ErrorHTTP(409, 'numero_inexistente')
+        self.db.guardar_cupos(junta_id, junta.cupos, posiciones)
+        self._publicar(junta_id, [retirada] + [_cambio_cupo(junta.cupos, i) for i in posiciones])
+        return 200, {'posiciones': list(posiciones)}
+
+    async def reportar(self, cuerpo):
+        dni = str(cuerpo.get('dni') or '').strip()
+        reclamo = str(cuerpo.get('reclamo') or '').strip()
+        if not dni or not reclamo:
+            raise ErrorHTTP(400, 'datos_invalidos')
+        junta_id = cuerpo.get('junta_id')
+        if junta_id:
+            await self._junta(junta_id)
+        creado = time.time()
+        historial = self.reportes.agregar(dni, creado)
+        self.db.agregar_reporte(dni, reclamo, junta_id, creado, historial)
+        return 201, {'dni': dni, 'reportes': historial.cantidad}
+
+    # --- Sincronización por deltas ---
+    def _publicar(self, junta_id, cambios):
+        """Numera y guarda cambios de la junta. Devuelve {'base', 'version'}."""
+        base = self.versiones.get(junta_id, 0)
+        version = self.versiones[junta_id] = base + len(cambios)
+        self.db.publicar_cambios(junta_id, base, cambios)
+        return {'base': base, 'version': version}
+
+    async def sync_enviar(self, cuerpo):
+        cambios = cuerpo.get('cambios')
+        if not isinstance(cambios, list):
+            raise ErrorHTTP(400, 'datos_invalidos')
+        por_junta = {}
+        for cambio in cambios:
+            if (not isinstance(cambio, dict) or not isinstance(cambio.get('junta_id'), str)
+                    or not _ID_JUNTA.fullmatch(cambio['junta_id'])
+                    or cambio.get('entidad') not in ENTIDADES_SYNC
+                    or not isinstance(cambio.get('datos'), (dict, type(None)))):
+                raise ErrorHTTP(400, 'cambio_invalido')
+            por_junta.setdefault(cambio['junta_id'], []).append(
+                _cambio(cambio['entidad'], str(cambio.get('clave') or ''), cambio['datos']))
+        versiones = {}
+        for junta_id, cambios_junta in por_junta.items():
+            versiones[junta_id] = self._publicar(junta_id, cambios_junta)
+            # Las tablas de la junta quedan como en la réplica: las otras rutas lo ven
+            self.db.aplicar_remotos(junta_id, versiones[junta_id]['version'], cambios_junta)
+            self.cache.quitar(junta_id)
+        return 200, {'versiones': versiones}
+
+    async def sync_recibir(self, cuerpo):
+        cursores = cuerpo.get('cursores')
+        if not isinstance(cursores, dict):
+            raise ErrorHTTP(400, 'datos_invalidos')
+        try:
+            pedidos = [(junta_id, int(cursor), self.versiones[junta_id]) for junta_id, cursor in cursores.items()
+                       if self.versiones.get(junta_id, 0) > int(cursor)]
+        except (TypeError, ValueError):
+            raise ErrorHTTP(400, 'datos_invalidos')
+        if not pedidos:
+            return 304, None
+        juntas = await asyncio.get_running_loop().run_in_executor(self.pool, self._leer_cambios, pedidos)
+        return 200, {'juntas': juntas}
+
+    async def sync_junta(self, cuerpo, junta_id, desde='0', etiqueta=''):
+        version = self.versiones.get(junta_id, 0)
+        cabeceras = {'ETag': f'"{version}"'}
+        try:
+            cursor = int(desde)
+        except ValueError:
+            raise ErrorHTTP(400, 'datos_invalidos')
+        if etiqueta == cabeceras['ETag'] or version <= cursor:
+            return 304, None, cabeceras
+        juntas = await asyncio.get_running_loop().run_in_executor(
+            self.pool, self._leer_cambios, [(junta_id, cursor, version)])
+        return 200, juntas[junta_id], cabeceras
+
+    def _leer_cambios(self, pedidos):
+        # Lo publicado hasta la petición ya está escrito; la versión que se
+        # informa es la de ese momento (si se leyó algo más nuevo, se repite)
+        self.db.barrera().wait()
+        return {junta_id: {'version': version, 'cambios': self.db.cambios_desde(junta_id, cursor)}
+                for junta_id, cursor, version in pedidos}
+
+
+def _cambio(entidad, clave, datos):
+    return {'entidad': entidad, 'clave': clave, 'datos': datos}
+
+
+def _cambio_cupo(cupos, indice):
+    return _cambio(ENTIDAD_CUPO, str(indice), datos_cupo(cupos[indice]))
+
+
+# (método, patrón, nombre de la operación)
+RUTAS = [
+    ('POST', re.compile(r'/juntas'), 'crear_junta'),
+    ('GET', re.compile(r'/invitaciones/([A-Za-z0-9-]{1,32})'), 'resolver_invitacion'),
+    ('GET', re.compile(r'/juntas/([0-9a-f]+)'), 'vista_previa'),
+    ('POST', re.compile(r'/juntas/([0-9a-f]+)/invitacion'), 'asignar_invitacion'),
+    ('POST', re.compile(r'/juntas/([0-9a-f]+)/cupos'), 'ocupar_cupo'),
+    ('POST', re.compile(r'/juntas/([0-9a-f]+)/solicitudes'), 'solicitar_intercambio'),
+    ('POST', re.compile(r'/juntas/([0-9a-f]+)/solicitudes/([0-9a-f]+)/aprobar'), 'aprobar_intercambio'),
+    ('POST', re.compile(r'/reportes'), 'reportar'),
+    ('POST', re.compile(r'/sync/push'), 'sync_enviar'),
+    ('POST', re.compile(r'/sync/pull'), 'sync_recibir'),
+    ('GET', re.compile(r'/sync/juntas/([0-9a-f]+)'), 'sync_junta'),
+]
+
+
+class ServidorHTTP:
+    """HTTP/1.1 mínimo con conexiones persistentes sobre `asyncio.start_server`."""
+
+    def __init__(self, servicio):
+        self.servicio = servicio
+
+    async def despachar(self, metodo, ruta, cabeceras, cuerpo):
+        """Devuelve (estado, respuesta JSON o None, cabeceras extra)."""
+        ruta, _, consulta = ruta.partition('?')
+        otro_metodo = False
+        for metodo_ruta, patron, nombre in RUTAS:
+            m = patron.fullmatch(ruta)
+            if m is None:
+                continue
+            if metodo_ruta != metodo:
+                otro_metodo = True
+                continue
+            try:
+                datos = json.loads(cuerpo) if cuerpo else {}
+            except ValueError:
+                raise ErrorHTTP(400, 'json_invalido')
+            if not isinstance(datos, dict):
+                raise ErrorHTTP(400, 'json_invalido')
+            operacion = getattr(self.servicio, nombre)
+            extras = {}
+            if nombre == 'aprobar_intercambio':
+                extras['clave'] = cabeceras.get('x-clave-organizador', '')
+            elif nombre == 'sync_junta':
+                extras['desde'] = parse_qs(consulta).get('desde', ['0'])[0]
+                extras['etiqueta'] = cabeceras.get('if-none-match', '')
+            resultado = await operacion(datos, *m.groups(), **extras)
+            return resultado if len(resultado) == 3 else (*resultado, {})
+        raise ErrorHTTP(405, 'metodo_no_permitido') if otro_metodo else ErrorHTTP(404, 'ruta_inexistente')
+
+    async def atender(self, lector, escritor):
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                metodo, ruta, version = linea.decode('latin-1').split()
+                cabeceras = {}
+                while True:
+                    linea = await lector.readline()
+                    if linea in (b'\r\n', b'\n', b''):
+                        break
+                    nombre, _, valor = linea.decode('latin-1').partition(':')
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+                largo = int(cabeceras.get('content-length') or 0)
+                mantener = version == 'HTTP/1.1' and cabeceras.get('connection', '').lower() != 'close'
+                extra = {}
+                if largo > MAX_CUERPO:
+                    estado, respuesta, mantener = 413, {'error': 'cuerpo_muy_grande'}, False
+                else:
+                    cuerpo = await lector.readexactly(largo) if largo else b''
+                    self.servicio.peticiones += 1
+                    try:
+                        if cabeceras.get('content-encoding') == 'gzip':
+                            cuerpo = _descomprimir(cuerpo)
+                        estado, respuesta, extra = await self.despachar(metodo, ruta, cabeceras, cuerpo)
+                    except ErrorHTTP as e:
+                        estado, respuesta = e.estado, {'error': e.error}
+                    except Exception as e:
+                        print('Error atendiendo', metodo, ruta, e)
+                        estado, respuesta = 500, {'error': 'interno'}
+                datos = b''
+                if respuesta is not None:
+                    datos = json.dumps(respuesta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                    extra = dict(extra, **{'Content-Type': 'application/json'})
+                    if 'gzip' in cabeceras.get('accept-encoding', ''):
+                        datos = gzip.compress(datos, 5)
+                        extra['Content-Encoding'] = 'gzip'
+                lineas = ''.join(f"{nombre}: {valor}\r\n" for nombre, valor in extra.items())
+                escritor.write(
+                    f"HTTP/1.1 {estado} {MOTIVOS.get(estado, '')}\r\n{lineas}Content-Length: {len(datos)}\r\n"
+                    f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n".encode('latin-1') + datos)
+                await escritor.drain()
+                if not mantener:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+    async def iniciar(self, host, puerto):
+        return await asyncio.start_server(self.atender, host, puerto, backlog=COLA_CONEXIONES)
+
+
+def _descomprimir(datos):
+    """Cuerpo gzip descomprimido, sin pasar de `MAX_CUERPO`."""
+    descompresor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        resultado = descompresor.decompress(datos, MAX_CUERPO)
+    except zlib.error:
+        raise ErrorHTTP(400, 'gzip_invalido')
+    if descompresor.unconsumed_tail:
+        raise ErrorHTTP(413, 'cuerpo_muy_grande')
+    return resultado
+
+
+class ServidorEnHilo:
+    """El servicio corriendo en un hilo con su propio bucle (pruebas y benchmarks).
+
+    `url` queda lista al volver del constructor; `detener()` lo cierra todo.
+    """
+
+    def __init__(self, ruta_base, host='127.0.0.1', puerto=0):
+        self.db = BaseDatos(ruta_base)
+        self.servicio = ServicioJuntas(self.db)
+        self._bucle = asyncio.new_event_loop()
+        self._servidor = self._bucle.run_until_complete(ServidorHTTP(self.servicio).iniciar(host, puerto))
+        self.url = f"http://{host}:{self._servidor.sockets[0].getsockname()[1]}"
+        self._hilo = threading.Thread(target=self._bucle.run_forever, name='savi-servidor', daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        asyncio.run_coroutine_threadsafe(self._cerrar_conexiones(), self._bucle).result()
+        self._bucle.call_soon_threadsafe(self._bucle.stop)
+        self._hilo.join()
+        self._bucle.close()
+        self.servicio.cerrar()
+        self.db.cerrar()
+
+    async def _cerrar_conexiones(self):
+        # Las conexiones persistentes siguen esperando la próxima petición:
+        # se cancelan antes de cerrar el bucle para que cierren su socket
+        self._servidor.close()
+        tareas = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for tarea in tareas:
+            tarea.cancel()
+        await asyncio.gather(*tareas, return_exceptions=True)
+
+
+async def servir(host, puerto, ruta_base):
+    db = BaseDatos(ruta_base)
+    servicio = ServicioJuntas(db)
+    servidor = await ServidorHTTP(servicio).iniciar(host, puerto)
+    print(f"Sirviendo en http://{host}:{servidor.sockets[0].getsockname()[1]}", flush=True)
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        servicio.cerrar()
+        db.cerrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8080)
+    parser.add_argument('--base', default=os.path.join(os.getcwd(), 'savi_servidor.db'))
+    args = parser.parse_args()
+    try:
+        asyncio.run(servir(args.host, args.puerto, args.base))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
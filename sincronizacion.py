@@ -0,0 +1,293 @@
+"""Sincronización por deltas entre la réplica local y el servidor.
+
+La app siempre lee y escribe la base local (`database.BaseDatos` con
+`registrar_cambios=True`); abrir una junta nunca espera a la red. Un hilo en
+segundo plano intercambia con el servidor solo lo que cambió:
+
+- Cada cambio es `{'junta_id', 'entidad', 'clave', 'datos'}` (datos None =
+  borrado). Localmente se guarda la última versión por clave, así que varias
+  ediciones del mismo cupo viajan como una.
+- El servidor numera los cambios de cada junta con una versión creciente y
+  la réplica recuerda la última que conoce (`sync_estado`): es el cursor con
+  el que pide solo lo posterior.
+- `POST /sync/push` envía los cambios locales en lotes; `POST /sync/pull`
+  manda los cursores de todas las juntas y el servidor responde 304 si
+  ninguna tiene novedades. `GET /sync/juntas/<id>?desde=<v>` con
+  `If-None-Match` trae una sola junta (al abrirla, o al unirse con un código
+  de invitación: `GET /invitaciones/<codigo>` dice de qué junta es y desde
+  ahí la réplica la sigue como a las propias).
+- Los códigos de invitación los asigna el servidor
+  (`POST /juntas/<id>/invitacion`), así no se repiten entre dispositivos.
+- Cuerpos JSON comprimidos con gzip sobre una conexión HTTP persistente.
+- Conflictos: gana la última escritura que llega al servidor, por clave. Un
+  cambio remoto sobre una clave con una edición local aún sin enviar se
+  ignora: la edición local se enviará y prevalecerá.
+
+Solo usa la biblioteca estándar. El servidor es `servidor.py`
+(`benchmarks/servidor_sync_local.py` lo levanta en un hilo para pruebas).
+"""
+import gzip
+import http.client
+import json
+import socket
+import threading
+from urllib.parse import urlsplit
+
+# Cambios locales por petición de envío
+TAMANO_LOTE_ENVIO = 500
+# Segundos entre pasadas automáticas
+INTERVALO = 30
+TIEMPO_ESPERA = 10
+
+
+class ErrorSincronizacion(Exception):
+    def __init__(self, mensaje, estado=None):
+        super().__init__(mensaje)
+        self.estado = estado  # estado HTTP, si el servidor respondió
+
+
+class PoolHTTP:
+    """Conexión HTTP(S) persistente a un servidor, reutilizada entre peticiones.
+
+    Envía y acepta JSON comprimido con gzip. Si la conexión se cayó mientras
+    estaba ociosa se reabre y la petición se reintenta una vez.
+    """
+
+    def __init__(self, url, tiempo_espera=TIEMPO_ESPERA):
+        partes = urlsplit(url)
+        self._clase = http.client.HTTPSConnection if partes.scheme == 'https' else http.client.HTTPConnection
+        self._host = partes.netloc
+        self._base = partes.path.rstrip('/')
+        self._tiempo_espera = tiempo_espera
+        self._conexion = None
+        self._lock = threading.Lock()
+        self.bytes_enviados = 0
+        self.bytes_recibidos = 0
+
+    def _abrir(self):
+        if self._conexion is None:
+            conexion = self._clase(self._host, timeout=self._tiempo_espera)
+            conexion.connect()
+            # Cabeceras y cuerpo salen en escrituras separadas: sin esto Nagle
+            # y el ACK diferido suman ~40 ms a cada petición
+            conexion.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._conexion = conexion
+        return self._conexion
+
+    def cerrar(self):
+        with self._lock:
+            if self._conexion is not None:
+                self._conexion.close()
+                self._conexion = None
+
+    def pedir(self, metodo, ruta, cuerpo=None, cabeceras=None):
+        """Hace la petición y devuelve `(estado, json o None, cabeceras)`."""
+        datos = None
+        encabezados = {'Accept-Encoding': 'gzip', 'Accept': 'application/json'}
+        if cuerpo is not None:
+            datos = gzip.compress(json.dumps(cuerpo, separators=(',', ':')).encode('utf-8'), 5)
+            encabezados.update({'Content-Type': 'application/json', 'Content-Encoding': 'gzip'})
+        encabezados.update(cabeceras or {})
+        with self._lock:
+            for intento in (1, 2):
+                try:
+                    conexion = self._abrir()
+                    conexion.request(metodo, self._base + ruta, body=datos, headers=encabezados)
+                    respuesta = conexion.getresponse()
+                    contenido = respuesta.read()
+                    break
+                except (http.client.HTTPException, OSError) as e:
+                    if self._conexion is not None:
+                        self._conexion.close()
+                        self._conexion = None
+                    if intento == 2:
+                        raise ErrorSincronizacion(f'{metodo} {ruta}: {e}') from e
+        self.bytes_enviados += len(datos or b'')
+        self.bytes_recibidos += len(contenido)
+        if respuesta.status >= 400:
+            raise ErrorSincronizacion(f'{metodo} {ruta}: HTTP {respuesta.status}', respuesta.status)
+        if respuesta.getheader('Content-Encoding') == 'gzip':
+            contenido = gzip.decompress(contenido)
+        resultado = json.loads(contenido) if contenido else None
+        return respuesta.status, resultado, dict(respuesta.getheaders())
+
+
+class Sincronizador:
+    """Mantiene la réplica local al día con el servidor en un hilo aparte.
+
+    `entregar(junta_id, cambios)` se llama desde ese hilo con los cambios
+    remotos ya guardados en la base; quien lo reciba debe pasarlos al hilo
+    de la interfaz (p. ej. con `kivy.clock.mainthread`).
+    """
+
+    def __init__(self, db, url, entregar=None, intervalo=INTERVALO):
+        self.db = db
+        self.http = PoolHTTP(url)
+        self.entregar = entregar
+        self.intervalo = intervalo
+        self._despertar = threading.Event()
+        self._detener = False
+        self._pedidas = set()
+        self._tareas = []  # (tarea, al_terminar) pedidas desde la interfaz
+        self._lock = threading.Lock()
+        self._hilo = None
+        self.ultimo_error = None
+
+    # --- Ciclo en segundo plano ---
+    def iniciar(self):
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._ciclo, name='savi-sync', daemon=True)
+            self._hilo.start()
+
+    def detener(self):
+        self._detener = True
+        self._despertar.set()
+        if self._hilo is not None:
+            self._hilo.join(TIEMPO_ESPERA)
+            self._hilo = None
+        self.http.cerrar()
+
+    def avisar(self):
+        """Pide una pasada lo antes posible (p. ej. tras una edición)."""
+        self._despertar.set()
+
+    def pedir(self, junta_id):
+        """Trae pronto las novedades de una junta (al abrirla)."""
+        with self._lock:
+            self._pedidas.add(junta_id)
+        self._despertar.set()
+
+    def unirse(self, codigo, al_terminar):
+        """Busca en el servidor la junta de un código de invitación y empieza a seguirla.
+
+        `al_terminar(junta_id, error)` se llama desde el hilo de
+        sincronización después de entregar la junta; `junta_id` es None si
+        el código no existe o no se pudo consultar.
+        """
+        self._encargar(lambda: self._unir(codigo), al_terminar)
+
+    def pedir_codigo(self, junta_id, al_terminar):
+        """Pide al servidor el código de invitación de una junta propia.
+
+        `al_terminar(codigo, error)` se llama desde el hilo de
+        sincronización; `codigo` es None si no se pudo obtener.
+        """
+        self._encargar(lambda: self._codigo(junta_id), al_terminar)
+
+    def _encargar(self, tarea, al_terminar):
+        with self._lock:
+            self._tareas.append((tarea, al_terminar))
+        self._despertar.set()
+
+    def _ciclo(self):
+        while not self._detener:
+            with self._lock:
+                tareas, self._tareas = self._tareas, []
+            for tarea, al_terminar in tareas:
+                self._ejecutar(tarea, al_terminar)
+            try:
+                with self._lock:
+                    pedidas, self._pedidas = self._pedidas, set()
+                for junta_id in pedidas:
+                    self.traer_junta(junta_id)
+                self.sincronizar()
+                self.ultimo_error = None
+            except Exception as e:
+                self.ultimo_error = e
+                print('Error de sincronización:', e)
+            self._despertar.wait(self.intervalo)
+            self._despertar.clear()
+
+    # --- Pasadas ---
+    def sincronizar(self):
+        """Envía los cambios locales y trae los remotos. Devuelve cuántos llegaron."""
+        self.enviar()
+        return self.recibir()
+
+    def enviar(self):
+        """Envía los cambios locales pendientes en lotes y los confirma."""
+        total = 0
+        while True:
+            self.db.esperar()
+            pendientes = self.db.cambios_pendientes(TAMANO_LOTE_ENVIO)
+            if not pendientes:
+                return total
+            _, respuesta, _ = self.http.pedir('POST', '/sync/push', {'cambios': [
+                {k: c[k] for k in ('junta_id', 'entidad', 'clave', 'datos')} for c in pendientes
+            ]})
+            # Si nadie más escribió en la junta entre medio, lo recién enviado
+            # ya está en la réplica: el cursor avanza sin volver a traerlo.
+            cursores = self.db.cursores()
+            for junta_id, v in (respuesta or {}).get('versiones', {}).items():
+                if cursores.get(junta_id, 0) == v['base']:
+                    self.db.aplicar_remotos(junta_id, v['version'], [])
+            self.db.confirmar_cambios(pendientes[-1]['orden'])
+            total += len(pendientes)
+
+    def recibir(self):
+        """Trae los cambios posteriores a los cursores de todas las juntas."""
+        self.db.esperar()
+        cursores = self.db.cursores()
+        if not cursores:
+            return 0
+        estado, respuesta, _ = self.http.pedir('POST', '/sync/pull', {'cursores': cursores})
+        if estado == 304 or not respuesta:
+            return 0
+        total = 0
+        for junta_id, delta in respuesta.get('juntas', {}).items():
+            total += self._aplicar(junta_id, delta['version'], delta['cambios'])
+        return total
+
+    def traer_junta(self, junta_id):
+        """Pide solo la junta indicada; 304 si la réplica ya está al día."""
+        self.db.seguir_junta(junta_id)
+        self.db.esperar()
+        version = self.db.cursores().get(junta_id, 0)
+        estado, delta, _ = self.http.pedir(
+            'GET', f'/sync/juntas/{junta_id}?desde={version}', cabeceras={'If-None-Match': f'"{version}"'})
+        if estado == 304 or not delta:
+            return 0
+        return self._aplicar(junta_id, delta['version'], delta['cambios'])
+
+    def resolver_codigo(self, codigo):
+        """Id de la junta del código de invitación, o None si el servidor no lo conoce."""
+        try:
+            _, respuesta, _ = self.http.pedir('GET', f'/invitaciones/{codigo}')
+        except ErrorSincronizacion as e:
+            if e.estado in (400, 404):
+                return None
+            raise
+        return (respuesta or {}).get('junta_id')
+
+    def _unir(self, codigo):
+        junta_id = self.resolver_codigo(codigo)
+        if junta_id is not None:
+            self.traer_junta(junta_id)
+        return junta_id
+
+    def _codigo(self, junta_id):
+        # El servidor tiene que conocer la junta antes de darle un código
+        self.enviar()
+        _, respuesta, _ = self.http.pedir('POST', f'/juntas/{junta_id}/invitacion', {})
+        return (respuesta or {}).get('codigo')
+
+    def _ejecutar(self, tarea, al_terminar):
+        resultado = error = None
+        try:
+            resultado = tarea()
+        except Exception as e:
+            error = e
+        try:
+            al_terminar(resultado, error)
+        except Exception as e:
+            print('Error entregando una tarea de sincronización:', e)
+
+    def _aplicar(self, junta_id, version, cambios):
+        pendientes = self.db.claves_pendientes(junta_id)
+        if pendientes:
+            cambios = [c for c in cambios if (c['entidad'], c['clave']) not in pendientes]
+        self.db.aplicar_remotos(junta_id, version, cambios)
+        if cambios and self.entregar is not None:
+            self.entregar(junta_id, cambios)
+        return len(cambios)
+
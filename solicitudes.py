@@ -0,0 +1,141 @@
+"""Cola de solicitudes de intercambio de turno.
+
+Las solicitudes se guardan en un `OrderedDict` por id, así que encolar,
+atender la más antigua y retirar una por id son O(1). Un segundo diccionario
+indexa cada par de números sin importar el orden, de modo que una solicitud
+repetida (2 ⇄ 3 dos veces) o invertida (3 ⇄ 2) no se encola de nuevo.
+
+Los números de turno solo tienen sentido dentro de su junta, así que la app
+guarda una cola por junta (`SolicitudesPorJunta`): listar, atender y
+aprobar trabajan siempre sobre la cola de la junta abierta.
+"""
+from collections import OrderedDict
+from itertools import count
+
+_SIN_JUNTA = object()
+
+
+def clave_par(desde, hacia):
+    """Clave del par de números independiente del sentido."""
+    return frozenset((str(desde), str(hacia)))
+
+
+class ColaSolicitudes:
+    """Solicitudes pendientes en orden de llegada (dicts con id, from y to).
+
+    Cada solicitud encolada recibe un campo `orden` creciente, útil para
+    localizarla por búsqueda binaria en listas derivadas de la cola.
+    """
+
+    def __init__(self, solicitudes=()):
+        self._por_id = OrderedDict()
+        self._por_par = {}
+        self._secuencia = count()
+        for solicitud in solicitudes:
+            self.agregar(solicitud)
+
+    def __len__(self):
+        return len(self._por_id)
+
+    def __bool__(self):
+        return bool(self._por_id)
+
+    def __iter__(self):
+        return iter(self._por_id.values())
+
+    def __contains__(self, solicitud_id):
+        return solicitud_id in self._por_id
+
+    def get(self, solicitud_id):
+        return self._por_id.get(solicitud_id)
+
+    def duplicada(self, desde, hacia):
+        """Solicitud pendiente para el mismo par de números, o None."""
+        solicitud_id = self._por_par.get(clave_par(desde, hacia))
+        return self._por_id.get(solicitud_id) if solicitud_id is not None else None
+
+    def agregar(self, solicitud):
+        """Encola `solicitud`. Devuelve False si ya había una para ese par."""
+        par = clave_par(solicitud['from'], solicitud['to'])
+        if len(par) < 2 or par in self._por_par or solicitud['id'] in self._por_id:
+            return False
+        solicitud['orden'] = next(self._secuencia)
+        self._por_id[solicitud['id']] = solicitud
+        self._por_par[par] = solicitud['id']
+        return True
+
+    def primera(self):
+        """La solicitud más antigua sin retirarla, o None si no hay."""
+        return next(iter(self._por_id.values()), None)
+
+    def sacar(self):
+        """Retira y devuelve la solicitud más antigua, o None si no hay."""
+        if not self._por_id:
+            return None
+        _, solicitud = self._por_id.popitem(last=False)
+        del self._por_par[clave_par(solicitud['from'], solicitud['to'])]
+        return solicitud
+
+    def quitar(self, solicitud_id):
+        """Retira la solicitud con ese id y la devuelve (None si no estaba)."""
+        solicitud = self._por_id.pop(solicitud_id, None)
+        if solicitud is not None:
+            del self._por_par[clave_par(solicitud['from'], solicitud['to'])]
+        return solicitud
+
+
+class SolicitudesPorJunta:
+    """Una `ColaSolicitudes` por junta (campo `junta_id` de cada solicitud)."""
+
+    def __init__(self, solicitudes=()):
+        self._colas = {}
+        self._junta_de = {}  # id de solicitud -> junta
+        for solicitud in solicitudes:
+            self.agregar(solicitud)
+
+    def __len__(self):
+        return len(self._junta_de)
+
+    def __contains__(self, solicitud_id):
+        return solicitud_id in self._junta_de
+
+    def cola(self, junta_id):
+        """Cola de la junta (vacía si no tiene solicitudes)."""
+        cola = self._colas.get(junta_id)
+        if cola is None:
+            cola = self._colas[junta_id] = ColaSolicitudes()
+        return cola
+
+    def get(self, solicitud_id):
+        junta_id = self._junta_de.get(solicitud_id, _SIN_JUNTA)
+        return None if junta_id is _SIN_JUNTA else self._colas[junta_id].get(solicitud_id)
+
+    def agregar(self, solicitud):
+        """Encola `solicitud` en la cola de su junta. False si ya había una para ese par."""
+        if solicitud['id'] in self._junta_de:
+            return False
+        junta_id = solicitud.get('junta_id')
+        if not self.cola(junta_id).agregar(solicitud):
+            return False
+        self._junta_de[solicitud['id']] = junta_id
+        return True
+
+    def primera(self, junta_id):
+        """La solicitud más antigua de la junta sin retirarla, o None."""
+        cola = self._colas.get(junta_id)
+        return cola.primera() if cola is not None else None
+
+    def sacar(self, junta_id):
+        """Retira la solicitud más antigua de la junta, o None."""
+        solicitud = self.cola(junta_id).sacar()
+        if solicitud is not None:
+            del self._junta_de[solicitud['id']]
+        return solicitud
+
+    def quitar(self, solicitud_id):
+        """Retira la solicitud con ese id de la cola de su junta (None si no estaba)."""
+        junta_id = self._junta_de.pop(solicitud_id, _SIN_JUNTA)
+        if junta_id is _SIN_JUNTA:
+            return None
+        return self._colas[junta_id].quitar(solicitud_id)
+
@@ -0,0 +1,113 @@
+"""Sorteo de números de turno reproducible a partir de una semilla.
+
+Cada sorteo usa una semilla explícita que se guarda junto al resultado (las
+posiciones de los cupos sorteados, en orden, y el número de cada una): con
+la misma semilla, la misma cantidad de participantes y de números, y el
+mismo motor, el sorteo se repite exactamente y `verificar` comprueba que el
+resultado guardado es el que sale de la semilla.
+
+Con NumPy el sorteo es una sola permutación vectorizada
+(`Generator.permutation`), así que 100 000 participantes se sortean en
+milisegundos. Sin NumPy se usa `random.Random(semilla).shuffle`; como los dos
+motores dan resultados distintos para la misma semilla, el motor también se
+registra.
+
+`simular` ejecuta millones de sorteos por bloques y mide qué tan uniforme es
+la distribución de números por participante (prueba chi-cuadrado).
+"""
+import math
+import random
+import secrets
+
+try:
+    import numpy as np
+    MOTOR = 'numpy'
+except ImportError:
+    np = None
+    MOTOR = 'random'
+
+# Primer número que se sortea: el 1 es siempre del organizador.
+PRIMER_NUMERO = 2
+
+
+def nueva_semilla():
+    """Semilla de 64 bits tomada de la fuente aleatoria del sistema."""
+    return secrets.randbits(64)
+
+
+def sortear(cantidad, total_numeros, semilla, motor=MOTOR):
+    """Números para `cantidad` participantes tomados de [2, total_numeros].
+
+    Devuelve una lista de enteros sin repetir, en el orden de los
+    participantes. El resultado depende solo de los argumentos.
+    """
+    disponibles = total_numeros - PRIMER_NUMERO + 1
+    if cantidad > disponibles:
+        raise ValueError(f'{cantidad} participantes para {disponibles} números')
+    if motor == 'numpy':
+        if np is None:
+            raise RuntimeError('El sorteo se hizo con NumPy y no está instalado')
+        orden = np.random.default_rng(semilla).permutation(disponibles)[:cantidad]
+        return (orden + PRIMER_NUMERO).tolist()
+    numeros = list(range(PRIMER_NUMERO, total_numeros + 1))
+    random.Random(semilla).shuffle(numeros)
+    return numeros[:cantidad]
+
+
+def verificar(registro):
+    """True si repetir el sorteo de `registro` (ver `BaseDatos.sorteos`) da los números guardados."""
+    numeros = sortear(len(registro['posiciones']), registro['total_numeros'], registro['semilla'], registro['motor'])
+    return numeros == registro['numeros']
+
+
+def _p_chi2(estadistico, grados):
+    """Cola superior de chi-cuadrado (aproximación de Wilson-Hilferty)."""
+    if grados <= 0:
+        return 1.0
+    c = 2.0 / (9.0 * grados)
+    z = ((estadistico / grados) ** (1.0 / 3.0) - (1.0 - c)) / math.sqrt(c)
+    return 0.5 * math.erfc(z / math.sqrt(2.0))
+
+
+def simular(cantidad, sorteos, semilla=None, bloque=None):
+    """Monte Carlo de `sorteos` sorteos de `cantidad` participantes.
+
+    Cuenta cuántas veces cada participante recibió cada posición de la
+    rotación y devuelve un dict con la matriz de conteos, la suma de Pearson,
+    el estadístico chi-cuadrado corregido frente a la distribución uniforme,
+    su valor p y la mayor desviación relativa observada. Requiere NumPy.
+    """
+    if np is None:
+        raise RuntimeError('La simulación requiere NumPy')
+    rng = np.random.default_rng(semilla if semilla is not None else nueva_semilla())
+    # Bloques de ~4 millones de celdas para acotar la memoria
+    bloque = bloque or max(1, 4_000_000 // cantidad)
+    base = np.arange(cantidad, dtype=np.int32)
+    # participante j con posición p -> celda j * cantidad + p
+    desplazamiento = base * cantidad
+    conteos = np.zeros(cantidad * cantidad, dtype=np.int64)
+    restantes = sorteos
+    while restantes:
+        n = min(bloque, restantes)
+        posiciones = rng.permuted(np.broadcast_to(base, (n, cantidad)), axis=1)
+        conteos += np.bincount((posiciones + desplazamiento).ravel(), minlength=cantidad * cantidad)
+        restantes -= n
+    conteos = conteos.reshape(cantidad, cantidad)
+
+    esperado = sorteos / cantidad
+    pearson = float(((conteos - esperado) ** 2).sum() / esperado)
+    # Cada sorteo llena una celda por fila y por columna a la vez, así que las
+    # celdas no son independientes: la suma de Pearson vale en promedio
+    # n(n-1), no (n-1)². Escalada por (n-1)/n sigue una chi-cuadrado con
+    # (n-1)² grados de libertad.
+    chi2 = pearson * (cantidad - 1) / cantidad
+    grados = (cantidad - 1) ** 2
+    return {
+        'conteos': conteos,
+        'esperado': esperado,
+        'pearson': pearson,
+        'chi2': chi2,
+        'grados': grados,
+        'p': _p_chi2(chi2, grados),
+        'desviacion_maxima': float(np.abs(conteos - esperado).max() / esperado),
+    }
@@ -0,0 +1,84 @@
+"""Pruebas de `cronograma.Cronograma`: fechas y actualización incremental."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip('numpy')
+
+from cronograma import SIN_RECEPTOR, Cronograma  # noqa: E402
+
+
+def integrantes(n):
+    return [{'nombre': f'Integrante {i + 1}', 'numero': str(i + 1)} for i in range(n)]
+
+
+def igual_a_recalcular(cronograma, inicio, periodo, cuota, cupos):
+    completo = Cronograma(inicio, periodo, cuota, cupos)
+    assert np.array_equal(cronograma.fechas, completo.fechas)
+    assert np.array_equal(cronograma.receptor, completo.receptor)
+    assert cronograma.filas(cupos) == completo.filas(cupos)
+
+
+def test_mensual_recorta_al_ultimo_dia_del_mes():
+    cronograma = Cronograma('31/01/2024', 'Mensual', 100, integrantes(4))
+    assert [f['fecha'] for f in cronograma.filas(integrantes(4))] == [
+        '31/01/2024', '29/02/2024', '31/03/2024', '30/04/2024']
+
+
+def test_fecha_invalida_queda_pendiente():
+    cronograma = Cronograma('sin fecha', 'Semanal', 50, integrantes(2))
+    assert [f['fecha'] for f in cronograma.filas(integrantes(2))] == ['Pendiente', 'Pendiente']
+
+
+def test_intercambio_de_numeros_solo_toca_sus_filas():
+    cupos = integrantes(6)
+    cronograma = Cronograma('01/03/2024', 'Semanal', 100, cupos)
+    cupos[1]['numero'], cupos[4]['numero'] = cupos[4]['numero'], cupos[1]['numero']
+    cronograma.marcar(1, 4)
+    assert cronograma.sincronizar(cupos) == {1, 4}
+    assert cronograma.receptor[1] == 4 and cronograma.receptor[4] == 1
+    igual_a_recalcular(cronograma, '01/03/2024', 'Semanal', 100, cupos)
+
+
+def test_numero_liberado_queda_sin_receptor():
+    cupos = integrantes(4)
+    cronograma = Cronograma('01/03/2024', 'Quincenal', 100, cupos)
+    cupos[2]['numero'] = ''
+    cronograma.marcar(2)
+    assert cronograma.sincronizar(cupos) == {2}
+    assert cronograma.receptor[2] == SIN_RECEPTOR
+    assert cronograma.filas(cupos, [2])[0]['receptor'] == 'Sin asignar'
+    igual_a_recalcular(cronograma, '01/03/2024', 'Quincenal', 100, cupos)
+
+
+def test_agregar_cupos_calcula_solo_los_periodos_nuevos():
+    cupos = integrantes(3)
+    cronograma = Cronograma('15/01/2024', 'Mensual', 80, cupos)
+    anteriores = cronograma.fechas.copy()
+    cupos = integrantes(5)
+    assert cronograma.sincronizar(cupos) == {3, 4}
+    assert np.array_equal(cronograma.fechas[:3], anteriores)
+    assert cronograma.pozo == 80 * 5
+    igual_a_recalcular(cronograma, '15/01/2024', 'Mensual', 80, cupos)
+
+
+def test_recortar_libera_las_filas_de_cupos_eliminados():
+    cupos = integrantes(5)
+    # El cupo 4 (posición 4) recibe el turno 1
+    cupos[0]['numero'], cupos[4]['numero'] = '5', '1'
+    cronograma = Cronograma('01/03/2024', 'Semanal', 100, cupos)
+    cupos = cupos[:3]
+    assert cronograma.sincronizar(cupos) == {0}
+    assert len(cronograma) == 3 and cronograma.receptor[0] == SIN_RECEPTOR
+    igual_a_recalcular(cronograma, '01/03/2024', 'Semanal', 100, cupos)
+
+
+def test_cambiar_fechas_solo_si_cambia_algo():
+    cupos = integrantes(3)
+    cronograma = Cronograma('01/03/2024', 'Semanal', 100, cupos)
+    assert not cronograma.cambiar_fechas('01/03/2024', 'Semanal')
+    assert cronograma.cambiar_fechas(periodo='Quincenal')
+    igual_a_recalcular(cronograma, '01/03/2024', 'Quincenal', 100, cupos)
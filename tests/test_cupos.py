@@ -0,0 +1,154 @@
+"""Pruebas de `cupos.TablaCupos` y del índice de búsqueda `cupos.IndiceCupos`."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cupos import CAMPOS_BUSQUEDA, IndiceCupos, TablaCupos, palabras_busqueda  # noqa: E402
+
+
+def tabla_llena(n):
+    cupos = TablaCupos()
+    cupos.redimensionar(n)
+    cupos.actualizar(0, ocupado=True, nombre='Organizador', numero=1)
+    for i in range(1, n):
+        cupos.ocupar_siguiente(nombre=f'Integrante {i}')
+    return cupos
+
+
+def verificar_indices(cupos):
+    numeros = [c.numero for c in cupos if c.numero]
+    assert len(numeros) == len(set(numeros)), numeros
+    assert cupos._por_numero == {c.numero: i for i, c in enumerate(cupos) if c.numero}
+
+
+def test_recortar_y_crecer_no_repite_numeros():
+    cupos = tabla_llena(6)
+    cupos.intercambiar_numeros(2, 6)
+    cupos.redimensionar(5)
+    cupos.redimensionar(6)
+    indice = cupos.ocupar_siguiente(nombre='Nuevo')
+    assert indice == 5
+    assert sorted(c.numero for c in cupos) == [1, 2, 3, 4, 5, 6]
+    assert cupos[5].numero == 2
+    verificar_indices(cupos)
+
+
+def test_crecer_devuelve_todos_los_numeros_faltantes():
+    cupos = tabla_llena(4)
+    cupos.redimensionar(2)
+    cupos.redimensionar(6)
+    for _ in range(4):
+        assert cupos.ocupar_siguiente(nombre='Nuevo') is not None
+    assert sorted(c.numero for c in cupos) == [1, 2, 3, 4, 5, 6]
+    verificar_indices(cupos)
+
+
+def test_cupo_liberado_conserva_su_numero():
+    cupos = tabla_llena(6)
+    cupos.actualizar(2, ocupado=False)
+    assert cupos.ocupar_siguiente(nombre='Nuevo') == 2
+    assert cupos[2].numero == 3
+    verificar_indices(cupos)
+
+
+def test_sin_cupo_vacio_no_ocupa():
+    cupos = tabla_llena(3)
+    assert cupos.ocupar_siguiente(nombre='Nuevo') is None
+    verificar_indices(cupos)
+
+
+def test_recorte_y_crecimiento_en_un_lote_anotan_los_cupos_nuevos():
+    cupos = tabla_llena(10)
+    entregas = []
+    cupos.observar(entregas.append)
+    with cupos.lote():
+        cupos.actualizar(2, nombre='Renombrado')
+        cupos.redimensionar(5)
+        cupos.redimensionar(8)
+    cambios, = entregas
+    assert cambios.recortada and cambios.completo
+    assert (cambios.tamano_anterior, cambios.tamano) == (10, 8)
+    assert cambios.indices == {2, 5, 6, 7}
+
+
+def test_observador_que_falla_no_corta_la_entrega(caplog):
+    cupos = tabla_llena(3)
+    entregas = []
+
+    def fallar(cambios):
+        raise ValueError('observador roto')
+    cupos.observar(fallar)
+    cupos.observar(entregas.append)
+    with caplog.at_level('ERROR', logger='cupos'):
+        with cupos.lote():
+            cupos.actualizar(1, nombre='Otro')
+    assert len(entregas) == 1
+    registro, = caplog.records
+    assert registro.exc_info[0] is ValueError
+
+
+INTEGRANTES = [
+    {'ocupado': True, 'nombre': 'Ana Pérez', 'dni': '45678912', 'telefono': '987 654 321',
+     'correo': 'ana.perez@correo.pe'},
+    {'ocupado': False, 'nombre': '', 'dni': '', 'telefono': '', 'correo': ''},
+    {'ocupado': True, 'nombre': 'Andrés Núñez', 'dni': '41234567', 'telefono': '912345678', 'correo': ''},
+    {'ocupado': True, 'nombre': 'Pedro Anaya', 'dni': None, 'telefono': None, 'correo': 'pedro@correo.pe'},
+]
+
+
+def buscar_recorriendo(cupos, texto):
+    """Búsqueda lineal de referencia: cada palabra es prefijo de alguna del cupo."""
+    resultado = []
+    for i, cupo in enumerate(cupos):
+        if not cupo.get('ocupado'):
+            continue
+        palabras = palabras_busqueda(' '.join(cupo.get(c) or '' for c in CAMPOS_BUSQUEDA))
+        if all(any(p.startswith(q) for p in palabras) for q in palabras_busqueda(texto)):
+            resultado.append(i)
+    return resultado
+
+
+def test_indice_busca_por_prefijo_sin_tildes_ni_mayusculas():
+    indice = IndiceCupos(INTEGRANTES)
+    assert len(indice) == 3
+    assert indice.buscar('an') == [0, 2, 3]
+    assert indice.buscar('ANDRES') == [2]
+    assert indice.buscar('núñ') == [2]
+    assert indice.buscar('456') == [0]
+    assert indice.buscar('987') == [0]
+    assert indice.buscar('correo') == [0, 3]
+    assert indice.buscar('xyz') == []
+
+
+def test_indice_exige_todas_las_palabras():
+    indice = IndiceCupos(INTEGRANTES)
+    assert indice.buscar('ana per') == [0]
+    assert indice.buscar('pe an') == [0, 3]
+    assert indice.buscar('ana 912') == []
+    # Sin palabras devuelve todos los cupos ocupados
+    assert indice.buscar('  ') == [0, 2, 3]
+
+
+def test_indice_coincide_con_el_recorrido_lineal():
+    indice = IndiceCupos(INTEGRANTES)
+    for texto in ('a', 'an', 'pe', 'p', 'co', '4', '41', 'ana correo', 'z', 'pedro anaya'):
+        assert indice.buscar(texto) == buscar_recorriendo(INTEGRANTES, texto), texto
+
+
+def test_indice_actualiza_un_cupo_sin_reconstruir():
+    cupos = [dict(c) for c in INTEGRANTES]
+    indice = IndiceCupos(cupos)
+    cupos[1].update(ocupado=True, nombre='Anabel Ríos')
+    indice.actualizar(1, cupos[1])
+    cupos[0].update(nombre='Beatriz Pérez', correo='')
+    indice.actualizar(0, cupos[0])
+    indice.actualizar(3, None)
+    cupos[3] = {'ocupado': False}
+    assert indice.buscar('ana') == [1]
+    assert indice.buscar('bea') == [0]
+    assert indice.buscar('pedro') == []
+    reconstruido = IndiceCupos(cupos)
+    assert indice._prefijos == reconstruido._prefijos
+    for texto in ('a', 'r', 'pe', '4', 'correo'):
+        assert indice.buscar(texto) == buscar_recorriendo(cupos, texto), texto
@@ -0,0 +1,113 @@
+"""Pruebas de las lecturas en el hilo escritor de `database.BaseDatos`."""
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import SQL_PAGOS_CUPO, BaseDatos  # noqa: E402
+
+JUNTA = '0' * 32
+
+
+def base(tmp_path):
+    db = BaseDatos(str(tmp_path / 'savi.db'))
+    db.guardar_junta({'id': JUNTA, 'nombre': 'Junta', 'monto': '50', 'moneda': 'Soles',
+                      'periodo': 'Semanal', 'fecha_inicio': '', 'fecha_final': '', 'creada': 0})
+    return db
+
+
+def pedir_pagos(db, cupo):
+    listo = threading.Event()
+    resultado = {}
+
+    def recibir(filas):
+        resultado['filas'] = filas
+        resultado['hilo'] = threading.current_thread()
+        listo.set()
+
+    db.pagos_cupo(JUNTA, cupo, recibir)
+    assert listo.wait(5)
+    return resultado
+
+
+def test_historial_del_cupo_incluye_los_pagos_encolados(tmp_path):
+    db = base(tmp_path)
+    for periodo in range(3):
+        db.agregar_pago(JUNTA, 1, periodo, 50.0, 100.0 + periodo)
+        db.agregar_pago(JUNTA, 2, periodo, 50.0, 200.0 + periodo)
+    # Sin esperar a la cola: la lectura va detrás de los pagos
+    resultado = pedir_pagos(db, 1)
+    assert resultado['filas'] == [(0, 50.0, 100.0), (1, 50.0, 101.0), (2, 50.0, 102.0)]
+    assert resultado['hilo'] is not threading.main_thread()
+    assert pedir_pagos(db, 3)['filas'] == []
+    db.cerrar()
+
+
+def test_historial_usa_el_indice_por_cupo(tmp_path):
+    db = base(tmp_path)
+    db.esperar()
+    plan = db._conexion.execute(
+        "EXPLAIN QUERY PLAN " + SQL_PAGOS_CUPO,
+        (JUNTA, 1)).fetchall()
+    detalle = ' '.join(fila[-1] for fila in plan)
+    assert 'idx_pagos_cupo' in detalle and 'TEMP B-TREE' not in detalle
+    db.cerrar()
+
+
+def test_recorte_guarda_solo_el_recorte_y_los_cambios(tmp_path):
+    from cupos import TablaCupos
+
+    db = BaseDatos(str(tmp_path / 'savi.db'), registrar_cambios=True)
+    db.guardar_junta({'id': JUNTA, 'nombre': 'Junta', 'monto': '50', 'moneda': 'Soles',
+                      'periodo': 'Semanal', 'fecha_inicio': '', 'fecha_final': '', 'creada': 0})
+    cupos = TablaCupos()
+    cupos.redimensionar(100)
+    db.guardar_cupos(JUNTA, cupos)
+    db.esperar()
+    db.confirmar_cambios(max(c['orden'] for c in db.cambios_pendientes()))
+
+    def guardar(cambios):
+        # Como `SaviApp._cupos_cambiados`
+        if cambios.recortada:
+            db.recortar_cupos(JUNTA, len(cupos))
+        db.guardar_cupos(JUNTA, cupos, sorted(cambios.indices))
+
+    cupos.observar(guardar)
+    with cupos.lote():
+        cupos.actualizar(3, ocupado=True, nombre='Ana')
+        cupos.redimensionar(40)
+        cupos.redimensionar(45)
+    db.esperar()
+    pendientes = db.cambios_pendientes()
+    assert sorted((c['entidad'], c['clave']) for c in pendientes) == (
+        [('cupo', str(i)) for i in (3, 40, 41, 42, 43, 44)] + [('recorte', '')])
+    guardados = db.cargar_junta(JUNTA)['cupos']
+    assert len(guardados) == 45
+    assert guardados[3]['nombre'] == 'Ana'
+    db.cerrar()
+
+
+def test_un_cupo_libre_no_hereda_los_pagos_del_anterior(tmp_path):
+    from cupos import Cupo
+
+    db = base(tmp_path)
+    cupos = [Cupo(ocupado=True, nombre=n, numero=i + 1) for i, n in enumerate(('Org', 'Ana', 'Beto'))]
+    db.guardar_cupos(JUNTA, cupos)
+    for cupo in range(3):
+        db.agregar_pago(JUNTA, cupo, 0, 50.0, 100.0)
+    db.agregar_pago(JUNTA, 1, 1, 50.0, 101.0)
+
+    # Editar a un integrante no toca sus pagos
+    cupos[1].telefono = '999'
+    db.guardar_cupos(JUNTA, cupos, [1])
+    # Ana deja el cupo y Beto sale con el recorte
+    cupos[1] = Cupo()
+    db.guardar_cupos(JUNTA, cupos, [1])
+    db.recortar_cupos(JUNTA, 2)
+    db.esperar()
+    saldos_cupo, saldos_periodo = db.saldos_pagos(JUNTA)
+    assert saldos_cupo == [(0, 50.0, 1)]
+    assert sorted(saldos_periodo) == [(0, 50.0), (1, 0.0)]
+    assert pedir_pagos(db, 1)['filas'] == []
+    db.cerrar()
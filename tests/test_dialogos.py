@@ -0,0 +1,125 @@
+"""Pruebas de `dialogos.py`: el pool arma cada diálogo una vez y cada apertura empieza limpia."""
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+pytest.importorskip('kivymd')
+
+from kivy.clock import Clock  # noqa: E402
+
+import dialogos  # noqa: E402
+from dialogos import PoolDialogos  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def app():
+    from kivy.core.window import Window
+    from kivymd.app import MDApp
+    if Window is None:
+        pytest.skip('sin ventana de Kivy')
+    # Los widgets de KivyMD toman el tema de la app en curso
+    return MDApp()
+
+
+@pytest.fixture
+def fabricas(app, monkeypatch):
+    """Cuenta cuántas veces se arma cada tipo de diálogo."""
+    armados = []
+
+    def contar(nombre, fabrica):
+        def armar():
+            armados.append(nombre)
+            return fabrica()
+        return armar
+    for nombre, fabrica in list(dialogos.FABRICAS.items()):
+        monkeypatch.setitem(dialogos.FABRICAS, nombre, contar(nombre, fabrica))
+    return armados
+
+
+def esperar(condicion, limite=5):
+    fin = time.monotonic() + limite
+    while not condicion() and time.monotonic() < fin:
+        Clock.tick()
+        time.sleep(0.01)
+    return condicion()
+
+
+def cerrar(dialogo):
+    dialogo.cerrar()
+    assert esperar(lambda: not dialogo.abierto)
+
+
+def test_el_pool_arma_cada_tipo_una_sola_vez(fabricas):
+    pool = PoolDialogos()
+    assert 'intercambio' not in pool
+    primero = pool.obtener('intercambio')
+    assert pool.obtener('intercambio') is primero
+    assert 'intercambio' in pool
+    assert fabricas == ['intercambio']
+
+
+def test_precalentar_arma_en_segundo_plano_sin_repetir(fabricas):
+    pool = PoolDialogos()
+    pool.obtener('intercambio')
+    pool.precalentar('edicion', 'intercambio', 'edicion', 'cantidad_cupos')
+    # Nada se arma en el acto: espera a que la pantalla quede quieta
+    assert fabricas == ['intercambio']
+    assert esperar(lambda: 'edicion' in pool and 'cantidad_cupos' in pool)
+    assert fabricas == ['intercambio', 'edicion', 'cantidad_cupos']
+    pool.obtener('edicion')
+    assert fabricas.count('edicion') == 1
+
+
+def test_una_apertura_no_hereda_campos_ni_acciones_de_la_anterior(app):
+    dialogo = dialogos.crear_edicion()
+    guardados, escritos = [], []
+    dialogo.abrir(textos={'titulo': 'Cupo 2'}, valores={'nombre': 'Ana', 'dni': '45678912'},
+                  acciones={'guardar': lambda: guardados.append(dialogo.campos['nombre'].text)},
+                  al_escribir={'dni': lambda campo, texto: escritos.append(texto)})
+    assert dialogo.abierto and dialogo.apertura == 1
+    assert escritos == ['45678912']
+    dialogo.campos['dni'].text = '4567'
+    assert escritos[-1] == '4567'
+    dialogo.botones['guardar'].dispatch('on_release')
+    assert guardados == ['Ana']
+    cerrar(dialogo)
+
+    # Al cerrar se sueltan las acciones: el mismo botón ahora solo cierra
+    dialogo.campos['dni'].text = '1'
+    assert escritos[-1] == '4567'
+    dialogo.abrir(valores={'nombre': 'Beto'})
+    assert dialogo.apertura == 2
+    assert dialogo.etiquetas['titulo'].text == 'Cupo 2'
+    assert dialogo.campos['nombre'].text == 'Beto' and dialogo.campos['dni'].text == ''
+    dialogo.botones['guardar'].dispatch('on_release')
+    assert guardados == ['Ana']
+    assert esperar(lambda: not dialogo.abierto)
+
+
+def test_ocultar_etiquetas_y_botones_solo_en_esa_apertura(app):
+    dialogo = dialogos.crear_edicion()
+    pagos, pagar = dialogo.etiquetas['pagos'], dialogo.botones['pagar']
+    dialogo.abrir(ocultos=('pagos', 'pagar'))
+    assert pagos.parent is None and pagar.parent is None
+    cerrar(dialogo)
+    dialogo.abrir()
+    assert pagos.parent is dialogo.contenido and pagar.parent is not None
+    # El orden del contenido se conserva al volver a mostrarlas
+    assert list(reversed(dialogo.contenido.children)) == dialogo._orden_contenido
+    cerrar(dialogo)
+
+
+def test_reabrir_mientras_se_cierra_queda_abierto(app):
+    dialogo = dialogos.crear_confirmar_union()
+    dialogo.abrir(textos={'nombre': 'Primera'})
+    dialogo.cerrar()
+    dialogo.abrir(textos={'nombre': 'Segunda'})
+    # Deja pasar lo que habría durado la animación de cierre
+    assert not esperar(lambda: not dialogo.abierto, limite=0.6)
+    assert dialogo.abierto and dialogo.etiquetas['nombre'].text == 'Segunda'
+    cerrar(dialogo)
@@ -0,0 +1,112 @@
+"""Pruebas de los códigos de invitación: control Luhn mod 32, permutación e índice."""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import nuevo_id  # noqa: E402
+from invitaciones import (  # noqa: E402
+    ALFABETO, CAPACIDAD, SIMBOLOS, IndiceCodigos, Permutacion, clave_dispositivo, codificar, decodificar,
+    digito_control, normalizar_codigo,
+)
+
+
+def simbolos(codigo):
+    return list(codigo.replace('SAVI-', '').replace('-', ''))
+
+
+def armar(lista):
+    texto = ''.join(lista)
+    return f'SAVI-{texto[:4]}-{texto[4:]}'
+
+
+def test_codificar_y_decodificar_son_inversas():
+    for valor in (0, 1, 31, 32, CAPACIDAD // 2, CAPACIDAD - 1):
+        codigo = codificar(valor)
+        assert len(simbolos(codigo)) == SIMBOLOS + 1
+        assert decodificar(codigo) == valor
+    # Lectura tolerante: minúsculas, sin guiones, O por 0
+    codigo = codificar(0)
+    assert decodificar(codigo.lower().replace('-', '').replace('0', 'o')) == 0
+    assert normalizar_codigo(f'https://savi.app/unirse?codigo={codigo.lower()}') == codigo
+
+
+def test_el_control_detecta_cualquier_simbolo_cambiado():
+    rng = random.Random(1)
+    for _ in range(50):
+        original = simbolos(codificar(rng.randrange(CAPACIDAD)))
+        for i, actual in enumerate(original):
+            for otro in ALFABETO:
+                if otro != actual:
+                    cambiado = original[:i] + [otro] + original[i + 1:]
+                    assert decodificar(armar(cambiado)) is None
+
+
+def test_el_control_detecta_casi_todas_las_transposiciones():
+    rng = random.Random(2)
+    detectadas = total = 0
+    for _ in range(500):
+        original = simbolos(codificar(rng.randrange(CAPACIDAD)))
+        for i in range(len(original) - 1):
+            if original[i] == original[i + 1]:
+                continue
+            cambiado = original[:]
+            cambiado[i], cambiado[i + 1] = cambiado[i + 1], cambiado[i]
+            total += 1
+            detectadas += decodificar(armar(cambiado)) is None
+    assert detectadas / total > 0.9
+
+
+def test_el_control_cierra_la_suma_luhn_mod_32():
+    for valor in (0, 12345, CAPACIDAD - 1):
+        valores = [ALFABETO.index(c) for c in simbolos(codificar(valor))]
+        datos, control = valores[:SIMBOLOS], valores[SIMBOLOS]
+        assert control == digito_control(datos)
+        # Desde la derecha, sin contar el control, uno sí y uno no se duplica
+        suma = control
+        for i, v in enumerate(reversed(datos)):
+            suma += (2 * v) // 32 + (2 * v) % 32 if i % 2 == 0 else v
+        assert suma % 32 == 0
+
+
+def test_la_permutacion_se_invierte_y_no_repite():
+    permutacion = Permutacion('prueba')
+    rng = random.Random(3)
+    muestras = [0, 1, 2, CAPACIDAD - 1] + [rng.randrange(CAPACIDAD) for _ in range(2000)]
+    for n in muestras:
+        x = permutacion.aplicar(n)
+        assert 0 <= x < CAPACIDAD
+        assert permutacion.invertir(x) == n
+    secuencia = [permutacion.aplicar(n) for n in range(5000)]
+    assert len(set(secuencia)) == len(secuencia)
+    # Otra clave reparte otros códigos
+    otra = Permutacion('otra')
+    assert [otra.aplicar(n) for n in range(10)] != secuencia[:10]
+
+
+def test_indice_asigna_busca_y_libera():
+    indice = IndiceCodigos('prueba')
+    ids = [nuevo_id() for _ in range(100)]
+    codigos = [indice.asignar(junta_id) for junta_id in ids]
+    assert len(set(codigos)) == 100
+    assert all(indice.buscar(c) == j for c, j in zip(codigos, ids))
+    indice.liberar(codigos[5])
+    assert indice.buscar(codigos[5]) is None
+
+    # Recargado desde la base resuelve igual
+    recargado = IndiceCodigos('prueba')
+    recargado.cargar([(c, j) for c, j in zip(codigos, ids) if c != codigos[5]])
+    assert recargado.buscar(codigos[7]) == ids[7]
+    assert recargado.asignar(nuevo_id()) not in codigos
+
+
+def test_dispositivos_distintos_no_reparten_los_mismos_codigos():
+    uno = IndiceCodigos(clave_dispositivo(nuevo_id()))
+    otro = IndiceCodigos(clave_dispositivo(nuevo_id()))
+    junta_uno, junta_otro = nuevo_id(), nuevo_id()
+    codigo_uno, codigo_otro = uno.asignar(junta_uno), otro.asignar(junta_otro)
+    assert codigo_uno != codigo_otro
+    # Un código de otro índice no se confunde con uno propio
+    assert otro.buscar(codigo_uno) is None
+    assert uno.buscar(codigo_otro) is None
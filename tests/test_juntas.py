@@ -0,0 +1,89 @@
+"""Pruebas del índice de búsqueda y orden de 'Mis juntas' (`juntas.IndiceJuntas`)."""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from juntas import CRITERIOS, IndiceJuntas, monto_numerico, normalizar  # noqa: E402
+
+NOMBRES = ['Viaje a Cañete', 'Ahorro casa', 'Junta del barrio', 'Viajeros', 'Casa de playa', 'Fiesta']
+PERIODOS = ['Semanal', 'Quincenal', 'Mensual']
+
+
+def juntas_al_azar(n, semilla=0):
+    rng = random.Random(semilla)
+    return [{'id': f'{i:032x}', 'nombre': f'{rng.choice(NOMBRES)} {i}',
+             'monto': f'S/ {rng.randrange(50, 5000):,}.00', 'periodo': rng.choice(PERIODOS),
+             'creada': rng.random()} for i in range(n)]
+
+
+def referencia(juntas, texto, orden, descendente):
+    """`buscar` recorriendo todo, sin índice."""
+    indice = IndiceJuntas()
+    palabras = normalizar(texto).split()
+    filas = []
+    for junta in juntas:
+        claves, tokens = indice._indexar(junta)
+        if all(any(t.startswith(p) for t in tokens) for p in palabras):
+            filas.append((claves[orden], junta['id']))
+    return [junta_id for _, junta_id in sorted(filas, reverse=descendente)]
+
+
+def test_normalizar_y_monto():
+    assert normalizar('Viaje a Cañete') == 'viaje a canete'
+    assert monto_numerico('S/ 1,200.50') == 1200.5
+    assert monto_numerico('') == 0.0
+
+
+@pytest.mark.parametrize('orden', CRITERIOS)
+@pytest.mark.parametrize('texto', ['', 'via', 'canete', 'casa 1', 'S/ 1', 'xyz'])
+def test_buscar_coincide_con_recorrer_todo(orden, texto):
+    juntas = juntas_al_azar(300)
+    indice = IndiceJuntas()
+    indice.cargar(juntas)
+    for descendente in (False, True):
+        assert indice.buscar(texto, orden, descendente) == referencia(juntas, texto, orden, descendente)
+
+
+def test_agregar_y_quitar_mantienen_el_orden():
+    juntas = juntas_al_azar(200, semilla=1)
+    indice = IndiceJuntas()
+    for junta in juntas:
+        indice.agregar(junta)
+    for junta in juntas[::3]:
+        indice.quitar(junta['id'])
+    quedan = [j for i, j in enumerate(juntas) if i % 3]
+    assert len(indice) == len(quedan)
+    assert indice.buscar('viaj', 'monto') == referencia(quedan, 'viaj', 'monto', False)
+    # Reindexar con otro nombre no deja restos del anterior
+    renombrada = dict(quedan[0], nombre='Otra cosa')
+    indice.agregar(renombrada)
+    assert quedan[0]['id'] in indice.buscar('otra')
+    assert len(indice) == len(quedan)
+
+
+@pytest.mark.parametrize('orden', CRITERIOS)
+def test_posicion_inserta_donde_la_pondria_buscar(orden):
+    juntas = juntas_al_azar(150, semilla=2)
+    for descendente in (False, True):
+        for texto in ('', 'casa'):
+            indice = IndiceJuntas()
+            indice.cargar(juntas[:-10])
+            mostradas = indice.buscar(texto, orden, descendente)
+            for junta in juntas[-10:]:
+                indice.agregar(junta)
+                if indice.coincide(junta['id'], texto):
+                    mostradas.insert(indice.posicion(mostradas, junta['id'], orden, descendente), junta['id'])
+            assert mostradas == indice.buscar(texto, orden, descendente)
+
+
+def test_coincide():
+    indice = IndiceJuntas()
+    indice.agregar({'id': 'a' * 32, 'nombre': 'Viaje a Cañete', 'monto': 'S/ 1,200.00', 'periodo': 'Mensual'})
+    assert indice.coincide('a' * 32, '')
+    assert indice.coincide('a' * 32, 'CAÑ vi')
+    assert indice.coincide('a' * 32, '1200')
+    assert not indice.coincide('a' * 32, 'playa')
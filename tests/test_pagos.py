@@ -0,0 +1,51 @@
+"""Pruebas de `pagos.LibroPagos` y de las fechas compartidas con `cronograma.py`."""
+import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pagos import LibroPagos, parsear_fecha, periodos_vencidos  # noqa: E402
+
+
+def test_saldos_y_estado():
+    libro = LibroPagos('j')
+    libro.cargar_saldos([(0, 100.0, 2), (1, 50.0, 1)], [(0, 100.0), (1, 50.0)])
+    assert len(libro) == 3
+    assert libro.siguiente_periodo(0, 50.0) == 2
+    assert libro.estado(1, 50.0, 2) == ("Debe 50.00", True)
+    assert libro.estado(0, 50.0, 2) == ("Al día", False)
+    libro.registrar(1, 1, 50.0, creado=1.0)
+    assert libro.estado(1, 50.0, 2) == ("Al día", False)
+    assert libro.recaudado == {0: 100.0, 1: 100.0} and len(libro) == 4
+
+
+def test_vaciar_olvida_los_pagos_del_cupo():
+    libro = LibroPagos('j')
+    libro.cargar_saldos([(0, 100.0, 2), (1, 50.0, 1)], [(0, 150.0)])
+    assert libro.vaciar([1, 5])
+    assert not libro.vaciar([1])
+    assert libro.pagado == {0: 100.0} and len(libro) == 2
+    # Quien ocupe el cupo 1 empieza sin pagos
+    assert libro.estado(1, 50.0, 0) == ("", False)
+    libro.cargar_recaudado([(0, 100.0)])
+    assert libro.recaudado == {0: 100.0}
+
+
+def test_fechas_y_periodos_vencidos():
+    assert parsear_fecha('31/01/2026') == datetime.date(2026, 1, 31)
+    assert parsear_fecha('31/02/2026') is None and parsear_fecha('') is None
+    hoy = datetime.date(2026, 3, 1)
+    assert periodos_vencidos('01/01/2026', 'Semanal', 52, hoy) == 9
+    # Mensual desde el 31: febrero vence el 28
+    assert periodos_vencidos('31/01/2026', 'Mensual', 12, datetime.date(2026, 2, 28)) == 2
+    assert periodos_vencidos('31/01/2026', 'Mensual', 12, datetime.date(2026, 2, 27)) == 1
+    assert periodos_vencidos('Pendiente', 'Mensual', 12, hoy) == 0
+
+
+def test_cronograma_usa_las_mismas_fechas():
+    import numpy as np
+    from cronograma import parsear_fecha as fecha_numpy
+
+    assert fecha_numpy('31/01/2026') == np.datetime64('2026-01-31')
+    assert np.isnat(fecha_numpy('31/02/2026'))
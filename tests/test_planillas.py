@@ -0,0 +1,35 @@
+"""Pruebas de la exportación por partes de `planillas.py`."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import planillas  # noqa: E402
+from cupos import TablaCupos  # noqa: E402
+
+
+def tabla(n):
+    cupos = TablaCupos()
+    cupos.redimensionar(n + 1)
+    for i in range(n):
+        cupos.ocupar_siguiente(nombre=f'Persona {i}', dni=f'{10000000 + i}')
+    return cupos
+
+
+def test_filas_exportar_es_una_copia_de_los_ocupados():
+    cupos = tabla(3)
+    filas = planillas.filas_exportar(cupos)
+    cupos.actualizar(0, nombre='Cambiado')
+    assert len(filas) == 3
+    assert filas[0][planillas.CAMPOS.index('nombre')] == 'Persona 0'
+
+
+def test_escribir_avisa_el_avance_y_se_puede_volver_a_importar(tmp_path):
+    filas = planillas.filas_exportar(tabla(25))
+    for extension in ('csv', 'jsonl'):
+        ruta = str(tmp_path / f'integrantes.{extension}')
+        avances = []
+        assert planillas.escribir(filas, ruta, avances.append, tamano=10) == 25
+        assert avances == [10, 20]
+        leidos = [fila for validos, _ in planillas.leer_lotes(ruta) for fila in validos]
+        assert [f['dni'] for f in leidos] == [str(10000000 + i) for i in range(25)]
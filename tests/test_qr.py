@@ -0,0 +1,100 @@
+"""Pruebas de `qr.py`: matriz, buffer de luminancia, caché LRU y generación en segundo plano."""
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+pytest.importorskip('kivy')
+qrcode = pytest.importorskip('qrcode')
+
+from kivy.clock import Clock  # noqa: E402
+
+import qr  # noqa: E402
+from qr import BLANCO, NEGRO, CacheTexturasQR, buffer_luminancia, matriz_qr  # noqa: E402
+
+
+def esperar(condicion, limite=5):
+    fin = time.monotonic() + limite
+    while not condicion() and time.monotonic() < fin:
+        Clock.tick()
+        time.sleep(0.01)
+    return condicion()
+
+
+def test_buffer_un_byte_por_pixel_y_filas_de_abajo_hacia_arriba():
+    matriz = [[True, False], [False, False]]
+    buffer, lado = buffer_luminancia(matriz, tamano_modulo=3)
+    assert lado == 6 and len(buffer) == lado * lado
+    filas = [buffer[i:i + lado] for i in range(0, len(buffer), lado)]
+    # La primera fila de la matriz queda arriba, es decir, al final del buffer
+    assert filas[:3] == [BLANCO * 6] * 3
+    assert filas[3:] == [NEGRO * 3 + BLANCO * 3] * 3
+
+
+def test_buffer_coincide_con_la_matriz_del_qr():
+    matriz = matriz_qr('https://savi.app/unirse?codigo=SAVI-1234-5678')
+    buffer, lado = buffer_luminancia(matriz, tamano_modulo=1)
+    assert lado == len(matriz) == len(matriz[0])
+    assert set(buffer) <= {NEGRO[0], BLANCO[0]}
+    for y, fila in enumerate(reversed(matriz)):
+        esperado = bytes(NEGRO[0] if modulo else BLANCO[0] for modulo in fila)
+        assert buffer[y * lado:(y + 1) * lado] == esperado
+    # Borde blanco de dos módulos alrededor
+    assert not any(matriz[0]) and not any(matriz[1]) and not any(fila[0] for fila in matriz)
+
+
+def test_cache_lru_descarta_el_menos_usado():
+    cache = CacheTexturasQR(capacidad=2)
+    a, b, c = (cache.clave(contenido) for contenido in 'abc')
+    cache.guardar(a, 'textura a')
+    cache.guardar(b, 'textura b')
+    assert cache.buscar(a) == 'textura a'  # `a` pasa a ser la más reciente
+    cache.guardar(c, 'textura c')
+    assert len(cache) == 2
+    assert cache.buscar(b) is None
+    assert cache.buscar(a) == 'textura a' and cache.buscar(c) == 'textura c'
+
+
+def test_la_clave_distingue_los_parametros_de_dibujo():
+    assert CacheTexturasQR.clave('x', 10) != CacheTexturasQR.clave('x', 8)
+    assert CacheTexturasQR.clave('x', borde=2) != CacheTexturasQR.clave('x', borde=4)
+
+
+def test_async_entrega_en_el_hilo_principal_y_luego_usa_la_cache(monkeypatch):
+    # La textura real necesita contexto GL; aquí basta con registrar el buffer
+    creadas = []
+    monkeypatch.setattr(qr, 'crear_textura', lambda buffer, lado: creadas.append((len(buffer), lado)) or lado)
+    cache = CacheTexturasQR()
+    texturas = []
+    trabajo = cache.obtener_async('SAVI-1234-5678', texturas.append, tamano_modulo=2)
+    assert trabajo is not None and texturas == []
+    assert esperar(lambda: texturas)
+    lado = texturas[0]
+    assert creadas == [(lado * lado, lado)]
+    assert cache.obtener_async('SAVI-1234-5678', texturas.append, tamano_modulo=2) is None
+    assert texturas == [lado, lado] and len(creadas) == 1
+
+
+def test_un_contenido_que_no_cabe_avisa_en_vez_de_esperar_siempre():
+    cache = CacheTexturasQR()
+    errores, texturas = [], []
+    trabajo = cache.obtener_async('x' * 5000, texturas.append, al_fallar=errores.append)
+    assert esperar(lambda: errores)
+    assert texturas == [] and len(cache) == 0
+    assert isinstance(errores[0], (ValueError, qrcode.exceptions.DataOverflowError))
+    assert trabajo is not None
+
+
+def test_un_trabajo_cancelado_no_entrega_el_error():
+    cache = CacheTexturasQR()
+    errores = []
+    trabajo = cache.obtener_async('y' * 5000, lambda textura: None, al_fallar=errores.append)
+    trabajo.cancelar()
+    cache._hilo.shutdown(wait=True)
+    for _ in range(3):
+        Clock.tick()
+    assert errores == []
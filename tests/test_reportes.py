@@ -0,0 +1,76 @@
+"""Pruebas del puntaje de riesgo por DNI y de la carga en segundo plano de `reportes.py`."""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import BaseDatos  # noqa: E402
+from reportes import UMBRAL_ALERTA, VIDA_MEDIA_DIAS, Historial, RegistroReportes, describir  # noqa: E402
+
+DIA = 86400
+VIDA_MEDIA = VIDA_MEDIA_DIAS * DIA
+
+
+def test_el_puntaje_se_reduce_a_la_mitad_cada_vida_media():
+    historial = Historial()
+    historial.sumar(1000.0)
+    assert historial.puntaje_en(1000.0) == pytest.approx(1.0)
+    assert historial.puntaje_en(1000.0 + VIDA_MEDIA) == pytest.approx(0.5)
+    assert historial.puntaje_en(1000.0 + 2 * VIDA_MEDIA) == pytest.approx(0.25)
+    # Antes del último reporte no crece
+    assert historial.puntaje_en(0.0) == pytest.approx(1.0)
+
+
+def test_el_orden_de_los_reportes_no_cambia_el_puntaje():
+    fechas = [0.0, 10 * DIA, 400 * DIA, 90 * DIA, 5 * DIA]
+    en_orden, desordenado = Historial(), Historial()
+    for creado in sorted(fechas):
+        en_orden.sumar(creado)
+    for creado in fechas:
+        desordenado.sumar(creado)
+    ahora = 500 * DIA
+    assert desordenado.cantidad == en_orden.cantidad == 5
+    assert desordenado.ultimo == en_orden.ultimo == 400 * DIA
+    assert desordenado.puntaje_en(ahora) == pytest.approx(en_orden.puntaje_en(ahora))
+    esperado = sum(0.5 ** ((ahora - f) / VIDA_MEDIA) for f in fechas)
+    assert en_orden.puntaje_en(ahora) == pytest.approx(esperado)
+
+
+def test_alerta_y_descripcion(tmp_path):
+    db = BaseDatos(str(tmp_path / 'savi.db'))
+    registro = RegistroReportes()
+    registro.cargar(db)
+    db.cerrar()
+    registro.agregar('123', creado=0.0)
+    assert registro.alerta('123', ahora=VIDA_MEDIA) is not None
+    # Pasadas dos vidas medias un solo reporte ya no avisa
+    assert registro.alerta('123', ahora=2 * VIDA_MEDIA + DIA) is None
+    assert UMBRAL_ALERTA == 0.25
+    assert registro.alerta('999') is None and registro.alerta('') is None
+    assert describir(registro.consultar('123'), ahora=3 * DIA) == '1 reporte, el último hace 3 días'
+
+
+def test_nada_espera_a_la_carga_y_lo_encolado_se_suma_al_terminar(tmp_path):
+    db = BaseDatos(str(tmp_path / 'savi.db'))
+    for creado in (1.0, 2.0):
+        db.agregar_reporte('111', 'No pagó', creado=creado)
+    db.esperar()
+
+    registro = RegistroReportes()
+    # Antes de cargar: sin datos y sin bloquear
+    assert registro.consultar('111') is None
+    guardados = []
+    assert registro.agregar('111', 3.0, guardados.append) is None
+    assert guardados == []
+
+    hilo = threading.Thread(target=registro.cargar, args=(db,))
+    hilo.start()
+    hilo.join(5)
+    assert [h.cantidad for h in guardados] == [3]
+    assert registro.consultar('111').cantidad == 3
+    # Ya cargado, se suma en el acto
+    assert registro.agregar('222', 4.0).cantidad == 1
+    db.cerrar()
@@ -0,0 +1,171 @@
+"""Pruebas de las rutas de `servidor.py` sobre HTTP real."""
+import gzip
+import http.client
+import json
+import os
+import sys
+from urllib.parse import urlsplit
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from invitaciones import codificar  # noqa: E402
+from servidor import MAX_CUERPO, ServidorEnHilo  # noqa: E402
+
+
+@pytest.fixture
+def servidor(tmp_path):
+    servidor = ServidorEnHilo(str(tmp_path / 'servidor.db'))
+    yield servidor
+    servidor.detener()
+
+
+@pytest.fixture
+def pedir(servidor):
+    """`pedir(metodo, ruta, cuerpo, cabeceras)` -> (estado, json o None, cabeceras en minúsculas)."""
+    partes = urlsplit(servidor.url)
+    conexion = http.client.HTTPConnection(partes.hostname, partes.port, timeout=5)
+
+    def pedir(metodo, ruta, cuerpo=None, cabeceras=None):
+        datos = cuerpo if isinstance(cuerpo, bytes) or cuerpo is None else json.dumps(cuerpo).encode('utf-8')
+        conexion.request(metodo, ruta, body=datos, headers=cabeceras or {})
+        respuesta = conexion.getresponse()
+        contenido = respuesta.read()
+        encabezados = {k.lower(): v for k, v in respuesta.getheaders()}
+        if encabezados.get('content-encoding') == 'gzip':
+            contenido = gzip.decompress(contenido)
+        return respuesta.status, json.loads(contenido) if contenido else None, encabezados
+
+    yield pedir
+    conexion.close()
+
+
+def crear(pedir, cupos=3, **datos):
+    estado, junta, _ = pedir('POST', '/juntas', dict({'nombre': 'Junta', 'cupos': cupos, 'monto': '100',
+                                                      'organizador': 'Eva'}, **datos))
+    assert estado == 201
+    return junta
+
+
+def test_crear_junta_y_resolver_su_codigo(pedir):
+    junta = crear(pedir)
+    assert set(junta) == {'id', 'codigo', 'clave'}
+    assert pedir('GET', f"/invitaciones/{junta['codigo']}")[:2] == (200, {'junta_id': junta['id']})
+    # El código de la junta es siempre el mismo
+    assert pedir('POST', f"/juntas/{junta['id']}/invitacion")[:2] == (200, {'codigo': junta['codigo']})
+
+
+def test_crear_junta_valida_los_datos(pedir):
+    assert pedir('POST', '/juntas', {'nombre': '', 'cupos': 3})[:2] == (400, {'error': 'datos_invalidos'})
+    assert pedir('POST', '/juntas', {'nombre': 'X', 'cupos': 0})[0] == 400
+    assert pedir('POST', '/juntas', {'nombre': 'X', 'cupos': 'muchos'})[0] == 400
+    assert pedir('POST', '/juntas', b'[1, 2]')[:2] == (400, {'error': 'json_invalido'})
+    assert pedir('POST', '/juntas', b'{no es json')[:2] == (400, {'error': 'json_invalido'})
+
+
+def test_codigo_mal_formado_o_inexistente(pedir):
+    codigo = crear(pedir)['codigo']
+    # Mismo código con el símbolo de control cambiado
+    alterado = codigo[:-1] + ('A' if codigo[-1] != 'A' else 'B')
+    assert pedir('GET', f'/invitaciones/{alterado}')[:2] == (400, {'error': 'codigo_invalido'})
+    assert pedir('GET', '/invitaciones/hola')[:2] == (400, {'error': 'codigo_invalido'})
+    # Bien formado (control correcto) pero de ninguna junta
+    assert pedir('GET', f'/invitaciones/{codificar(987654)}')[:2] == (404, {'error': 'codigo_inexistente'})
+
+
+def test_vista_previa_y_rutas_desconocidas(pedir):
+    junta = crear(pedir, cupos=4, moneda='Dólares')
+    estado, vista, _ = pedir('GET', f"/juntas/{junta['id']}")
+    assert estado == 200
+    assert vista['nombre'] == 'Junta' and vista['moneda'] == 'Dólares' and vista['organizador'] == 'Eva'
+    assert (vista['ocupados'], vista['capacidad']) == (1, 4)
+    assert 'clave' not in vista
+    assert pedir('GET', '/juntas/abc123')[:2] == (404, {'error': 'junta_inexistente'})
+    assert pedir('DELETE', f"/juntas/{junta['id']}")[:2] == (405, {'error': 'metodo_no_permitido'})
+    assert pedir('GET', '/nada')[:2] == (404, {'error': 'ruta_inexistente'})
+
+
+def test_ocupar_cupos_hasta_llenar_la_junta(pedir):
+    junta = crear(pedir, cupos=3)
+    ruta = f"/juntas/{junta['id']}/cupos"
+    assert pedir('POST', ruta, {'dni': '1'})[:2] == (400, {'error': 'nombre_requerido'})
+    estado, cupo, _ = pedir('POST', ruta, {'nombre': 'Ana', 'dni': '45678912'})
+    assert estado == 201 and cupo['indice'] == 1 and cupo['numero'] == 2
+    assert pedir('POST', ruta, {'nombre': 'Ana otra vez', 'dni': '45678912'})[:2] == (409, {'error': 'ya_inscrito'})
+    assert pedir('POST', ruta, {'nombre': 'Beto'})[0] == 201
+    assert pedir('POST', ruta, {'nombre': 'Caro'})[:2] == (409, {'error': 'junta_llena'})
+    assert pedir('GET', f"/juntas/{junta['id']}")[1]['ocupados'] == 3
+
+
+def test_reportes_avisan_al_ocupar_un_cupo(pedir):
+    junta = crear(pedir)
+    assert pedir('POST', '/reportes', {'dni': '45678912'})[:2] == (400, {'error': 'datos_invalidos'})
+    assert pedir('POST', '/reportes', {'dni': '45678912', 'reclamo': 'x', 'junta_id': 'abc'})[0] == 404
+    assert pedir('POST', '/reportes', {'dni': '45678912', 'reclamo': 'No pagó'})[:2] == (
+        201, {'dni': '45678912', 'reportes': 1})
+    estado, cupo, _ = pedir('POST', f"/juntas/{junta['id']}/cupos", {'nombre': 'Ana', 'dni': '45678912'})
+    assert estado == 201 and cupo['reportes'] == 1
+    estado, cupo, _ = pedir('POST', f"/juntas/{junta['id']}/cupos", {'nombre': 'Beto', 'dni': '11111111'})
+    assert estado == 201 and 'reportes' not in cupo
+
+
+def test_aprobar_un_intercambio_requiere_la_clave(pedir):
+    junta = crear(pedir, cupos=3)
+    for nombre in ('Ana', 'Beto'):
+        pedir('POST', f"/juntas/{junta['id']}/cupos", {'nombre': nombre})
+    ruta = f"/juntas/{junta['id']}/solicitudes"
+    assert pedir('POST', ruta, {'from': '2', 'to': '9'})[:2] == (400, {'error': 'numero_inexistente'})
+    estado, solicitud, _ = pedir('POST', ruta, {'from': '2', 'to': '3'})
+    assert estado == 201
+    assert pedir('POST', ruta, {'from': '2', 'to': '3'})[:2] == (409, {'error': 'solicitud_repetida'})
+
+    aprobar = f"{ruta}/{solicitud['id']}/aprobar"
+    assert pedir('POST', aprobar)[:2] == (403, {'error': 'solo_organizador'})
+    assert pedir('POST', aprobar, cabeceras={'X-Clave-Organizador': 'otra'})[0] == 403
+    clave = {'X-Clave-Organizador': junta['clave']}
+    assert pedir('POST', aprobar, cabeceras=clave)[:2] == (200, {'posiciones': [1, 2]})
+    assert pedir('POST', aprobar, cabeceras=clave)[:2] == (404, {'error': 'solicitud_inexistente'})
+
+
+def test_sync_de_una_junta_con_etag(pedir):
+    junta = crear(pedir, cupos=2)
+    ruta = f"/sync/juntas/{junta['id']}"
+    estado, cambios, cabeceras = pedir('GET', ruta)
+    # La junta y sus dos cupos
+    assert estado == 200 and cambios['version'] == 3 and len(cambios['cambios']) == 3
+    etag = cabeceras['etag']
+    assert etag == '"3"'
+    assert pedir('GET', ruta, cabeceras={'If-None-Match': etag})[:2] == (304, None)
+    assert pedir('GET', f'{ruta}?desde=3')[0] == 304
+    assert pedir('GET', f'{ruta}?desde=x')[0] == 400
+
+    pedir('POST', f"/juntas/{junta['id']}/cupos", {'nombre': 'Ana'})
+    estado, cambios, cabeceras = pedir('GET', f'{ruta}?desde=3', cabeceras={'If-None-Match': etag})
+    assert estado == 200 and cabeceras['etag'] == '"4"'
+    assert [c['clave'] for c in cambios['cambios']] == ['1']
+
+
+def test_sync_pull_responde_304_sin_novedades(pedir):
+    junta = crear(pedir, cupos=2)
+    assert pedir('POST', '/sync/pull', {'cursores': {junta['id']: 3}})[:2] == (304, None)
+    estado, respuesta, _ = pedir('POST', '/sync/pull', {'cursores': {junta['id']: 1}})
+    assert estado == 200 and respuesta['juntas'][junta['id']]['version'] == 3
+    assert pedir('POST', '/sync/pull', {'cursores': {junta['id']: 'x'}})[0] == 400
+    assert pedir('POST', '/sync/push', {'cambios': [{'junta_id': 'no-hex', 'entidad': 'junta'}]})[:2] == (
+        400, {'error': 'cambio_invalido'})
+
+
+def test_cuerpos_y_respuestas_gzip(pedir):
+    cuerpo = gzip.compress(json.dumps({'nombre': 'Comprimida', 'cupos': 2}).encode('utf-8'))
+    estado, junta, cabeceras = pedir('POST', '/juntas', cuerpo,
+                                     {'Content-Encoding': 'gzip', 'Accept-Encoding': 'gzip'})
+    assert estado == 201 and cabeceras['content-encoding'] == 'gzip'
+    assert pedir('GET', f"/juntas/{junta['id']}")[1]['nombre'] == 'Comprimida'
+    assert 'content-encoding' not in pedir('GET', f"/juntas/{junta['id']}")[2]
+    assert pedir('POST', '/juntas', b'no es gzip', {'Content-Encoding': 'gzip'})[:2] == (
+        400, {'error': 'gzip_invalido'})
+    # Una bomba gzip no se descomprime entera
+    bomba = gzip.compress(b' ' * (MAX_CUERPO + 1))
+    assert pedir('POST', '/juntas', bomba, {'Content-Encoding': 'gzip'})[:2] == (
+        413, {'error': 'cuerpo_muy_grande'})
@@ -0,0 +1,145 @@
+"""Pruebas de la sincronización por deltas contra `servidor.py`."""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import BaseDatos, nuevo_id  # noqa: E402
+from servidor import ServidorEnHilo  # noqa: E402
+from sincronizacion import PoolHTTP, Sincronizador  # noqa: E402
+
+
+@pytest.fixture
+def servidor(tmp_path):
+    servidor = ServidorEnHilo(str(tmp_path / 'servidor.db'))
+    yield servidor
+    servidor.detener()
+
+
+@pytest.fixture
+def replicas(tmp_path, servidor):
+    creadas = []
+
+    def crear(nombre):
+        db = BaseDatos(str(tmp_path / f'{nombre}.db'), registrar_cambios=True)
+        recibidos = []
+        sync = Sincronizador(db, servidor.url, entregar=lambda junta_id, cambios: recibidos.append(junta_id))
+        creadas.append((db, sync))
+        return db, sync, recibidos
+
+    yield crear
+    for db, sync in creadas:
+        sync.detener()
+        db.cerrar()
+
+
+def junta_local(db, nombre='Junta', cupos=3):
+    junta = {'id': nuevo_id(), 'nombre': nombre, 'monto': '100', 'moneda': 'Soles', 'periodo': 'Semanal',
+             'fecha_inicio': '01/01/2026', 'fecha_final': '', 'creada': 1.0,
+             'cupos': [{'ocupado': i == 0, 'nombre': 'Org' if i == 0 else '', 'numero': '1' if i == 0 else ''}
+                       for i in range(cupos)]}
+    db.guardar_junta(junta)
+    db.guardar_cupos(junta['id'], junta['cupos'])
+    return junta
+
+
+def test_una_junta_viaja_de_una_replica_a_otra(replicas):
+    a, sync_a, _ = replicas('a')
+    b, sync_b, recibidos = replicas('b')
+    junta = junta_local(a)
+    sync_a.sincronizar()
+    assert sync_b.traer_junta(junta['id']) > 0
+    b.esperar()
+    copia = b.cargar_junta(junta['id'])
+    assert copia['nombre'] == 'Junta' and len(copia['cupos']) == 3
+    assert recibidos == [junta['id']]
+
+    # Una edición en B vuelve a A; A no tenía nada pendiente
+    b.guardar_cupos(junta['id'], [dict(c, ocupado=True, nombre='Ana') if i == 1 else c
+                                  for i, c in enumerate(copia['cupos'])], [1])
+    sync_b.sincronizar()
+    assert sync_a.sincronizar() == 1
+    a.esperar()
+    assert a.cargar_junta(junta['id'])['cupos'][1]['nombre'] == 'Ana'
+    # Sin novedades el servidor responde 304
+    assert sync_b.recibir() == 0
+
+
+def test_lo_enviado_por_una_replica_llega_a_las_rutas_del_servidor(replicas, servidor):
+    a, sync_a, _ = replicas('a')
+    junta = junta_local(a, 'Compartida', cupos=4)
+    sync_a.sincronizar()
+    http = PoolHTTP(servidor.url)
+    _, vista, _ = http.pedir('GET', f"/juntas/{junta['id']}")
+    assert (vista['nombre'], vista['capacidad'], vista['ocupados']) == ('Compartida', 4, 1)
+    # Quien se une por el servidor aparece en la réplica
+    http.pedir('POST', f"/juntas/{junta['id']}/cupos", {'nombre': 'Beto', 'dni': '12345678'})
+    assert sync_a.sincronizar() == 1
+    a.esperar()
+    assert [c['nombre'] for c in a.cargar_junta(junta['id'])['cupos'] if c['ocupado']] == ['Org', 'Beto']
+    http.cerrar()
+
+
+def test_unirse_con_un_codigo_trae_la_junta_de_otro_dispositivo(replicas, servidor):
+    http = PoolHTTP(servidor.url)
+    _, creada, _ = http.pedir('POST', '/juntas', {'nombre': 'Del servidor', 'cupos': 5, 'organizador': 'Eva'})
+    http.cerrar()
+    b, sync_b, _ = replicas('b')
+    sync_b.iniciar()
+    resultado = {}
+    listo = threading.Event()
+
+    def terminar(junta_id, error):
+        resultado.update(junta_id=junta_id, error=error)
+        listo.set()
+
+    sync_b.unirse(creada['codigo'], terminar)
+    assert listo.wait(10)
+    assert resultado == {'junta_id': creada['id'], 'error': None}
+    b.esperar()
+    junta = b.cargar_junta(creada['id'])
+    assert junta['nombre'] == 'Del servidor' and len(junta['cupos']) == 5
+    assert junta['cupos'][0]['nombre'] == 'Eva'
+    assert creada['id'] in b.cursores()
+
+    listo.clear()
+    sync_b.unirse('SAVI-0000-0000', terminar)
+    assert listo.wait(10)
+    assert resultado['junta_id'] is None
+
+
+def test_el_servidor_asigna_codigos_distintos_a_juntas_de_dispositivos_distintos(replicas):
+    a, sync_a, _ = replicas('a')
+    b, sync_b, _ = replicas('b')
+    junta_a, junta_b = junta_local(a, 'De A'), junta_local(b, 'De B')
+    sync_a.iniciar()
+    sync_b.iniciar()
+    codigos = {}
+    listo = threading.Event()
+
+    def guardar(nombre):
+        def terminar(codigo, error):
+            codigos.setdefault(nombre, []).append((codigo, error))
+            if sum(len(v) for v in codigos.values()) == 3:
+                listo.set()
+        return terminar
+
+    # La junta aún no se envió: pedir el código la envía primero
+    sync_a.pedir_codigo(junta_a['id'], guardar('a'))
+    sync_a.pedir_codigo(junta_a['id'], guardar('a'))
+    sync_b.pedir_codigo(junta_b['id'], guardar('b'))
+    assert listo.wait(10)
+    (codigo_a, error), (repetido, _) = codigos['a']
+    codigo_b = codigos['b'][0][0]
+    assert error is None and codigo_a == repetido
+    assert codigo_a != codigo_b
+
+    # Con el código, B encuentra la junta de A
+    listo.clear()
+    unidas = []
+    sync_b.unirse(codigo_a, lambda junta_id, error: (unidas.append(junta_id), listo.set()))
+    assert listo.wait(10)
+    assert unidas == [junta_a['id']]
@@ -0,0 +1,52 @@
+"""Pruebas de `solicitudes.SolicitudesPorJunta`."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solicitudes import SolicitudesPorJunta  # noqa: E402
+
+
+def solicitud(id_, junta_id, desde, hacia):
+    return {'id': id_, 'junta_id': junta_id, 'from': desde, 'to': hacia}
+
+
+def test_cada_junta_ve_solo_sus_solicitudes():
+    pendientes = SolicitudesPorJunta([solicitud('a1', 'A', '2', '3'), solicitud('b1', 'B', '4', '5')])
+    assert [r['id'] for r in pendientes.cola('A')] == ['a1']
+    assert [r['id'] for r in pendientes.cola('B')] == ['b1']
+    assert not pendientes.cola('C')
+
+
+def test_atender_con_otra_junta_abierta_no_saca_la_solicitud():
+    pendientes = SolicitudesPorJunta([solicitud('a1', 'A', '2', '3')])
+    assert pendientes.sacar('B') is None
+    assert 'a1' in pendientes
+    assert pendientes.sacar('A')['id'] == 'a1'
+    assert len(pendientes) == 0
+
+
+def test_mismo_par_en_juntas_distintas():
+    pendientes = SolicitudesPorJunta()
+    assert pendientes.agregar(solicitud('a1', 'A', '2', '3'))
+    assert pendientes.agregar(solicitud('b1', 'B', '3', '2'))
+    assert not pendientes.agregar(solicitud('a2', 'A', '3', '2'))
+    assert len(pendientes) == 2
+
+
+def test_quitar_por_id_conserva_la_junta():
+    pendientes = SolicitudesPorJunta([solicitud('a1', 'A', '2', '3'), solicitud('b1', 'B', '2', '3')])
+    assert pendientes.get('b1')['junta_id'] == 'B'
+    assert pendientes.quitar('b1')['junta_id'] == 'B'
+    assert pendientes.quitar('b1') is None
+    assert [r['id'] for r in pendientes.cola('A')] == ['a1']
+
+
+def test_primera_no_retira_la_solicitud():
+    pendientes = SolicitudesPorJunta([solicitud('a1', 'A', '2', '3'), solicitud('a2', 'A', '3', '4')])
+    assert pendientes.primera('A')['id'] == 'a1'
+    assert pendientes.primera('A')['id'] == 'a1'
+    assert len(pendientes) == 2 and 'a1' in pendientes
+    pendientes.quitar('a1')
+    assert pendientes.primera('A')['id'] == 'a2'
+    assert pendientes.primera('B') is None
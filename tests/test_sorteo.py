@@ -0,0 +1,56 @@
+"""Pruebas de `sorteo.py`: sorteos registrados que se repiten y `simular` con un sorteo justo."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('numpy')
+
+from database import BaseDatos  # noqa: E402
+from sorteo import MOTOR, nueva_semilla, simular, sortear, verificar  # noqa: E402
+
+CORRIDAS = 400
+JUNTA = '0' * 32
+
+
+def test_el_sorteo_guardado_se_repite_desde_su_semilla(tmp_path):
+    db = BaseDatos(str(tmp_path / 'savi.db'))
+    posiciones = [1, 2, 4, 7, 9]
+    semilla = nueva_semilla()
+    numeros = sortear(len(posiciones), 10, semilla)
+    assert sorted(numeros) == sorted(set(numeros)) and all(2 <= n <= 10 for n in numeros)
+    db.agregar_sorteo(JUNTA, {'semilla': semilla, 'motor': MOTOR, 'total_numeros': 10,
+                              'posiciones': posiciones, 'numeros': numeros})
+    db.agregar_sorteo(JUNTA, {'semilla': 1, 'motor': 'random', 'total_numeros': 3,
+                              'posiciones': [1, 2], 'numeros': [2, 3]})
+    db.esperar()
+    registrados = db.sorteos(JUNTA)
+    assert [r['semilla'] for r in registrados] == [semilla, 1]
+    primero = registrados[0]
+    assert (primero['posiciones'], primero['numeros'], primero['participantes']) == (posiciones, numeros, 5)
+    assert verificar(primero)
+    # Un resultado que no sale de la semilla no se verifica
+    assert not verificar(dict(primero, numeros=numeros[::-1]))
+    assert verificar(registrados[1]) == (sortear(2, 3, 1, 'random') == [2, 3])
+    db.cerrar()
+
+
+@pytest.mark.parametrize('cantidad', [3, 4, 8])
+def test_valores_p_uniformes_con_sorteo_justo(cantidad):
+    valores = [simular(cantidad, 1000, semilla=semilla)['p'] for semilla in range(CORRIDAS)]
+    rechazos = sum(p < 0.05 for p in valores) / CORRIDAS
+    assert 0.02 <= rechazos <= 0.09
+    # Cada décimo de [0, 1] recibe más o menos la misma cantidad de valores p
+    deciles = [0] * 10
+    for p in valores:
+        deciles[min(int(p * 10), 9)] += 1
+    assert all(CORRIDAS / 20 <= n <= CORRIDAS * 3 / 20 for n in deciles), deciles
+
+
+def test_estadistico_corregido_promedia_los_grados_de_libertad():
+    resultados = [simular(4, 1000, semilla=semilla) for semilla in range(CORRIDAS)]
+    promedio = sum(r['chi2'] / r['grados'] for r in resultados) / CORRIDAS
+    assert 0.9 <= promedio <= 1.1
+    assert resultados[0]['chi2'] == pytest.approx(resultados[0]['pearson'] * 3 / 4)